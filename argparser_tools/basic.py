@@ -51,6 +51,7 @@ def with_backtest_arguments(parser: argparse.ArgumentParser) -> argparse.Argumen
     parser.add_argument('-d', '--data_directory', type=existing_directory, required=True)
     parser.add_argument('-c', '--initial_capital_usd', type=int, required=True)
     parser.add_argument('-b', '--start_date', type=datetime_argument, required=True)
+    parser.add_argument('--csv_cache_dir', type=existing_directory)
 
     return parser
 
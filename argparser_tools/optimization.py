@@ -1,4 +1,5 @@
 import argparse
+from core.search_optimizers import SearchOptimizerFactory
 
 
 def with_sl_and_tp(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
@@ -13,6 +14,34 @@ def with_sl_and_tp(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
     return parser
 
 
+def with_sweep_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser.add_argument('--workers', type=int, help='Number of processes, defaults to the number of processors')
+    parser.add_argument('--resume', action='store_true', help='Skip the tests finished by the previous run')
+
+    return parser
+
+
+def with_search_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser.add_argument('--search', choices=SearchOptimizerFactory.SEARCHES,
+                        default=SearchOptimizerFactory.SEARCH_GRID)
+    parser.add_argument('--runs', type=int,
+                        help='Number of runs (candidates of the first rung for halving), all of the grid by default')
+    parser.add_argument('--time_budget', type=float, help='Seconds after which no more runs are started')
+    parser.add_argument('--objective', default='Sharpe Ratio', help='Result column which is maximized')
+    parser.add_argument('--seed', type=int, help='Random seed of the search')
+
+    return parser
+
+
+def with_pruning_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser.add_argument('--prune_max_drawdown', type=float, help='Stop runs with a higher max drawdown (in %%)')
+    parser.add_argument('--prune_min_sharpe_ratio', type=float, help='Stop runs with a lower Sharpe ratio')
+    parser.add_argument('--prune_min_total_return', type=float, help='Stop runs with a lower total return (in %%)')
+    parser.add_argument('--prune_after_bars', type=int, default=0, help='Number of bars before the rules are checked')
+
+    return parser
+
+
 def with_sma_short_and_long(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
     parser.add_argument('--short_window_min', type=int, required=True)
     parser.add_argument('--short_window_max', type=int, required=True)
@@ -30,6 +30,9 @@ def main():
                                   execution_handler_name=SimulatedExecutionHandler)
     configuration.set_option(Configuration.OPTION_CSV_DIR, args_namespace.data_directory)
 
+    if args_namespace.csv_cache_dir is not None:
+        configuration.set_option(Configuration.OPTION_CSV_CACHE_DIR, args_namespace.csv_cache_dir)
+
     backtest = Backtest(
         args_namespace.output_directory,
         args_namespace.symbols,
@@ -0,0 +1,125 @@
+import argparse
+import contextlib
+import gc
+import os
+import shutil
+import tempfile
+import time
+from core.backtest import Backtest
+from core.configuration import Configuration
+from core.deque_event_queue import DequeEventQueue
+from core.portfolio import Portfolio
+from datahandlers.data_handler_factory import DataHandlerFactory
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from events.market_event import MarketEvent
+from executionhandlers.execution_handler_factory import ExecutionHandlerFactory
+from executionhandlers.simulated_execution import SimulatedExecutionHandler
+from positionsizehandlers.fixed_position_size import FixedPositionSize
+from strategies.strategy import Strategy
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class NoSignalStrategy(Strategy):
+    def __init__(self, bars, portfolio, events_per_symbol):
+        pass
+
+    def calculate_signals(self, event):
+        pass
+
+
+class SleepingBacktest(Backtest):
+    """
+    Sleeps after every bar even with zero heartbeat, as the backtest did before.
+    """
+
+    def _push_next_bar(self, timeline: list, order: int, symbol: str):
+        super()._push_next_bar(timeline, order, symbol)
+
+        time.sleep(self.heartbeat)
+
+
+def write_csv_file(file_name: str, number_of_bars: int):
+    with open(file_name, 'w') as csv_file:
+        csv_file.write('EUR_USD;M1;2000-01-01T00:00:00;2000-01-01T00:00:00\n')
+        csv_file.write('time;openBid;openAsk;highBid;highAsk;lowBid;lowAsk;closeBid;closeAsk;volume\n')
+
+        for minute in range(number_of_bars + 1):
+            csv_file.write('%s;1.1;1.1;1.1;1.1;1.1;1.1;1.1;1.1;10\n' % (
+                time.strftime('%Y-%m-%dT%H:%M:%S.000000Z', time.gmtime(946684800 + 60 * minute))))
+
+
+def run_backtest(csv_dir: str, output_dir: str, backtest_class: type, event_queue_class: type) -> tuple:
+    configuration = Configuration(data_handler_name=HistoricCSVDataHandler,
+                                  execution_handler_name=SimulatedExecutionHandler)
+    configuration.set_option(Configuration.OPTION_CSV_DIR, csv_dir)
+
+    backtest = backtest_class(output_dir, ['eurusd'], 10000, 0, None, configuration, DataHandlerFactory(),
+                              ExecutionHandlerFactory(), Portfolio, NoSignalStrategy, FixedPositionSize(0.5), None, [],
+                              {}, 'equity.csv', 'trades.csv', event_queue_class)
+
+    gc.collect()
+    started_at = time.perf_counter()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        backtest._run_timeline(['eurusd'])
+
+    events = backtest.data_handler.get_number_of_bars('eurusd') + backtest.get_signals() + \
+        backtest.get_orders() + backtest.get_fills()
+
+    return events, time.perf_counter() - started_at
+
+
+def run_event_bus(event_queue_class: type, number_of_events: int) -> float:
+    event_queue = event_queue_class()
+    event = MarketEvent('eurusd')
+
+    started_at = time.perf_counter()
+
+    for i in range(number_of_events):
+        event_queue.put(event)
+
+        while True:
+            try:
+                event_queue.get(False)
+            except queue.Empty:
+                break
+
+    return time.perf_counter() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares event queues used by Backtest.')
+    parser.add_argument('--number_of_bars', type=int, default=1000000)
+    args_namespace = parser.parse_args()
+
+    csv_dir = tempfile.mkdtemp()
+    output_dir = tempfile.mkdtemp()
+
+    try:
+        write_csv_file(os.path.join(csv_dir, 'eurusd.csv'), args_namespace.number_of_bars)
+
+        print('Event bus only, %d events' % args_namespace.number_of_bars)
+        for event_queue_class in [queue.Queue, DequeEventQueue]:
+            duration = run_event_bus(event_queue_class, args_namespace.number_of_bars)
+            print('%-20s %8.3f s %12.0f events/s' % (
+                event_queue_class.__name__, duration, args_namespace.number_of_bars / duration))
+
+        print('Backtest, %d bars' % args_namespace.number_of_bars)
+        for name, backtest_class, event_queue_class in [
+            ('Queue and sleep(0)', SleepingBacktest, queue.Queue),
+            ('Queue', Backtest, queue.Queue),
+            ('DequeEventQueue', Backtest, DequeEventQueue),
+        ]:
+            events, duration = run_backtest(csv_dir, output_dir, backtest_class, event_queue_class)
+            print('%-20s %8.3f s %12.0f events/s' % (name, duration, events / duration))
+    finally:
+        shutil.rmtree(csv_dir)
+        shutil.rmtree(output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from events.market_event import MarketEvent
+
+
+class DictEvent(object):
+    def __init__(self, event_type: str, symbol: str):
+        self._type = event_type
+        self._symbol = symbol
+
+
+class DictMarketEvent(DictEvent):
+    """
+    MarketEvent as it was before __slots__, with an instance dictionary.
+    """
+
+    def __init__(self, symbol: str):
+        super().__init__('MARKET', symbol)
+
+
+def create_dict_event(symbol: str) -> DictMarketEvent:
+    return DictMarketEvent(symbol)
+
+
+def create_slotted_event(symbol: str) -> MarketEvent:
+    return MarketEvent(symbol)
+
+
+def release_event(event) -> None:
+    pass
+
+
+def measure_time(create_event, release, number_of_events: int) -> tuple:
+    """
+    Every event is created, handled and released, as it is in a backtest.
+    """
+    gc.collect()
+    collections_before = sum(stats['collections'] for stats in gc.get_stats())
+
+    started_at = time.perf_counter()
+
+    for i in range(number_of_events):
+        event = create_event('eurusd')
+        release(event)
+
+    duration = time.perf_counter() - started_at
+    collections = sum(stats['collections'] for stats in gc.get_stats()) - collections_before
+
+    return duration, collections
+
+
+def measure_memory(create_event, number_of_events: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+
+    events = [create_event('eurusd') for i in range(number_of_events)]
+
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del events
+
+    return memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares allocation of market events.')
+    parser.add_argument('--number_of_events', type=int, default=1000000)
+    args_namespace = parser.parse_args()
+
+    number_of_events = args_namespace.number_of_events
+
+    print('Creating and releasing %d market events' % number_of_events)
+
+    for name, create_event, release in [
+        ('with __dict__', create_dict_event, release_event),
+        ('with __slots__', create_slotted_event, release_event),
+        ('pooled', MarketEvent.create, MarketEvent.recycle),
+    ]:
+        duration, collections = measure_time(create_event, release, number_of_events)
+        print('%-16s %8.3f s %6d GC runs' % (name, duration, collections))
+
+    print('Memory of %d live market events' % number_of_events)
+
+    for name, create_event in [('with __dict__', create_dict_event), ('with __slots__', create_slotted_event)]:
+        print('%-16s %8.1f MB' % (name, measure_memory(create_event, number_of_events) / 1024.0 / 1024.0))
+
+
+if __name__ == "__main__":
+    main()
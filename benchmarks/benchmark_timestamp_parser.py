@@ -0,0 +1,48 @@
+import timeit
+from dateutil import parser
+from oanda.timestamp_parser import TimestampParser
+
+
+def create_timestamps(number_of_timestamps: int) -> list:
+    """
+    Creates Oanda price timestamps, roughly 4 prices per second during one day.
+    """
+    timestamps = []
+
+    for i in range(number_of_timestamps):
+        seconds = (i // 4) % 86400
+        timestamps.append('2017-01-02T%02d:%02d:%02d.%09dZ' % (
+            seconds // 3600, (seconds // 60) % 60, seconds % 60, (i % 4) * 250000000 + 123))
+
+    return timestamps
+
+
+def main():
+    number_of_timestamps = 100000
+    timestamps = create_timestamps(number_of_timestamps)
+
+    timestamp_parser = TimestampParser()
+
+    benchmarks = [
+        ('dateutil.parser.parse', lambda: [parser.parse(timestamp) for timestamp in timestamps]),
+        ('TimestampParser.parse_to_datetime', lambda: [timestamp_parser.parse_to_datetime(timestamp)
+                                                       for timestamp in timestamps]),
+        ('TimestampParser.parse_to_epoch', lambda: [timestamp_parser.parse_to_epoch(timestamp)
+                                                    for timestamp in timestamps]),
+    ]
+
+    print('Parsing %d timestamps' % number_of_timestamps)
+
+    baseline = None
+    for name, benchmark in benchmarks:
+        duration = min(timeit.repeat(benchmark, number=1, repeat=3))
+
+        if baseline is None:
+            baseline = duration
+
+        print('%-35s %8.3f s %12.0f timestamps/s %6.1fx' % (
+            name, duration, number_of_timestamps / duration, baseline / duration))
+
+
+if __name__ == "__main__":
+    main()
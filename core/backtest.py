@@ -9,7 +9,13 @@ from loggers.logger import Logger
 from executionhandlers.execution_handler_factory import ExecutionHandlerFactory
 import time
 import datetime
+import heapq
 from core.worker import Worker
+from core.status_reporter import StatusReporter
+from core.pruning import get_pruned_reason
+from core.deque_event_queue import DequeEventQueue
+from events.event_kind import EventKind
+from events.market_event import MarketEvent
 
 try:
     import Queue as queue
@@ -23,8 +29,36 @@ class Backtest(Worker):
             configuration: Configuration, data_handler_factory: DataHandlerFactory,
             execution_handler_factory: ExecutionHandlerFactory, portfolio_class: Portfolio.__name__,
             strategy_class: Strategy.__name__, position_size_handler: PositionSizeHandler.__name__, logger: Logger,
-            enabled_logs: list, strategy_params_dict: dict, equity_filename: str, trades_filename: str
+            enabled_logs: list, strategy_params_dict: dict, equity_filename: str, trades_filename: str,
+            event_queue_class: type = DequeEventQueue, pool_market_events: bool = False,
+            snapshot_frequency: int = Portfolio.SNAPSHOT_EVERY_BAR,
+            status_interval: float = StatusReporter.DEFAULT_INTERVAL, pruning_rules: list = None,
+            status_stream=sys.stdout
     ) -> None:
+        """
+        Events are passed through event_queue_class instances, one per symbol. The default
+        DequeEventQueue has no locking, queue.Queue can be used when the components of the
+        backtest put events from other threads.
+
+        When pool_market_events is set, handled market events are recycled (see MarketEvent),
+        so the strategy must not keep references to them.
+
+        snapshot_frequency is passed to the portfolio (see Portfolio).
+
+        The progress is written to status_stream every status_interval seconds from another thread (see
+        StatusReporter). Backtests run by the worker processes of a sweep or a sharded backtest should pass
+        None, so the progress lines of the processes are not mixed on one terminal.
+
+        The backtest stops early when one of pruning_rules (see PruningRule) is hit, its stats are
+        taken from the online metrics then and the equity and trades files are not written. Rules
+        are checked after every bar with the number of bars of its symbol. The online metrics are
+        updated on the snapshots of the portfolio, so with snapshot_frequency N the rules see equity
+        up to N bars old. Pruning rules can not be used with SNAPSHOT_ON_FILLS, the equity is not
+        updated between fills then.
+        """
+        if pruning_rules and snapshot_frequency == Portfolio.SNAPSHOT_ON_FILLS:
+            raise Exception('Pruning rules can not be used with snapshots on fills')
+
         self.output_directory = output_directory
         self.symbol_list = symbol_list
         self.initial_capital = initial_capital
@@ -42,17 +76,30 @@ class Backtest(Worker):
         self.equity_filename = equity_filename
         self.trades_filename = trades_filename
 
-        self.events = queue.Queue()
-        self.events_per_symbol = dict(((symbol, queue.Queue()) for (symbol) in self.symbol_list))
+        self.event_queue_class = event_queue_class
+        self.pool_market_events = pool_market_events
+        self.snapshot_frequency = snapshot_frequency
+        self.pruning_rules = pruning_rules if pruning_rules is not None else []
+        self.pruned_reason = None
+
+        self.events = event_queue_class()
+        self.events_per_symbol = dict(((symbol, event_queue_class()) for (symbol) in self.symbol_list))
 
         self.signals = 0
         self.orders = 0
         self.fills = 0
 
         self.stats = None
+        self.iteration = 0
 
         self._generate_trading_instances()
 
+        self.status_reporter = None
+
+        if status_stream is not None:
+            self.status_reporter = StatusReporter(self._create_status, self._format_status, None, None,
+                                                  status_stream, status_interval, self.logger)
+
     def _generate_trading_instances(self):
 
         self.data_handler = self.data_handler_factory.create_from_settings(self.configuration, self.events_per_symbol,
@@ -60,7 +107,8 @@ class Backtest(Worker):
 
         self.portfolio = self.portfolio_class(self.data_handler, self.events_per_symbol, self.start_date,
                                               self.initial_capital, self.output_directory, self.equity_filename,
-                                              self.trades_filename, self.position_size_handler)
+                                              self.trades_filename, self.position_size_handler,
+                                              self.snapshot_frequency)
 
         self.strategy = self.strategy_class(self.data_handler, self.portfolio, self.events_per_symbol,
                                             **self.strategy_params_dict)
@@ -70,52 +118,101 @@ class Backtest(Worker):
                                                                                      self.events_per_symbol,
                                                                                      self.logger)
 
+        self.event_dispatcher = self._create_event_dispatcher()
+
+    async def _run_symbols(self, symbol_list: list):
+        if self.status_reporter is None:
+            self._run_timeline(symbol_list)
+            return
+
+        self.status_reporter.start()
+
+        try:
+            self._run_timeline(symbol_list)
+        finally:
+            self.status_reporter.stop()
+
     def _run_symbol(self, symbol: str):
+        self._run_timeline([symbol])
+
+    def _run_timeline(self, symbol_list: list):
+        """
+        Runs all symbols in one thread on a merged timeline. The heap holds the next bar of every
+        symbol ordered by (timestamp, position in symbol_list), so bars are released in strict time
+        order (ties in the order of symbol_list) and all events caused by a bar are handled before
+        the next bar is released.
+        """
         self.write_progress(0)
 
+        timeline = []
+        for order, symbol in enumerate(symbol_list):
+            self._push_next_bar(timeline, order, symbol)
+
         i = 0
-        while True:
+        while timeline:
             i += 1
             self.write_progress(i)
 
             # Update the market bars
-            if self.data_handler.backtest_should_continue(symbol):
-                self.data_handler.update_bars(symbol)
-            else:
-                break
-
-            # Handle the events
-            while True:
-                try:
-                    event = self.events_per_symbol[symbol].get(False)
-                except queue.Empty:
+            timestamp, order, symbol = heapq.heappop(timeline)
+            self.data_handler.update_bars(symbol)
+
+            self._handle_events(i, symbol)
+
+            if self.pruning_rules:
+                self.pruned_reason = get_pruned_reason(self.pruning_rules, self.portfolio.get_online_metrics(),
+                                                       self.data_handler.get_number_of_bars(symbol))
+
+                if self.pruned_reason is not None:
                     break
-                else:
-                    if event is not None:
-                        if event.type == 'CLOSE_PENDING_ORDERS':
-                            self.execution_handler.clear_limit_or_stop_orders(event)
-                        elif event.type == 'MARKET':
-                            self.strategy.calculate_signals(event)
-                            self.execution_handler.update_stop_and_limit_orders(event)
-                            self.portfolio.update_timeindex()
-                        elif event.type == 'SIGNAL':
-                            self.signals += 1
-                            self.portfolio.update_signal(event)
-                        elif event.type == 'ORDER':
-                            self.orders += 1
-                            self.execution_handler.execute_order(event)
-                        elif event.type == 'FILL':
-                            self.fills += 1
-                            self.portfolio.update_fill(event)
-
-                    self.log_event(i, event)
-
-            time.sleep(self.heartbeat)
+
+            self._push_next_bar(timeline, order, symbol)
+
+            if self.heartbeat > 0:
+                time.sleep(self.heartbeat)
+
+    def _push_next_bar(self, timeline: list, order: int, symbol: str):
+        timestamp = self.data_handler.get_next_bar_timestamp(symbol)
+
+        if timestamp is not None:
+            heapq.heappush(timeline, (timestamp, order, symbol))
+
+    def _handle_events(self, iteration: int, symbol: str):
+        # The backtest runs in one thread, so the queue can not be emptied by anyone else
+        event_queue = self.events_per_symbol[symbol]
+
+        while not event_queue.empty():
+            event = event_queue.get(False)
+
+            self._handle_event(iteration, event)
+
+            if self.pool_market_events and event is not None and event.kind == EventKind.MARKET:
+                MarketEvent.recycle(event)
+
+    def _save_equity_and_generate_stats(self):
+        if self.pruned_reason is None:
+            super()._save_equity_and_generate_stats()
+        else:
+            self.stats = self.portfolio.create_pruned_stats(self.pruned_reason)
+
+    def get_pruned_reason(self):
+        return self.pruned_reason
 
     def write_progress(self, iteration: int):
-        progress = int(round(self.data_handler.get_position_in_percentage(), 0))
-        print('Running backtest ({}%)'.format(progress), end='\r')
-        sys.stdout.flush()
+        # Only the counter is updated here, the progress is printed by the status reporter
+        self.iteration = iteration
+
+    def _create_status(self) -> dict:
+        return dict(
+            iteration=self.iteration,
+            progress=int(round(self.data_handler.get_position_in_percentage(), 0)),
+            signals=self.signals,
+            orders=self.orders,
+            fills=self.fills
+        )
+
+    def _format_status(self, status: dict) -> str:
+        return 'Running backtest ({}%)'.format(status['progress'])
 
     def get_signals(self) -> int:
         return self.signals
@@ -1,6 +1,11 @@
 class Configuration(object):
 
     OPTION_CSV_DIR = 'csv_dir'
+    OPTION_CSV_CACHE_DIR = 'csv_cache_dir'
+    OPTION_CSV_CHUNK_SIZE = 'csv_chunk_size'
+    OPTION_MAX_LOOKBACK = 'max_lookback'
+    OPTION_SHARED_BAR_DATA = 'shared_bar_data'
+    OPTION_HISTORY_FRACTION = 'history_fraction'
     OPTION_ACCOUNT_ID = 'account_id'
     OPTION_ACCESS_TOKEN = 'access_token'
     OPTION_TIMEFRAME = 'timeframe'
@@ -17,3 +22,6 @@ class Configuration(object):
 
     def get_option(self, option: str) -> str:
         return self.options[option]
+
+    def has_option(self, option: str) -> bool:
+        return option in self.options
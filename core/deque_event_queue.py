@@ -0,0 +1,39 @@
+from collections import deque
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class DequeEventQueue(object):
+    """
+    DequeEventQueue is an event queue for a backtest which runs in a single
+    thread. It has the interface of queue.Queue used by the components (put,
+    get, empty, qsize), but it is a plain deque without any locking, and get
+    never blocks - it raises queue.Empty when there is no event.
+    """
+
+    def __init__(self) -> None:
+        self.events = deque()
+
+    def put(self, event, block: bool = True, timeout: float = None) -> None:
+        self.events.append(event)
+
+    def put_nowait(self, event) -> None:
+        self.events.append(event)
+
+    def get(self, block: bool = True, timeout: float = None):
+        try:
+            return self.events.popleft()
+        except IndexError:
+            raise queue.Empty
+
+    def get_nowait(self):
+        return self.get(False)
+
+    def empty(self) -> bool:
+        return not self.events
+
+    def qsize(self) -> int:
+        return len(self.events)
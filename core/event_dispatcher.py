@@ -0,0 +1,24 @@
+from events.event import Event
+from typing import Callable
+
+
+class EventDispatcher(object):
+    """
+    EventDispatcher maps event kinds to their handlers, so processing an event
+    is one dictionary lookup. Events of kinds without a handler are ignored.
+    """
+
+    def __init__(self) -> None:
+        self.handlers = {}
+
+    def register(self, kind: int, handler: Callable[[Event], None]) -> None:
+        """
+        Registers the handler for events of kind, replacing the previous one.
+        """
+        self.handlers[kind] = handler
+
+    def dispatch(self, event: Event) -> None:
+        handler = self.handlers.get(event.kind)
+
+        if handler is not None:
+            handler(event)
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime as python_datetime
+from timeframe.timeframe import TimeFrame
+from typing import List
+from typing import Optional
+
+
+class Ledger(object):
+    """
+    Ledger keeps a growing history of rows of float values (e.g. holdings
+    per symbol) in one preallocated NumPy array with a column per name. When
+    the array is full its capacity is doubled, so appends are amortized
+    constant time and a row takes only 8 bytes per column. Datetimes of the
+    rows are kept as nanoseconds since epoch (NaT for None), the time zone of
+    the first aware datetime is used for all of them.
+    """
+
+    DEFAULT_CAPACITY = 1024
+    NAT = np.iinfo(np.int64).min
+
+    def __init__(self, columns: List[str], capacity: int = DEFAULT_CAPACITY) -> None:
+        self.columns = list(columns)
+        self.column_positions = dict((column, position) for position, column in enumerate(self.columns))
+
+        self.datetimes = np.empty(max(capacity, 1), dtype=np.int64)
+        self.values = np.zeros((max(capacity, 1), len(self.columns)), dtype=np.float64)
+        self.tz = None
+
+        self.length = 0
+
+    def append(self, datetime, values) -> None:
+        """
+        Appends a row, values are in the order of columns.
+        """
+        self.append_timestamp(self._datetime_to_epoch(datetime), values)
+
+    def append_timestamp(self, timestamp: int, values, tz=None) -> None:
+        """
+        Appends a row with the datetime given as nanoseconds since epoch (UTC), tz is used when the
+        ledger has no time zone yet.
+        """
+        if self.length == len(self.datetimes):
+            self._grow(2 * self.length)
+
+        if tz is not None and self.tz is None:
+            self.tz = tz
+
+        self.datetimes[self.length] = timestamp
+        self.values[self.length] = values
+        self.length += 1
+
+    def append_rows(self, datetimes: np.ndarray, values: np.ndarray) -> None:
+        """
+        Appends rows given as nanoseconds since epoch and a 2D array in the order of columns.
+        """
+        length = self.length + len(datetimes)
+
+        if length > len(self.datetimes):
+            self._grow(max(length, 2 * self.length))
+
+        self.datetimes[self.length:length] = datetimes
+        self.values[self.length:length] = values
+        self.length = length
+
+    def get_length(self) -> int:
+        return self.length
+
+    def get_datetimes(self) -> np.ndarray:
+        return self.datetimes[:self.length]
+
+    def get_column(self, column: str) -> np.ndarray:
+        return self.values[:self.length, self.column_positions[column]]
+
+    def get_values(self) -> np.ndarray:
+        return self.values[:self.length]
+
+    def get_row(self, index: int) -> dict:
+        row = dict(zip(self.columns, self.values[index].tolist()))
+        row['datetime'] = self.epoch_to_datetime(int(self.get_datetimes()[index]))
+
+        return row
+
+    def epoch_to_datetime(self, epoch: int) -> Optional[pd.Timestamp]:
+        if epoch == self.NAT:
+            return None
+
+        return pd.Timestamp(epoch, tz='UTC').tz_convert(self.tz) if self.tz is not None else pd.Timestamp(epoch)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        index = pd.DatetimeIndex(self.get_datetimes().view('datetime64[ns]'), name='datetime')
+
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+
+        return pd.DataFrame(self.get_values().copy(), index=index, columns=self.columns)
+
+    def get_memory_bytes(self) -> int:
+        return self.datetimes.nbytes + self.values.nbytes
+
+    def _grow(self, capacity: int) -> None:
+        datetimes = np.empty(capacity, dtype=np.int64)
+        datetimes[:self.length] = self.datetimes[:self.length]
+
+        values = np.zeros((capacity, len(self.columns)), dtype=np.float64)
+        values[:self.length] = self.values[:self.length]
+
+        self.datetimes = datetimes
+        self.values = values
+
+    def _datetime_to_epoch(self, datetime) -> int:
+        if datetime is None:
+            return self.NAT
+
+        # Datetimes are converted without creating a Timestamp, other values (e.g. strings) are parsed by pandas
+        if not isinstance(datetime, python_datetime):
+            datetime = pd.Timestamp(datetime)
+
+        if datetime.tzinfo is not None and self.tz is None:
+            self.tz = datetime.tzinfo
+
+        if isinstance(datetime, pd.Timestamp):
+            return datetime.value
+
+        return TimeFrame.datetime_to_epoch(datetime)
@@ -0,0 +1,132 @@
+import math
+from typing import Optional
+from core.perfomance import DrawdownAccumulator
+
+
+class OnlineMetrics(object):
+    """
+    OnlineMetrics updates the performance of a running portfolio in constant
+    time per equity update - the running mean and variance of returns
+    (Welford's algorithm) for the Sharpe and Sortino ratios, the drawdown of
+    the equity curve (see DrawdownAccumulator) and the win rate and profit
+    factor of closed trades. The ratios are computed the same way as
+    create_sharpe_ratio does for the whole equity curve, they are NaN when
+    periods is None (the equity is not sampled periodically).
+    """
+
+    def __init__(self, initial_total: float, periods: Optional[float] = 252) -> None:
+        self.periods = periods
+
+        self.last_total = initial_total
+        self.equity = 1.0
+
+        self.number_of_returns = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.downside_sum_of_squares = 0.0
+
+        self.drawdown_accumulator = DrawdownAccumulator()
+
+        self.number_of_closed_trades = 0
+        self.number_of_winning_trades = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+
+    def update_equity(self, total: float) -> None:
+        # Returns are not defined while the total is zero (e.g. live trading without initial capital)
+        if self.last_total != 0:
+            self._add_return(total / self.last_total - 1.0)
+
+        self.last_total = total
+        self.drawdown_accumulator.update(self.equity)
+
+    def update_closed_trade(self, profit: float) -> None:
+        self.number_of_closed_trades += 1
+
+        if profit > 0:
+            self.number_of_winning_trades += 1
+            self.gross_profit += profit
+        else:
+            self.gross_loss -= profit
+
+    def _add_return(self, value: float) -> None:
+        self.number_of_returns += 1
+
+        delta = value - self.mean
+        self.mean += delta / self.number_of_returns
+        self.m2 += delta * (value - self.mean)
+
+        if value < 0:
+            self.downside_sum_of_squares += value * value
+
+        self.equity *= 1.0 + value
+
+    def get_total_return(self) -> float:
+        return (self.equity - 1.0) * 100.0
+
+    def get_sharpe_ratio(self) -> float:
+        if self.periods is None:
+            return float('nan')
+
+        if self.number_of_returns == 0 or self.m2 <= 0:
+            return 0
+
+        return math.sqrt(self.periods) * self.mean / math.sqrt(self.m2 / self.number_of_returns)
+
+    def get_sortino_ratio(self) -> float:
+        if self.periods is None:
+            return float('nan')
+
+        if self.number_of_returns == 0 or self.downside_sum_of_squares <= 0:
+            return 0
+
+        return math.sqrt(self.periods) * self.mean / math.sqrt(self.downside_sum_of_squares / self.number_of_returns)
+
+    def get_drawdown_accumulator(self) -> DrawdownAccumulator:
+        return self.drawdown_accumulator
+
+    def get_max_drawdown(self) -> float:
+        return self.drawdown_accumulator.get_max_drawdown() * 100.0
+
+    def get_drawdown_duration(self) -> int:
+        return self.drawdown_accumulator.get_max_duration()
+
+    def get_number_of_closed_trades(self) -> int:
+        return self.number_of_closed_trades
+
+    def get_win_rate(self) -> float:
+        if self.number_of_closed_trades == 0:
+            return 0
+
+        return self.number_of_winning_trades / self.number_of_closed_trades * 100.0
+
+    def get_profit_factor(self) -> float:
+        if self.gross_loss == 0:
+            return float('inf') if self.gross_profit > 0 else 0
+
+        return self.gross_profit / self.gross_loss
+
+    def get_as_dict(self) -> dict:
+        return dict(
+            total_return=self.get_total_return(),
+            sharpe_ratio=self.get_sharpe_ratio(),
+            sortino_ratio=self.get_sortino_ratio(),
+            max_drawdown=self.get_max_drawdown(),
+            drawdown_duration=self.get_drawdown_duration(),
+            closed_trades=self.get_number_of_closed_trades(),
+            win_rate=self.get_win_rate(),
+            profit_factor=self.get_profit_factor()
+        )
+
+    def get_as_string(self) -> str:
+        return OnlineMetrics.format_metrics(self.get_as_dict())
+
+    @staticmethod
+    def format_metrics(metrics: dict) -> str:
+        """
+        Formats the metrics returned by get_as_dict, e.g. a copy taken in another thread.
+        """
+        return ('Total Return: %0.2f%%, Sharpe Ratio: %0.2f, Sortino Ratio: %0.2f, Max Drawdown: %0.2f%%, ' +
+                'Drawdown Duration: %d, Closed trades: %d, Win Rate: %0.2f%%, Profit Factor: %0.2f') % \
+               (metrics['total_return'], metrics['sharpe_ratio'], metrics['sortino_ratio'], metrics['max_drawdown'],
+                metrics['drawdown_duration'], metrics['closed_trades'], metrics['win_rate'], metrics['profit_factor'])
@@ -0,0 +1,216 @@
+from __future__ import print_function
+import os
+import csv
+import math
+import sys
+import json
+import time
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from concurrent.futures import FIRST_COMPLETED
+from core.search_optimizers import GridSearch
+from core.search_optimizers import SearchOptimizer
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+
+
+class ParameterSweep(object):
+    """
+    ParameterSweep runs run_instance for every tuple of parameters in a
+    process pool (or for every trial asked by a SearchOptimizer, see
+    run_search). Every finished run is written into the CSV file right away
+    (the parameters followed by the returned values) and its parameters are
+    recorded into the checkpoint file, so an interrupted sweep can be resumed
+    and runs which were finished are not repeated.
+
+    run_instance has to be picklable (a function defined at module level or
+    a functools.partial of it) and return a list of values. A run which has
+    a value in the Pruned column (see PruningRule) has the worst score.
+    """
+
+    PRUNED_COLUMN = 'Pruned'
+
+    def __init__(self, run_instance: Callable[[tuple], list], header: list, csv_file_name: str,
+                 checkpoint_file_name: str, number_of_workers: Optional[int] = None,
+                 initializer: Optional[Callable] = None, initargs: tuple = ()) -> None:
+        """
+        number_of_workers defaults to the number of processors. initializer is called with initargs
+        once in every worker process (e.g. SweepContext.activate).
+        """
+        self.run_instance = run_instance
+        self.header = header
+        self.csv_file_name = csv_file_name
+        self.checkpoint_file_name = checkpoint_file_name
+        self.number_of_workers = number_of_workers
+        self.initializer = initializer
+        self.initargs = initargs
+
+    def run(self, parameters_list: Iterable[tuple], resume: bool = False) -> None:
+        self.run_search(GridSearch(parameters_list), resume=resume)
+
+    def run_search(self, search_optimizer: SearchOptimizer, objective: Optional[str] = None, resume: bool = False,
+                   time_budget: Optional[float] = None) -> None:
+        """
+        Runs the trials asked by search_optimizer and tells it the value of the objective column of
+        their results. At most number_of_workers trials run at once, so the optimizer learns from
+        finished runs before asking more. No more trials are asked after time_budget seconds.
+
+        Trials on a part of the history call run_instance with the fraction of the history as the
+        second argument, only runs on the whole history are written to the CSV file and reused on
+        resume.
+        """
+        finished_rows = self._load_finished_rows() if resume else {}
+        number_of_runs = search_optimizer.get_number_of_runs()
+        total_budget = search_optimizer.get_total_budget()
+
+        print('Total number of tests to run: %s (%d finished before)' % (
+            number_of_runs if number_of_runs is not None else 'unknown', len(finished_rows)))
+
+        csv_file, checkpoint_file = self._open_files(finished_rows)
+        csv_file_writer = csv.writer(csv_file, delimiter=',')
+        number_of_workers = self.number_of_workers or os.cpu_count() or 1
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.number_of_workers, initializer=self.initializer,
+                                     initargs=self.initargs) as executor:
+                futures = {}
+                started_at = time.time()
+                finished = 0
+                finished_budget = 0.0
+                reused_budget = 0.0
+
+                while True:
+                    while len(futures) < number_of_workers and \
+                            (time_budget is None or time.time() - started_at < time_budget):
+                        trial = search_optimizer.ask()
+
+                        if trial is None:
+                            break
+
+                        if trial.is_complete() and trial.parameters in finished_rows:
+                            row = finished_rows[trial.parameters]
+                            search_optimizer.tell(trial, self._get_score(objective, row[len(trial.parameters):],
+                                                                         len(trial.parameters)))
+                            reused_budget += trial.budget
+                        elif trial.is_complete():
+                            futures[executor.submit(self.run_instance, trial.parameters)] = trial
+                        else:
+                            futures[executor.submit(self.run_instance, trial.parameters, trial.budget)] = trial
+
+                    if not futures:
+                        break
+
+                    done, not_done = wait(futures, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        trial = futures.pop(future)
+                        values = list(future.result())
+
+                        if trial.is_complete():
+                            csv_file_writer.writerow(list(trial.parameters) + values)
+                            csv_file.flush()
+
+                            checkpoint_file.write(json.dumps(list(trial.parameters)) + '\n')
+                            checkpoint_file.flush()
+
+                        # Trials on a part of the history count by their budget
+                        finished += 1
+                        finished_budget += trial.budget
+
+                        if total_budget is not None:
+                            self.write_progress(finished, finished_budget, total_budget - reused_budget,
+                                                time.time() - started_at)
+
+                        search_optimizer.tell(trial, self._get_score(objective, values, len(trial.parameters)))
+        finally:
+            csv_file.close()
+            checkpoint_file.close()
+
+        print('')
+
+    def _get_score(self, objective: Optional[str], values: list, number_of_parameters: int) -> float:
+        """
+        Returns the value of the objective column, NaN (e.g. no trades) and pruned runs have the worst score.
+        """
+        if objective is None:
+            return 0.0
+
+        if self.PRUNED_COLUMN in self.header and values[self.header.index(self.PRUNED_COLUMN) - number_of_parameters]:
+            return float('-inf')
+
+        score = float(values[self.header.index(objective) - number_of_parameters])
+
+        return score if not math.isnan(score) else float('-inf')
+
+    def write_progress(self, finished: int, finished_budget: float, total_budget: float, elapsed_seconds: float):
+        """
+        The progress and ETA are taken from the budgets of the trials (see SearchOptimizer.get_total_budget).
+        """
+        total_budget = max(total_budget, finished_budget)
+        remaining_seconds = elapsed_seconds / finished_budget * (total_budget - finished_budget)
+
+        print('Finished %d tests (%0.1f%%), ETA %s' % (
+            finished, 100.0 * finished_budget / total_budget, datetime.timedelta(seconds=int(round(remaining_seconds)))
+        ), end='\r')
+        sys.stdout.flush()
+
+    def _load_finished_rows(self) -> dict:
+        """
+        Returns the CSV rows of finished runs by their parameters. Runs which are missing in the
+        checkpoint or in the CSV file (the sweep was interrupted before both were written) are
+        not finished.
+        """
+        if not os.path.isfile(self.checkpoint_file_name) or not os.path.isfile(self.csv_file_name):
+            return {}
+
+        recorded_parameters = set()
+
+        with open(self.checkpoint_file_name) as checkpoint_file:
+            for line in checkpoint_file:
+                # The last line is not complete when the sweep was killed while writing it
+                try:
+                    recorded_parameters.add(tuple(json.loads(line)))
+                except ValueError:
+                    pass
+
+        finished_rows = {}
+        number_of_parameters = len(next(iter(recorded_parameters))) if recorded_parameters else 0
+
+        with open(self.csv_file_name, newline='') as csv_file:
+            for row in list(csv.reader(csv_file, delimiter=','))[1:]:
+                parameters = tuple(self._parse_value(value) for value in row[:number_of_parameters])
+
+                if len(row) == len(self.header) and parameters in recorded_parameters:
+                    finished_rows[parameters] = row
+
+        return finished_rows
+
+    def _open_files(self, finished_rows: dict) -> tuple:
+        """
+        Replaces the CSV and checkpoint files by files with the finished runs only and opens them
+        for appending.
+        """
+        with open(self.csv_file_name + '.tmp', 'w', newline='') as csv_file:
+            csv_file_writer = csv.writer(csv_file, delimiter=',')
+            csv_file_writer.writerow(self.header)
+
+            for row in finished_rows.values():
+                csv_file_writer.writerow(row)
+
+        with open(self.checkpoint_file_name + '.tmp', 'w') as checkpoint_file:
+            for parameters in finished_rows.keys():
+                checkpoint_file.write(json.dumps(list(parameters)) + '\n')
+
+        os.replace(self.csv_file_name + '.tmp', self.csv_file_name)
+        os.replace(self.checkpoint_file_name + '.tmp', self.checkpoint_file_name)
+
+        return open(self.csv_file_name, 'a', newline=''), open(self.checkpoint_file_name, 'a')
+
+    @staticmethod
+    def _parse_value(value: str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
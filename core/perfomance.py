@@ -27,6 +27,12 @@ def create_drawdowns(pnl):
     as well as the duration of the drawdown. Requires that the
     pnl_returns is a pandas Series.
 
+    The high water mark starts at zero and the first value of the
+    curve is skipped (it has no return), the duration is the number
+    of periods since the curve was last at its high water mark.
+    Missing values of pnl are filled with zero in place, as the
+    previous loop did.
+
     Parameters:
     pnl - A pandas Series representing period percentage returns.
 
@@ -34,21 +40,64 @@ def create_drawdowns(pnl):
     drawdown, duration - Highest peak-to-trough drawdown and duration.
     """
 
-    # Calculate the cumulative returns curve
-    # and set up the High Water Mark
-    hwm = [0]
-
-    # Create the drawdown and duration series
     idx = pnl.index
-    drawdown = pd.Series(index=idx)
-    duration = pd.Series(index=idx)
-
     pnl.fillna(0, inplace=True)
+    values = pnl.to_numpy(dtype=np.float64)
+
+    drawdown = np.full(len(values), np.nan)
+    duration = np.full(len(values), np.nan)
+
+    if len(values) > 1:
+        # High water mark and drawdown of every period
+        hwm = np.maximum.accumulate(np.maximum(values[1:], 0))
+        drawdown[1:] = hwm - values[1:]
 
-    # Loop over the index range
-    for t in range(1, len(idx)):
-        hwm.append(max(hwm[t - 1], pnl[t]))
-        drawdown[t] = (hwm[t] - pnl[t])
-        duration[t] = (0 if drawdown[t] == 0 else duration[t - 1] + 1)
+        # Duration is the distance from the last period without drawdown
+        periods = np.arange(1, len(values))
+        last_period_at_hwm = np.maximum.accumulate(np.where(drawdown[1:] == 0, periods, 0))
+        duration[1:] = periods - last_period_at_hwm
+
+    drawdown = pd.Series(drawdown, index=idx)
+    duration = pd.Series(duration, index=idx)
 
     return drawdown, drawdown.max(), duration.max()
+
+
+class DrawdownAccumulator(object):
+    """
+    DrawdownAccumulator updates the high water mark, drawdown and its
+    duration bar by bar with the same results as create_drawdowns gives
+    for the whole curve, so they are known while the backtest runs.
+    """
+
+    def __init__(self) -> None:
+        self.hwm = 0.0
+        self.drawdown = 0.0
+        self.duration = 0
+        self.max_drawdown = 0.0
+        self.max_duration = 0
+
+    def update(self, value: float) -> None:
+        if value > self.hwm:
+            self.hwm = value
+
+        self.drawdown = self.hwm - value
+        self.duration = 0 if self.drawdown == 0 else self.duration + 1
+
+        if self.drawdown > self.max_drawdown:
+            self.max_drawdown = self.drawdown
+
+        if self.duration > self.max_duration:
+            self.max_duration = self.duration
+
+    def get_drawdown(self) -> float:
+        return self.drawdown
+
+    def get_duration(self) -> int:
+        return self.duration
+
+    def get_max_drawdown(self) -> float:
+        return self.max_drawdown
+
+    def get_max_duration(self) -> int:
+        return self.max_duration
@@ -1,12 +1,17 @@
 import os
+import numpy as np
 import pandas as pd
 from events.order_event import OrderEvent
 from events.fill_event import FillEvent
 from events.close_pending_orders_event import ClosePendingOrdersEvent
 from core.perfomance import create_sharpe_ratio, create_drawdowns
+from core.online_metrics import OnlineMetrics
 from core.stats import Stats
 from core.position import Position
+from core.ledger import Ledger
 from typing import Dict
+from typing import Optional
+from events.event_kind import EventKind
 
 try:
     import Queue as queue
@@ -15,9 +20,25 @@ except ImportError:
 
 
 class Portfolio(object):
+
+    SNAPSHOT_EVERY_BAR = 1
+    SNAPSHOT_ON_FILLS = 0
+
+    SHARPE_RATIO_PERIODS = 252 * 60 * 6.5
+
     def __init__(self, bars, events_per_symbol: Dict[str, queue.Queue], start_date,
                  initial_capital, output_directory, equity_filename, trades_filename,
-                 position_size_handler) -> None:
+                 position_size_handler, snapshot_frequency: int = SNAPSHOT_EVERY_BAR) -> None:
+        """
+        The history of positions (quantities) and holdings is kept in ledgers (see Ledger). A snapshot
+        is taken on every snapshot_frequency-th market event, with SNAPSHOT_ON_FILLS only on the first
+        market event after a fill. The last market event is always recorded before the equity curve
+        is created.
+
+        The Sharpe ratio is annualized by the number of snapshots per year (see
+        get_sharpe_ratio_periods), with SNAPSHOT_ON_FILLS the snapshots are not periodic and the
+        Sharpe and Sortino ratios are not defined (NaN).
+        """
         self.bars = bars
         self.events_per_symbol = events_per_symbol
         self.symbol_list = self.bars.symbol_list
@@ -27,33 +48,53 @@ class Portfolio(object):
         self.equity_filename = equity_filename
         self.trades_filename = trades_filename
         self.position_size_handler = position_size_handler
+        self.snapshot_frequency = snapshot_frequency
 
-        self.all_positions = self.construct_all_positions()
+        self.positions_ledger = self.construct_positions_ledger()
 
         self.current_positions = dict((k, v) for k, v in \
                                       [(s, None) for s in self.symbol_list])
 
-        self.all_holdings = self.construct_all_holdings()
+        self.holdings_ledger = self.construct_holdings_ledger()
         self.current_holdings = self.construct_current_holdings()
         self.trades = {}
 
+        self.number_of_market_events = 0
+        self.has_fills_since_snapshot = False
+        self.has_unrecorded_snapshot = False
+
+        # Time zone of the bars, taken from the datetime of the first recorded bar
+        self.tz = None
+        self.has_tz = False
+
+        # Performance as of the last snapshot and the closed trades
+        self.online_metrics = OnlineMetrics(self.initial_capital, self.get_sharpe_ratio_periods())
+
+    def get_sharpe_ratio_periods(self) -> Optional[float]:
+        """
+        Returns the number of snapshots per year, None when snapshots are taken only on fills.
+        """
+        if self.snapshot_frequency == self.SNAPSHOT_ON_FILLS:
+            return None
+
+        return self.SHARPE_RATIO_PERIODS / self.snapshot_frequency
+
     def get_current_position(self, symbol):
         return self.current_positions[symbol]
 
-    def construct_all_positions(self):
-        d = dict((k, v) for k, v in [(s, None) for s in self.symbol_list])
-        d['datetime'] = self.start_date
+    def construct_positions_ledger(self) -> Ledger:
+        ledger = Ledger(self.symbol_list)
+        ledger.append(self.start_date, [0.0] * len(self.symbol_list))
 
-        return [d]
+        return ledger
 
-    def construct_all_holdings(self):
-        d = dict((k, v) for k, v in [(s, 0.0) for s in self.symbol_list])
-        d['datetime'] = self.start_date
-        d['cash'] = self.initial_capital
-        d['commission'] = 0.0
-        d['total'] = self.initial_capital
+    def construct_holdings_ledger(self) -> Ledger:
+        ledger = Ledger(self.symbol_list + ['cash', 'commission', 'total'])
+        ledger.append(self.start_date, [0.0] * len(self.symbol_list) + [
+            self.initial_capital, 0.0, self.initial_capital
+        ])
 
-        return [d]
+        return ledger
 
     def construct_current_holdings(self):
         d = dict((k, v) for k, v in [(s, 0.0) for s in self.symbol_list])
@@ -64,46 +105,74 @@ class Portfolio(object):
         return d
 
     def update_timeindex(self):
-        latest_datetime = None
-        for symbol in self.symbol_list:
-            if self.bars.has_some_bars(symbol):
-                latest_datetime_for_symbol = self.bars.get_latest_bar_datetime(symbol)
+        self.number_of_market_events += 1
 
-                if latest_datetime is None or latest_datetime < latest_datetime_for_symbol:
-                    latest_datetime = latest_datetime_for_symbol
+        if self.snapshot_frequency == self.SNAPSHOT_ON_FILLS:
+            should_record = self.has_fills_since_snapshot
+        else:
+            should_record = self.number_of_market_events % self.snapshot_frequency == 0
 
-        # Update positions
-        # ================
-        dp = dict((k, v) for k, v in [(s, 0) for s in self.symbol_list])
-        dp['datetime'] = latest_datetime
+        if should_record:
+            self.record_snapshot()
+        else:
+            self.has_unrecorded_snapshot = True
+
+    def flush_snapshot(self):
+        """
+        Records the last market event when it was skipped by the snapshot frequency.
+        """
+        if self.has_unrecorded_snapshot:
+            self.record_snapshot()
+
+    def record_snapshot(self):
+        self.has_fills_since_snapshot = False
+        self.has_unrecorded_snapshot = False
+
+        # Timestamps are compared as integers, the datetime of a bar is created only for the time zone
+        latest_timestamp = None
+        latest_symbol = None
+        for symbol in self.symbol_list:
+            if self.bars.has_some_bars(symbol):
+                latest_timestamp_for_symbol = self.bars.get_latest_bar_timestamp(symbol)
 
-        for s in self.symbol_list:
-            dp[s] = self.get_current_position(s)
+                if latest_timestamp is None or latest_timestamp < latest_timestamp_for_symbol:
+                    latest_timestamp = latest_timestamp_for_symbol
+                    latest_symbol = symbol
 
-        # Append the current positions
-        self.all_positions.append(dp)
+        if latest_timestamp is None:
+            latest_timestamp = Ledger.NAT
+        elif not self.has_tz:
+            self.tz = self.bars.get_latest_bar_datetime(latest_symbol).tzinfo
+            self.has_tz = True
 
-        # Update holdings
-        # ===============
-        dh = dict((k, v) for k, v in [(s, 0) for s in self.symbol_list])
-        dh['datetime'] = latest_datetime
-        dh['cash'] = self.current_holdings['cash']
-        dh['commission'] = self.current_holdings['commission']
-        dh['total'] = self.current_holdings['cash']
+        # Update positions and holdings
+        # ==============================
+        quantities = []
+        market_values = []
+        total = self.current_holdings['cash']
 
         for s in self.symbol_list:
             # Approximation to the real value
             position = self.get_current_position(s)
             if position is not None:
+                quantities.append(position.get_quantity())
                 market_value = position.get_quantity() * self.bars.get_latest_bar_value(s, "close_bid")
             else:
+                quantities.append(0.0)
                 market_value = 0
 
-            dh[s] = market_value
-            dh['total'] += market_value
+            market_values.append(market_value)
+            total += market_value
 
-        # Append the current holdings
-        self.all_holdings.append(dh)
+        self.positions_ledger.append_timestamp(latest_timestamp, quantities, self.tz)
+        self.holdings_ledger.append_timestamp(latest_timestamp, market_values + [
+            self.current_holdings['cash'], self.current_holdings['commission'], total
+        ], self.tz)
+
+        self.online_metrics.update_equity(total)
+
+    def get_online_metrics(self) -> OnlineMetrics:
+        return self.online_metrics
 
     def update_positions_from_fill(self, fill):
 
@@ -163,6 +232,11 @@ class Portfolio(object):
             self.trades[fill.trade_id]['profit'] = cost + self.trades[fill.trade_id]['openCost']
             self.trades[fill.trade_id]['commission'] = self.trades[fill.trade_id]['commission'] + fill.commission
 
+            if self.trades[fill.trade_id]['opened'] is not None:
+                # Cash flow of the trade (the costs are subtracted from the cash)
+                self.online_metrics.update_closed_trade(-(self.trades[fill.trade_id]['openCost'] + cost) -
+                                                        self.trades[fill.trade_id]['commission'])
+
     def get_fill_direction_koeficient(self, fill: FillEvent) -> int:
         fill_direction_koeficient = 0
 
@@ -183,9 +257,10 @@ class Portfolio(object):
         return fill_direction_koeficient
 
     def update_fill(self, event):
-        if event.type == 'FILL':
+        if event.kind == EventKind.FILL:
             self.update_holdings_from_fill(event)
             self.update_positions_from_fill(event)
+            self.has_fills_since_snapshot = True
 
     def generate_naive_order(self, signal):
         order = None
@@ -220,7 +295,7 @@ class Portfolio(object):
         return order
 
     def update_signal(self, event):
-        if event.type == 'SIGNAL':
+        if event.kind == EventKind.SIGNAL:
             order_event = self.generate_naive_order(event)
 
             if order_event is not None:
@@ -230,19 +305,105 @@ class Portfolio(object):
                 close_pending_orders_event = ClosePendingOrdersEvent(event.symbol)
                 self.events_per_symbol[close_pending_orders_event.symbol].put(close_pending_orders_event)
 
+    def get_state(self) -> dict:
+        """
+        Returns the ledgers, the current positions and holdings and the trades, so the portfolio
+        of one symbol can be sent from a worker process and merged (see merge_states).
+        """
+        self.flush_snapshot()
+
+        return dict(
+            positions_ledger=self.positions_ledger,
+            holdings_ledger=self.holdings_ledger,
+            current_positions=self.current_positions,
+            current_holdings=self.current_holdings,
+            trades=self.trades
+        )
+
+    def merge_states(self, states_per_symbol: Dict[str, dict]) -> None:
+        """
+        Replaces the history by the merged states of portfolios which traded one symbol each
+        with the whole initial capital. The merged ledgers have one row per datetime recorded by
+        any of the portfolios, holding the latest row of every symbol at that datetime, and the
+        cash is the initial capital plus the cash flows of all symbols. Trades are keyed by
+        'symbol-trade_id' in the order of symbol_list.
+        """
+        symbols = [s for s in self.symbol_list if s in states_per_symbol]
+        positions_ledgers = [states_per_symbol[s]['positions_ledger'] for s in symbols]
+        holdings_ledgers = [states_per_symbol[s]['holdings_ledger'] for s in symbols]
+
+        # The first rows are the initial state, they are not merged
+        datetimes = np.unique(np.concatenate([ledger.get_datetimes()[1:] for ledger in holdings_ledgers]))
+
+        self.positions_ledger = self.construct_positions_ledger()
+        self.holdings_ledger = self.construct_holdings_ledger()
+
+        quantities = np.zeros((len(datetimes), len(self.symbol_list)))
+        holdings = np.zeros((len(datetimes), len(self.symbol_list) + 3))
+        holdings[:, -3:] = [self.initial_capital, 0.0, self.initial_capital]
+
+        for s, positions_ledger, holdings_ledger in zip(symbols, positions_ledgers, holdings_ledgers):
+            # Position of the latest row of the symbol at every merged datetime
+            rows = np.searchsorted(holdings_ledger.get_datetimes()[1:], datetimes, side='right')
+            column = self.symbol_list.index(s)
+
+            quantities[:, column] = positions_ledger.get_column(s)[rows]
+            holdings[:, column] = holdings_ledger.get_column(s)[rows]
+            holdings[:, -3] += holdings_ledger.get_column('cash')[rows] - self.initial_capital
+            holdings[:, -2] += holdings_ledger.get_column('commission')[rows]
+            holdings[:, -1] += holdings_ledger.get_column('total')[rows] - self.initial_capital
+
+            if self.holdings_ledger.tz is None:
+                self.positions_ledger.tz = self.holdings_ledger.tz = holdings_ledger.tz
+
+        self.positions_ledger.append_rows(datetimes, quantities)
+        self.holdings_ledger.append_rows(datetimes, holdings)
+
+        self.online_metrics = OnlineMetrics(self.initial_capital, self.get_sharpe_ratio_periods())
+        for total in holdings[:, -1]:
+            self.online_metrics.update_equity(total)
+
+        current_holdings = self.construct_current_holdings()
+        for s in symbols:
+            state = states_per_symbol[s]
+
+            self.current_positions[s] = state['current_positions'][s]
+
+            current_holdings[s] = state['current_holdings'][s]
+            current_holdings['cash'] += state['current_holdings']['cash'] - self.initial_capital
+            current_holdings['commission'] += state['current_holdings']['commission']
+            current_holdings['total'] += state['current_holdings']['total'] - self.initial_capital
+
+        self.current_holdings = current_holdings
+
+        self.trades = {}
+        for s in symbols:
+            for trade_id in sorted(states_per_symbol[s]['trades'].keys()):
+                self.trades['{}-{}'.format(s, trade_id)] = states_per_symbol[s]['trades'][trade_id]
+
+        for trade in self.trades.values():
+            if trade['opened'] is not None and trade['closed'] is not None:
+                self.online_metrics.update_closed_trade(-(trade['openCost'] + trade['closeCost']) -
+                                                        trade['commission'])
+
     def create_equity_curve_dataframe(self):
-        curve = pd.DataFrame(self.all_holdings)
-        curve.set_index('datetime', inplace=True)
+        self.flush_snapshot()
+
+        curve = self.holdings_ledger.to_dataframe()
         curve['returns'] = curve['total'].pct_change()
         curve['equity_curve'] = (1.0 + curve['returns']).cumprod()
         self.equity_curve = curve
 
     def output_summary_stats(self):
-        total_return = self.equity_curve['equity_curve'][-1]
+        total_return = self.equity_curve['equity_curve'].iloc[-1]
         returns = self.equity_curve['returns']
         pnl = self.equity_curve['equity_curve']
-        sharpe_ratio = create_sharpe_ratio(returns, periods=252 * 60 * 6.5)
+        sharpe_ratio = float('nan')
+
+        if self.get_sharpe_ratio_periods() is not None:
+            sharpe_ratio = create_sharpe_ratio(returns, periods=self.get_sharpe_ratio_periods())
         drawdown, max_dd, dd_duration = create_drawdowns(pnl)
+        self.equity_curve['equity_curve'] = pnl
         self.equity_curve['drawdown'] = drawdown
 
         stats = Stats((total_return - 1.0) * 100.0, sharpe_ratio, max_dd * 100.0, dd_duration, self.trades)
@@ -255,3 +416,11 @@ class Portfolio(object):
             trades.to_csv(os.path.join(self.output_directory, self.trades_filename), index_label='tradeId')
 
         return stats
+
+    def create_pruned_stats(self, pruned_reason: str) -> Stats:
+        """
+        Returns the stats of a backtest stopped early from the online metrics, no files are written.
+        """
+        return Stats(self.online_metrics.get_total_return(), self.online_metrics.get_sharpe_ratio(),
+                     self.online_metrics.get_max_drawdown(), self.online_metrics.get_drawdown_duration(),
+                     self.trades, pruned_reason)
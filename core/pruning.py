@@ -0,0 +1,83 @@
+from core.online_metrics import OnlineMetrics
+from typing import Optional
+
+
+class PruningRule(object):
+    """
+    PruningRule stops a backtest which is already hopeless (e.g. in an
+    optimization sweep). Rules are checked from the online metrics of the
+    portfolio (see OnlineMetrics), so checking them costs a few comparisons.
+    A rule is checked only after after_bars bars were released, before that
+    the metrics are too noisy. Backtest counts the bars of the symbol whose
+    bar was released last, not the bars of all symbols.
+    """
+
+    def __init__(self, after_bars: int = 0) -> None:
+        self.after_bars = after_bars
+
+    def get_reason(self, online_metrics: OnlineMetrics, number_of_bars: int) -> Optional[str]:
+        """
+        Returns why the backtest has to stop, None when it can continue.
+        """
+        if number_of_bars < self.after_bars:
+            return None
+
+        return self._get_reason(online_metrics)
+
+    def _get_reason(self, online_metrics: OnlineMetrics) -> Optional[str]:
+        raise NotImplementedError("Should implement _get_reason()")
+
+
+class MaxDrawdownRule(PruningRule):
+    def __init__(self, max_drawdown: float, after_bars: int = 0) -> None:
+        """
+        max_drawdown is in percent, as in Stats.
+        """
+        super().__init__(after_bars)
+        self.max_drawdown = max_drawdown
+
+    def _get_reason(self, online_metrics: OnlineMetrics) -> Optional[str]:
+        if online_metrics.get_max_drawdown() > self.max_drawdown:
+            return 'Max Drawdown %0.2f%% > %0.2f%%' % (online_metrics.get_max_drawdown(), self.max_drawdown)
+
+        return None
+
+
+class MinSharpeRatioRule(PruningRule):
+    def __init__(self, min_sharpe_ratio: float, after_bars: int = 0) -> None:
+        super().__init__(after_bars)
+        self.min_sharpe_ratio = min_sharpe_ratio
+
+    def _get_reason(self, online_metrics: OnlineMetrics) -> Optional[str]:
+        if online_metrics.get_sharpe_ratio() < self.min_sharpe_ratio:
+            return 'Sharpe Ratio %0.2f < %0.2f' % (online_metrics.get_sharpe_ratio(), self.min_sharpe_ratio)
+
+        return None
+
+
+class MinTotalReturnRule(PruningRule):
+    def __init__(self, min_total_return: float, after_bars: int = 0) -> None:
+        """
+        min_total_return is in percent, as in Stats.
+        """
+        super().__init__(after_bars)
+        self.min_total_return = min_total_return
+
+    def _get_reason(self, online_metrics: OnlineMetrics) -> Optional[str]:
+        if online_metrics.get_total_return() < self.min_total_return:
+            return 'Total Return %0.2f%% < %0.2f%%' % (online_metrics.get_total_return(), self.min_total_return)
+
+        return None
+
+
+def get_pruned_reason(pruning_rules: list, online_metrics: OnlineMetrics, number_of_bars: int) -> Optional[str]:
+    """
+    Returns the reason of the first rule which stops the backtest, None when none does.
+    """
+    for pruning_rule in pruning_rules:
+        reason = pruning_rule.get_reason(online_metrics, number_of_bars)
+
+        if reason is not None:
+            return '{} after {} bars'.format(reason, number_of_bars)
+
+    return None
@@ -0,0 +1,405 @@
+import math
+import itertools
+import numpy as np
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+
+class ParameterSpace(object):
+    """
+    ParameterSpace is the grid of parameters to search - every dimension is
+    a sequence of values (e.g. a range of stop loss pips) and parameters are
+    tuples with one value of every dimension.
+    """
+
+    def __init__(self, dimensions: List[Sequence]) -> None:
+        self.dimensions = [list(dimension) for dimension in dimensions]
+
+        for dimension in self.dimensions:
+            if len(dimension) == 0:
+                raise Exception('Every dimension of the parameter space needs at least one value')
+
+    def get_size(self) -> int:
+        size = 1
+
+        for dimension in self.dimensions:
+            size *= len(dimension)
+
+        return size
+
+    def get_all(self) -> Iterable[tuple]:
+        return itertools.product(*self.dimensions)
+
+    def get_parameters(self, indices: Sequence[int]) -> tuple:
+        return tuple(dimension[int(index)] for dimension, index in zip(self.dimensions, indices))
+
+    def get_indices(self, parameters: tuple) -> tuple:
+        return tuple(dimension.index(value) for dimension, value in zip(self.dimensions, parameters))
+
+    def get_parameters_at(self, position: int) -> tuple:
+        """
+        Returns the parameters at position of itertools.product order.
+        """
+        indices = []
+
+        for dimension in reversed(self.dimensions):
+            position, index = divmod(position, len(dimension))
+            indices.append(index)
+
+        return self.get_parameters(reversed(indices))
+
+
+class Trial(object):
+    """
+    Trial is one run asked by a search optimizer - the parameters and the
+    fraction of history (from its beginning) they are evaluated on.
+    """
+
+    def __init__(self, parameters: tuple, budget: float = 1.0) -> None:
+        self.parameters = parameters
+        self.budget = budget
+
+    def is_complete(self) -> bool:
+        """
+        Returns True when the trial runs on the whole history.
+        """
+        return self.budget >= 1.0
+
+
+class SearchOptimizer(object):
+    """
+    SearchOptimizer proposes the parameters to run (ask) and learns from
+    their scores (tell), higher scores are better. ask returns None when
+    there is nothing to run until some of the asked trials are told, or when
+    the search is finished (see is_finished).
+    """
+
+    def ask(self) -> Optional[Trial]:
+        raise NotImplementedError("Should implement ask()")
+
+    def tell(self, trial: Trial, score: float) -> None:
+        raise NotImplementedError("Should implement tell()")
+
+    def is_finished(self) -> bool:
+        raise NotImplementedError("Should implement is_finished()")
+
+    def get_number_of_runs(self) -> Optional[int]:
+        """
+        Returns the number of complete trials which will be asked, None when not known.
+        """
+        return None
+
+    def get_total_budget(self) -> Optional[float]:
+        """
+        Returns the sum of the budgets of all trials which will be asked (a complete trial counts
+        1), None when not known.
+        """
+        number_of_runs = self.get_number_of_runs()
+
+        return float(number_of_runs) if number_of_runs is not None else None
+
+
+class GridSearch(SearchOptimizer):
+    """
+    Runs all parameters in the given order.
+    """
+
+    def __init__(self, parameters_list: Iterable[tuple]) -> None:
+        self.parameters_list = [tuple(parameters) for parameters in parameters_list]
+        self.position = 0
+
+    def ask(self) -> Optional[Trial]:
+        if self.is_finished():
+            return None
+
+        self.position += 1
+
+        return Trial(self.parameters_list[self.position - 1])
+
+    def tell(self, trial: Trial, score: float) -> None:
+        pass
+
+    def is_finished(self) -> bool:
+        return self.position >= len(self.parameters_list)
+
+    def get_number_of_runs(self) -> Optional[int]:
+        return len(self.parameters_list)
+
+
+class RandomSampler(object):
+    """
+    Samples distinct parameters of the space uniformly.
+    """
+
+    def __init__(self, space: ParameterSpace, random_state: np.random.RandomState) -> None:
+        self.space = space
+        self.random_state = random_state
+        self.sampled_positions = set()
+        self.remaining_positions = None
+
+    def has_next(self) -> bool:
+        return len(self.sampled_positions) < self.space.get_size()
+
+    def next(self) -> tuple:
+        size = self.space.get_size()
+
+        # Rejection sampling gets slow when most of the space was sampled, the rest is shuffled then
+        if len(self.sampled_positions) * 2 < size:
+            position = int(self.random_state.randint(0, size))
+
+            while position in self.sampled_positions:
+                position = int(self.random_state.randint(0, size))
+        else:
+            if self.remaining_positions is None:
+                self.remaining_positions = [position for position in range(size)
+                                            if position not in self.sampled_positions]
+                self.random_state.shuffle(self.remaining_positions)
+
+            position = self.remaining_positions.pop()
+
+        self.sampled_positions.add(position)
+
+        return self.space.get_parameters_at(position)
+
+    def mark_sampled(self, parameters: tuple) -> None:
+        position = 0
+
+        for dimension, index in zip(self.space.dimensions, self.space.get_indices(parameters)):
+            position = position * len(dimension) + index
+
+        if self.remaining_positions is not None and position not in self.sampled_positions:
+            self.remaining_positions.remove(position)
+
+        self.sampled_positions.add(position)
+
+
+class RandomSearch(SearchOptimizer):
+    """
+    Runs number_of_runs distinct parameters sampled at random (all of the
+    space when None, the sweep can be limited by time then).
+    """
+
+    def __init__(self, space: ParameterSpace, number_of_runs: Optional[int] = None,
+                 random_seed: Optional[int] = None) -> None:
+        self.number_of_runs = min(number_of_runs, space.get_size()) if number_of_runs is not None else \
+            space.get_size()
+        self.sampler = RandomSampler(space, np.random.RandomState(random_seed))
+        self.asked = 0
+
+    def ask(self) -> Optional[Trial]:
+        if self.is_finished():
+            return None
+
+        self.asked += 1
+
+        return Trial(self.sampler.next())
+
+    def tell(self, trial: Trial, score: float) -> None:
+        pass
+
+    def is_finished(self) -> bool:
+        return self.asked >= self.number_of_runs
+
+    def get_number_of_runs(self) -> Optional[int]:
+        return self.number_of_runs
+
+
+class SuccessiveHalving(SearchOptimizer):
+    """
+    Evaluates number_of_candidates random parameters on a prefix of the
+    history first and promotes the best 1 / reduction_factor of them to a
+    reduction_factor times longer prefix, until the best ones run on the
+    whole history. Rungs are run one after another, the next one is asked
+    when all trials of the previous one were told.
+    """
+
+    def __init__(self, space: ParameterSpace, number_of_candidates: int, reduction_factor: int = 3,
+                 random_seed: Optional[int] = None) -> None:
+        if reduction_factor < 2:
+            raise Exception('Reduction factor of successive halving has to be at least 2')
+
+        self.reduction_factor = reduction_factor
+
+        sampler = RandomSampler(space, np.random.RandomState(random_seed))
+        number_of_candidates = min(number_of_candidates, space.get_size())
+        candidates = [sampler.next() for _ in range(number_of_candidates)]
+
+        # Rung r runs number_of_candidates / factor^r candidates on factor^(r - last rung) of the history
+        self.number_of_rungs = 1
+        self.number_of_final_runs = number_of_candidates
+
+        while number_of_candidates // self.reduction_factor ** self.number_of_rungs > 0:
+            self.number_of_final_runs = number_of_candidates // self.reduction_factor ** self.number_of_rungs
+            self.number_of_rungs += 1
+
+        self.total_budget = 0.0
+        rung_size = number_of_candidates
+
+        for rung in range(self.number_of_rungs):
+            self.total_budget += rung_size * self.get_budget(rung)
+            rung_size = max(1, rung_size // self.reduction_factor)
+
+        self.rung = 0
+        self.pending = candidates
+        self.running = 0
+        self.scores = {}
+
+    def get_budget(self, rung: int) -> float:
+        return float(self.reduction_factor) ** (rung - self.number_of_rungs + 1)
+
+    def ask(self) -> Optional[Trial]:
+        if not self.pending and self.running == 0 and self.rung < self.number_of_rungs - 1:
+            self._promote()
+
+        if not self.pending:
+            return None
+
+        self.running += 1
+
+        return Trial(self.pending.pop(0), self.get_budget(self.rung))
+
+    def _promote(self) -> None:
+        ranked = sorted(self.scores.keys(), key=lambda parameters: self.scores[parameters], reverse=True)
+
+        self.rung += 1
+        self.pending = ranked[:max(1, len(ranked) // self.reduction_factor)]
+        self.scores = {}
+
+    def tell(self, trial: Trial, score: float) -> None:
+        self.running -= 1
+        self.scores[trial.parameters] = score
+
+    def is_finished(self) -> bool:
+        return self.rung == self.number_of_rungs - 1 and not self.pending and self.running == 0
+
+    def get_number_of_runs(self) -> Optional[int]:
+        return self.number_of_final_runs
+
+    def get_total_budget(self) -> Optional[float]:
+        return self.total_budget
+
+
+class TreeParzenEstimator(SearchOptimizer):
+    """
+    Tree-structured Parzen Estimator search. After number_of_startup_runs
+    random runs, the told trials are split into the best gamma of them and
+    the rest, the values of every dimension of both groups are smoothed by a
+    Gaussian kernel over the positions of the values (plus a uniform prior)
+    and the candidate with the highest ratio of the densities of the best
+    and the rest is asked. Trials which were asked and not told yet are not
+    asked again, so several runs can be in progress at once.
+    """
+
+    def __init__(self, space: ParameterSpace, number_of_runs: int, number_of_startup_runs: int = 10,
+                 gamma: float = 0.25, number_of_candidates: int = 24, random_seed: Optional[int] = None) -> None:
+        self.space = space
+        self.number_of_runs = min(number_of_runs, space.get_size())
+        self.number_of_startup_runs = number_of_startup_runs
+        self.gamma = gamma
+        self.number_of_candidates = number_of_candidates
+
+        self.random_state = np.random.RandomState(random_seed)
+        self.sampler = RandomSampler(space, self.random_state)
+        self.asked = set()
+        self.observations = []
+
+    def ask(self) -> Optional[Trial]:
+        if self.is_finished():
+            return None
+
+        parameters = None
+
+        if len(self.observations) >= self.number_of_startup_runs:
+            parameters = self._suggest()
+
+        if parameters is None:
+            parameters = self.sampler.next()
+        else:
+            self.sampler.mark_sampled(parameters)
+
+        self.asked.add(parameters)
+
+        return Trial(parameters)
+
+    def _suggest(self) -> Optional[tuple]:
+        ranked = sorted(self.observations, key=lambda observation: observation[1], reverse=True)
+        number_of_good = max(1, int(math.ceil(self.gamma * len(ranked))))
+
+        good = np.array([indices for indices, score in ranked[:number_of_good]])
+        bad = np.array([indices for indices, score in ranked[number_of_good:]]).reshape(-1, len(self.space.dimensions))
+
+        candidates = []
+        log_ratios = np.zeros(self.number_of_candidates)
+
+        for dimension, values in enumerate(self.space.dimensions):
+            good_density = self._get_density(good[:, dimension], len(values))
+            bad_density = self._get_density(bad[:, dimension], len(values))
+
+            indices = self.random_state.choice(len(values), self.number_of_candidates, p=good_density)
+            candidates.append(indices)
+            log_ratios += np.log(good_density[indices]) - np.log(bad_density[indices])
+
+        for candidate in np.argsort(-log_ratios, kind='stable'):
+            parameters = self.space.get_parameters([indices[candidate] for indices in candidates])
+
+            if parameters not in self.asked:
+                return parameters
+
+        return None
+
+    @staticmethod
+    def _get_density(observed_indices: np.ndarray, number_of_values: int) -> np.ndarray:
+        positions = np.arange(number_of_values)
+        bandwidth = max(1.0, 0.25 * (number_of_values - 1) * (len(observed_indices) + 1) ** -0.2)
+
+        # The uniform prior has the weight of one observation
+        density = np.full(number_of_values, 1.0 / number_of_values)
+
+        if len(observed_indices) > 0:
+            kernels = np.exp(-0.5 * ((positions[np.newaxis, :] - observed_indices[:, np.newaxis]) / bandwidth) ** 2)
+            density += np.sum(kernels / kernels.sum(axis=1, keepdims=True), axis=0)
+
+        return density / density.sum()
+
+    def tell(self, trial: Trial, score: float) -> None:
+        self.observations.append((self.space.get_indices(trial.parameters), score))
+
+    def is_finished(self) -> bool:
+        return len(self.asked) >= self.number_of_runs
+
+    def get_number_of_runs(self) -> Optional[int]:
+        return self.number_of_runs
+
+
+class SearchOptimizerFactory(object):
+    SEARCH_GRID = 'grid'
+    SEARCH_RANDOM = 'random'
+    SEARCH_HALVING = 'halving'
+    SEARCH_TPE = 'tpe'
+
+    SEARCHES = [SEARCH_GRID, SEARCH_RANDOM, SEARCH_HALVING, SEARCH_TPE]
+
+    @staticmethod
+    def create(search: str, space: ParameterSpace, number_of_runs: Optional[int] = None,
+               random_seed: Optional[int] = None) -> SearchOptimizer:
+        """
+        number_of_runs is the number of candidates of the first rung for successive halving.
+        """
+        if search == SearchOptimizerFactory.SEARCH_GRID:
+            return GridSearch(space.get_all())
+
+        if search == SearchOptimizerFactory.SEARCH_RANDOM:
+            return RandomSearch(space, number_of_runs, random_seed)
+
+        if number_of_runs is None:
+            raise Exception('Number of runs has to be defined for {} search'.format(search))
+
+        if search == SearchOptimizerFactory.SEARCH_HALVING:
+            return SuccessiveHalving(space, number_of_runs, random_seed=random_seed)
+
+        if search == SearchOptimizerFactory.SEARCH_TPE:
+            return TreeParzenEstimator(space, number_of_runs, random_seed=random_seed)
+
+        raise Exception('Unknown search {}'.format(search))
@@ -0,0 +1,135 @@
+from __future__ import print_function
+import sys
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from core.backtest import Backtest
+from core.configuration import Configuration
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from typing import Optional
+
+
+class BacktestShard(Backtest):
+    """
+    BacktestShard is the backtest of one symbol run by a worker process of ShardedBacktest.
+    """
+
+    def run_shard(self) -> dict:
+        self._run_timeline(self.symbol_list)
+
+        return dict(
+            portfolio=self.portfolio.get_state(),
+            signals=self.signals,
+            orders=self.orders,
+            fills=self.fills,
+            pruned_reason=self.pruned_reason
+        )
+
+
+def run_backtest_shard(arguments: dict, symbol: str) -> dict:
+    return BacktestShard(symbol_list=[symbol], logger=None, status_stream=None, **arguments).run_shard()
+
+
+class ShardedBacktest(Backtest):
+    """
+    ShardedBacktest runs every symbol in its own process, so pure Python
+    strategies of several symbols are not serialized by the GIL. Every process
+    has its own data handler, strategy, execution handler and portfolio of one
+    symbol. The portfolios are merged deterministically (see
+    Portfolio.merge_states) into the portfolio of this backtest when all
+    symbols are finished, so the equity curve and stats are generated as usual.
+
+    Symbols are independent of each other in this mode - every symbol is
+    traded with the whole initial capital and strategies or position size
+    handlers see only the positions and holdings of their own symbol. Events
+    are not logged by the worker processes.
+
+    Bars loaded from CSV files are placed into shared memory once (see
+    SharedBarData), so the processes do not read the files again and their
+    bars stay on the common timeline.
+
+    Pruning rules are checked by every process on the portfolio of its own
+    symbol, a process stops when a rule is hit while the other ones go on.
+    The backtest is pruned with the reason of the first pruned symbol (in the
+    order of symbol_list).
+    """
+
+    def __init__(self, *args, number_of_processes: Optional[int] = None, **kwargs) -> None:
+        """
+        number_of_processes defaults to one process per symbol.
+        """
+        self.number_of_processes = number_of_processes
+
+        super().__init__(*args, **kwargs)
+
+    def _generate_trading_instances(self):
+        self.data_handler = self.data_handler_factory.create_from_settings(self.configuration, self.events_per_symbol,
+                                                                           self.symbol_list, self.logger)
+
+        self.portfolio = self.portfolio_class(self.data_handler, self.events_per_symbol, self.start_date,
+                                              self.initial_capital, self.output_directory, self.equity_filename,
+                                              self.trades_filename, self.position_size_handler,
+                                              self.snapshot_frequency)
+
+    async def _run_symbols(self, symbol_list: list):
+        shared_bar_data = None
+        configuration = self.configuration
+
+        if self._should_share_bar_data():
+            shared_bar_data = self.data_handler.create_shared_bar_data()
+
+            configuration = copy.copy(self.configuration)
+            configuration.options = dict(self.configuration.options)
+            configuration.set_option(Configuration.OPTION_SHARED_BAR_DATA, shared_bar_data)
+
+        try:
+            results = self._run_shards(symbol_list, configuration)
+        finally:
+            if shared_bar_data is not None:
+                shared_bar_data.unlink()
+
+        self.portfolio.merge_states(dict((symbol, results[symbol]['portfolio']) for symbol in symbol_list))
+
+        for symbol in symbol_list:
+            self.signals += results[symbol]['signals']
+            self.orders += results[symbol]['orders']
+            self.fills += results[symbol]['fills']
+
+            if self.pruned_reason is None:
+                self.pruned_reason = results[symbol]['pruned_reason']
+
+    def _run_shards(self, symbol_list: list, configuration: Configuration) -> dict:
+        arguments = dict(
+            output_directory=self.output_directory, initial_capital=self.initial_capital, heartbeat=self.heartbeat,
+            start_date=self.start_date, configuration=configuration, data_handler_factory=self.data_handler_factory,
+            execution_handler_factory=self.execution_handler_factory, portfolio_class=self.portfolio_class,
+            strategy_class=self.strategy_class, position_size_handler=self.position_size_handler,
+            enabled_logs=self.enabled_log_types, strategy_params_dict=self.strategy_params_dict,
+            equity_filename=self.equity_filename, trades_filename=self.trades_filename,
+            event_queue_class=self.event_queue_class, pool_market_events=self.pool_market_events,
+            snapshot_frequency=self.snapshot_frequency, pruning_rules=self.pruning_rules
+        )
+
+        results = {}
+        max_workers = self.number_of_processes or len(symbol_list)
+
+        self.write_shards_progress(0, len(symbol_list))
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = dict(
+                (executor.submit(run_backtest_shard, arguments, symbol), symbol) for symbol in symbol_list
+            )
+
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                self.write_shards_progress(len(results), len(symbol_list))
+
+        return results
+
+    def _should_share_bar_data(self) -> bool:
+        return self.configuration.data_handler_name == HistoricCSVDataHandler and \
+            self.data_handler.shared_bar_data is None and self.data_handler.chunk_size is None
+
+    def write_shards_progress(self, finished: int, total: int):
+        print('Running backtest ({} of {} symbols)'.format(finished, total), end='\r')
+        sys.stdout.flush()
@@ -1,10 +1,15 @@
 class Stats(object):
-    def __init__(self, total_return, sharpe_ratio, max_drawdown, drawdown_duration, trades):
+    def __init__(self, total_return, sharpe_ratio, max_drawdown, drawdown_duration, trades, pruned_reason=None):
+        """
+        pruned_reason is defined when the backtest was stopped early (see PruningRule), the stats
+        cover only the bars until then.
+        """
         self.total_return = total_return
         self.sharpe_ratio = sharpe_ratio
         self.max_drawdown = max_drawdown
         self.drawdown_duration = drawdown_duration
         self.trades = trades
+        self.pruned_reason = pruned_reason
 
     def get_total_return(self):
         return self.total_return
@@ -21,7 +26,16 @@ class Stats(object):
     def get_number_of_trades(self):
         return len(self.trades)
 
+    def is_pruned(self):
+        return self.pruned_reason is not None
+
+    def get_pruned_reason(self):
+        return self.pruned_reason
+
     def print_stats(self):
+        if self.is_pruned():
+            print('Pruned: %s' % self.get_pruned_reason())
+
         if len(self.trades) > 0:
             print('Total Return: %0.2f%%' % self.get_total_return())
             print('Sharpe Ratio: %0.2f' % self.get_sharpe_ratio())
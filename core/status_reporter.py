@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import tempfile
+import threading
+import traceback
+from loggers.logger import Logger
+from typing import Callable
+from typing import Optional
+
+
+class StatusReporter(object):
+    """
+    StatusReporter writes the status of a running worker from its own
+    thread every interval seconds, so the loops of the worker only update
+    counters and do no I/O. The status is taken by create_status (a dict
+    which can be serialized to JSON with str as fallback) and written as text
+    (see format_status) and JSON. Files are replaced atomically, readers never
+    see a partially written status. A final status is written on stop.
+
+    A failed report (e.g. the status was taken while the worker was updating
+    it, or the file could not be written) is logged and the next one is
+    written on time.
+    """
+
+    DEFAULT_INTERVAL = 1.0
+
+    def __init__(self, create_status: Callable[[], dict], format_status: Callable[[dict], str],
+                 text_file: Optional[str] = None, json_file: Optional[str] = None, stream=None,
+                 interval: float = DEFAULT_INTERVAL, logger: Optional[Logger] = None) -> None:
+        """
+        When stream is defined (e.g. sys.stdout), the text is written there too, ended by carriage return.
+        Failed reports are written to logger, to sys.stderr when it is None.
+        """
+        self.create_status = create_status
+        self.format_status = format_status
+        self.text_file = text_file
+        self.json_file = json_file
+        self.stream = stream
+        self.interval = interval
+        self.logger = logger
+
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self) -> None:
+        self.stopped.clear()
+
+        self.thread = threading.Thread(target=self._run, name='StatusReporter', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is not None:
+            self.stopped.set()
+            self.thread.join()
+            self.thread = None
+
+        self.report()
+
+    def report(self) -> None:
+        status = self.create_status()
+        text = self.format_status(status)
+
+        if self.text_file is not None:
+            self._write_atomically(self.text_file, text)
+
+        if self.json_file is not None:
+            self._write_atomically(self.json_file, json.dumps(status, default=str, indent=2))
+
+        if self.stream is not None:
+            self.stream.write(text + '\r')
+            self.stream.flush()
+
+    def _run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                self.report()
+            except Exception:
+                self._log_failure(traceback.format_exc())
+
+    def _log_failure(self, error: str) -> None:
+        message = 'Status report failed: {}'.format(error)
+
+        if self.logger is not None:
+            self.logger.write(message)
+        else:
+            sys.stderr.write(message)
+            sys.stderr.flush()
+
+    @staticmethod
+    def _write_atomically(file_name: str, content: str) -> None:
+        directory = os.path.dirname(os.path.abspath(file_name))
+        descriptor, temporary_file_name = tempfile.mkstemp(dir=directory, prefix='.status-')
+
+        try:
+            with os.fdopen(descriptor, 'w') as temporary_file:
+                temporary_file.write(content)
+
+            os.replace(temporary_file_name, file_name)
+        except BaseException:
+            os.unlink(temporary_file_name)
+            raise
@@ -0,0 +1,69 @@
+import copy
+from core.configuration import Configuration
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from datahandlers.data_handler_factory import DataHandlerFactory
+from datahandlers.shared_bar_data import SharedBarData
+from core.deque_event_queue import DequeEventQueue
+
+
+class SweepContext(object):
+    """
+    SweepContext holds what is the same for all backtests of a parameter
+    sweep - the bars of the symbols, loaded once into shared memory (see
+    SharedBarData), and the already loaded model of the strategy. Backtests
+    take their configuration from create_configuration, so their data
+    handlers attach to the shared bars instead of reading the CSV files.
+
+    Worker processes get the context by activate used as the initializer of
+    the pool (it is inherited through fork or pickled once per process,
+    pickling transfers only the names of the shared memory segments). The
+    process which created the context has to close it when the sweep is
+    finished.
+    """
+
+    active = None
+
+    def __init__(self, configuration: Configuration, shared_bar_data: SharedBarData, model=None) -> None:
+        self.configuration = configuration
+        self.shared_bar_data = shared_bar_data
+        self.model = model
+
+    @staticmethod
+    def create(configuration: Configuration, symbol_list: list, model=None) -> 'SweepContext':
+        """
+        Loads the bars of symbol_list by HistoricCSVDataHandler created from configuration.
+        """
+        if configuration.data_handler_name != HistoricCSVDataHandler:
+            raise Exception('Sweep context can share only bars of {}'.format(HistoricCSVDataHandler.__name__))
+
+        events_per_symbol = dict((symbol, DequeEventQueue()) for symbol in symbol_list)
+        data_handler = DataHandlerFactory.create_from_settings(configuration, events_per_symbol, symbol_list, None)
+
+        return SweepContext(configuration, data_handler.create_shared_bar_data(), model)
+
+    @staticmethod
+    def activate(context: 'SweepContext') -> None:
+        SweepContext.active = context
+
+    @staticmethod
+    def get_active() -> 'SweepContext':
+        return SweepContext.active
+
+    def create_configuration(self) -> Configuration:
+        """
+        Returns a copy of the configuration which makes the data handler use the shared bars.
+        """
+        configuration = copy.copy(self.configuration)
+        configuration.options = dict(self.configuration.options)
+        configuration.set_option(Configuration.OPTION_SHARED_BAR_DATA, self.shared_bar_data)
+
+        return configuration
+
+    def get_model(self):
+        return self.model
+
+    def close(self) -> None:
+        if SweepContext.active is self:
+            SweepContext.active = None
+
+        self.shared_bar_data.unlink()
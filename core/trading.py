@@ -8,9 +8,11 @@ from executionhandlers.execution_handler_factory import ExecutionHandlerFactory
 from oanda.symbol_name_converter import SymbolNameConverter
 from typing import Type
 from core.portfolio import Portfolio
+from core.online_metrics import OnlineMetrics
 from strategies.strategy import Strategy
 import os
 from core.worker import Worker
+from core.status_reporter import StatusReporter
 import time
 
 try:
@@ -24,7 +26,12 @@ class Trading(Worker):
                  data_handler_factory: DataHandlerFactory, execution_handler_factory: ExecutionHandlerFactory,
                  portfolio_class: Type[Portfolio], strategy_class: Type[Strategy],
                  position_size_handler: PositionSizeHandler, logger: Logger, enabled_log_types: list,
-                 strategy_params_dict: dict, equity_filename: str, trades_filename: str) -> None:
+                 strategy_params_dict: dict, equity_filename: str, trades_filename: str,
+                 status_interval: float = StatusReporter.DEFAULT_INTERVAL) -> None:
+        """
+        The status (bars of the symbols, counters and online metrics) is written into output_summary.txt
+        and output_summary.json every status_interval seconds (see StatusReporter).
+        """
 
         self.output_directory = output_directory
         self.symbol_list = SymbolNameConverter().convert_symbol_names_to_oanda_symbol_names(symbol_list)
@@ -51,12 +58,15 @@ class Trading(Worker):
         self.fills = 0
 
         self.stats = None
-
-        summary_file = os.path.join(self.output_directory, 'output_summary.txt')
-        self.output_summary_file = open(summary_file, 'w')
+        self.iteration = 0
 
         self._generate_trading_instances()
 
+        self.status_reporter = StatusReporter(
+            self._create_status, self._format_status, os.path.join(self.output_directory, 'output_summary.txt'),
+            os.path.join(self.output_directory, 'output_summary.json'), None, status_interval, self.logger
+        )
+
     def _generate_trading_instances(self):
 
         self.data_handler = self.data_handler_factory.create_from_settings(self.configuration, self.events_per_symbol,
@@ -74,6 +84,16 @@ class Trading(Worker):
                                                                                      self.events_per_symbol,
                                                                                      self.logger)
 
+        self.event_dispatcher = self._create_event_dispatcher()
+
+    async def _run_symbols(self, symbol_list: list):
+        self.status_reporter.start()
+
+        try:
+            await super()._run_symbols(symbol_list)
+        finally:
+            self.status_reporter.stop()
+
     def _run_symbol(self, symbol: str):
         self.write_progress(0)
 
@@ -99,51 +119,50 @@ class Trading(Worker):
                 except queue.Empty:
                     break
                 else:
-                    if event is not None:
-                        if event.type == 'CLOSE_PENDING_ORDERS':
-                            self.execution_handler.clear_limit_or_stop_orders(event)
-                        elif event.type == 'MARKET':
-                            self.strategy.calculate_signals(event)
-                            self.execution_handler.update_stop_and_limit_orders(event)
-                            self.portfolio.update_timeindex()
-                        elif event.type == 'SIGNAL':
-                            self.signals += 1
-                            self.portfolio.update_signal(event)
-                        elif event.type == 'ORDER':
-                            self.orders += 1
-                            self.execution_handler.execute_order(event)
-                        elif event.type == 'FILL':
-                            self.fills += 1
-                            self.portfolio.update_fill(event)
-
-                    self.log_event(i, event)
+                    self._handle_event(i, event)
 
             time.sleep(self.heartbeat)
 
         self.log_message(i, 'Stopping processing pair {}'.format(symbol))
 
     def write_progress(self, iteration: int):
-        number_of_bars_for_symbols = []
+        # Only the counter is updated here, the status is written by the status reporter
+        self.iteration = iteration
+
+    def _create_status(self) -> dict:
+        symbols = {}
 
         for symbol in self.symbol_list:
             number_of_bars = self.data_handler.get_number_of_bars(symbol)
             last_bar = self.data_handler.get_latest_bar(symbol) if number_of_bars > 0 else None
 
-            number_of_bars_for_symbols.append(
-                '  --> {}: {} bars, last datetime open: {}\n'.format(symbol, number_of_bars, last_bar[
-                    'datetime'] if last_bar is not None else ''))
+            symbols[symbol] = dict(
+                bars=number_of_bars,
+                last_datetime_open=last_bar['datetime'] if last_bar is not None else None
+            )
+
+        return dict(
+            iteration=self.iteration,
+            symbols=symbols,
+            signals=self.signals,
+            orders=self.orders,
+            fills=self.fills,
+            metrics=self.portfolio.get_online_metrics().get_as_dict()
+        )
+
+    def _format_status(self, status: dict) -> str:
+        number_of_bars_for_symbols = []
 
-        number_of_dots = iteration % 10
-        dots = ['.'] * number_of_dots
+        for symbol, symbol_status in status['symbols'].items():
+            last_datetime_open = symbol_status['last_datetime_open']
 
-        self.output_summary_file.seek(0)
-        self.output_summary_file.truncate()
+            number_of_bars_for_symbols.append('  --> {}: {} bars, last datetime open: {}\n'.format(
+                symbol, symbol_status['bars'], last_datetime_open if last_datetime_open is not None else ''))
 
-        self.output_summary_file.seek(0)
-        self.output_summary_file.write('Trading{}\n'.format(str.join('', dots)), )
-        self.output_summary_file.write('{}'.format(str.join('', number_of_bars_for_symbols)))
+        dots = ['.'] * (status['iteration'] % 10)
 
-        self.output_summary_file.flush()
+        return 'Trading{}\n{}{}\n'.format(str.join('', dots), str.join('', number_of_bars_for_symbols),
+                                           OnlineMetrics.format_metrics(status['metrics']))
 
     def get_signals(self) -> int:
         return self.signals
@@ -0,0 +1,306 @@
+import numpy as np
+from core.backtest import Backtest
+from core.ledger import Ledger
+from core.portfolio import Portfolio
+from core.position import Position
+from events.fill_event import FillEvent
+from strategies.vectorized_signals import VectorizedSignals
+
+
+class VectorizedBacktest(Backtest):
+    """
+    VectorizedBacktest is a second engine beside Backtest for strategies which
+    calculate their signals for the whole history with arrays (see
+    Strategy.calculate_signals_vectorized). There is no event loop - positions
+    and holdings of every symbol are computed with NumPy and merged into the
+    portfolio (see Portfolio.merge_states), so the equity curve and Stats are
+    generated as in Backtest. Trades are not fully vectorized - an entry
+    depends on the close of the previous trade, so they are found by a Python
+    loop with one iteration per trade (the bars of a trade are checked at
+    once), and the trades of the portfolio are created one by one. Strategies
+    which trade on most bars gain little over Backtest.
+
+    Fills are at the close bid of the bar, an entry is possible only without
+    an open position, stop loss and take profit orders are checked from the
+    bar after the entry, the first one hit closes the trade and an exit signal
+    closes an open position as a new trade. Entries while a trade is open (up
+    to the bar which closes it) are ignored. Holdings are taken on every bar
+    before its fills. Symbols are independent and the position size must not
+    depend on the holdings. Bars have to be loaded by HistoricCSVDataHandler
+    without streaming.
+
+    With stop_prices STOP_PRICES_HIGH_LOW (the default) the stop loss and take
+    profit are checked on the low and high bid (long positions) or ask (short
+    positions), and they are filled at their price (or at the open when the
+    bar opens beyond it). When both are touched in one bar the stop loss is
+    taken. With STOP_PRICES_CLOSE they are checked on the close bid (long
+    positions) or close ask (short positions) and filled at the close bid, the
+    results then match Backtest with SimulatedExecutionHandler.
+    """
+
+    STOP_PRICES_CLOSE = 'close'
+    STOP_PRICES_HIGH_LOW = 'high_low'
+
+    def __init__(self, *args, stop_prices: str = STOP_PRICES_HIGH_LOW, **kwargs) -> None:
+        """
+        Takes the arguments of Backtest and stop_prices, STOP_PRICES_CLOSE or STOP_PRICES_HIGH_LOW.
+        pruning_rules, snapshot_frequency and pool_market_events of Backtest are not supported,
+        there are no bars released one by one and holdings are taken on every bar.
+        """
+        if stop_prices not in [self.STOP_PRICES_CLOSE, self.STOP_PRICES_HIGH_LOW]:
+            raise Exception('Unknown stop prices: {}'.format(stop_prices))
+
+        if kwargs.get('pruning_rules'):
+            raise Exception('Pruning rules are not supported by VectorizedBacktest')
+
+        if kwargs.get('snapshot_frequency', Portfolio.SNAPSHOT_EVERY_BAR) != Portfolio.SNAPSHOT_EVERY_BAR:
+            raise Exception('Snapshot frequency is not supported by VectorizedBacktest')
+
+        if kwargs.get('pool_market_events'):
+            raise Exception('Pooled market events are not supported by VectorizedBacktest')
+
+        self.stop_prices = stop_prices
+
+        # There is no event loop, so there is no progress to report
+        super().__init__(*args, status_stream=None, **kwargs)
+
+    def _generate_trading_instances(self):
+        self.data_handler = self.data_handler_factory.create_from_settings(self.configuration, self.events_per_symbol,
+                                                                           self.symbol_list, self.logger)
+
+        self.portfolio = self.portfolio_class(self.data_handler, self.events_per_symbol, self.start_date,
+                                              self.initial_capital, self.output_directory, self.equity_filename,
+                                              self.trades_filename, self.position_size_handler)
+
+        self.strategy = self.strategy_class(self.data_handler, self.portfolio, self.events_per_symbol,
+                                            **self.strategy_params_dict)
+
+    def run(self):
+        self.portfolio.merge_states(dict((symbol, self._run_vectorized(symbol)) for symbol in self.symbol_list))
+
+        self._save_equity_and_generate_stats()
+
+    def _run_vectorized(self, symbol: str) -> dict:
+        bar_store = self.data_handler.get_bar_store(symbol)
+
+        # Padding before the first bar of a symbol which starts later is not released (see BarStore)
+        timestamps = bar_store.timestamps[bar_store.first:bar_store.length]
+        bars = dict((field, values[bar_store.first:bar_store.length]) for field, values in bar_store.columns.items())
+        close_bid = bars['close_bid']
+        number_of_bars = len(timestamps)
+
+        vectorized_signals = self.strategy.calculate_signals_vectorized(symbol, bars)
+        signals = vectorized_signals.signals
+        quantity = self.position_size_handler.get_position_size(self.portfolio.current_holdings,
+                                                                self.portfolio.current_positions)
+
+        entries, stop_bars, stop_prices = self._find_trades(bars, signals, vectorized_signals.stop_loss,
+                                                            vectorized_signals.take_profit)
+        exit_signals = np.flatnonzero(signals == VectorizedSignals.EXIT)
+        directions = signals[entries].astype(np.float64)
+
+        # Every trade is open from its entry at most until the first exit signal after it
+        next_exit = np.searchsorted(exit_signals, entries, side='right')
+        has_exit_signal = next_exit < len(exit_signals)
+        window_ends = np.append(exit_signals, number_of_bars - 1)[next_exit]
+
+        is_stopped = stop_bars >= 0
+
+        close_bars = np.where(is_stopped, stop_bars, np.where(has_exit_signal, window_ends, -1))
+        is_closed = close_bars >= 0
+        close_prices = np.where(is_stopped, stop_prices, close_bid[np.maximum(close_bars, 0)])
+
+        # An exit signal creates an order when the position was not closed on a previous bar
+        has_exit_order = has_exit_signal & (~is_stopped | (stop_bars == window_ends))
+
+        # Quantities and holdings are taken before the fills of the bar
+        changes = np.zeros(number_of_bars + 1)
+        np.add.at(changes, entries + 1, directions * quantity)
+        np.add.at(changes, close_bars[is_closed] + 1, -directions[is_closed] * quantity)
+        quantities = np.cumsum(changes)[:number_of_bars]
+
+        fill_bars = np.concatenate((entries, close_bars[is_closed]))
+        fill_costs = np.concatenate((directions * close_bid[entries] * quantity,
+                                     -directions[is_closed] * close_prices[is_closed] * quantity))
+        fill_order = np.argsort(fill_bars, kind='stable')
+        fill_bars = fill_bars[fill_order]
+        fill_costs = fill_costs[fill_order]
+
+        cash_after_fills = np.cumsum(np.concatenate(([self.initial_capital], -fill_costs)))
+        cash = cash_after_fills[np.searchsorted(fill_bars, np.arange(number_of_bars), side='left')]
+
+        market_values = np.where(quantities != 0, quantities * close_bid, 0.0)
+
+        positions_ledger = Ledger([symbol], number_of_bars + 1)
+        positions_ledger.append(self.start_date, [0.0])
+        positions_ledger.tz = bar_store.tz
+        positions_ledger.append_rows(timestamps, quantities[:, np.newaxis])
+
+        holdings_ledger = Ledger([symbol, 'cash', 'commission', 'total'], number_of_bars + 1)
+        holdings_ledger.append(self.start_date, [0.0, self.initial_capital, 0.0, self.initial_capital])
+        holdings_ledger.tz = bar_store.tz
+        holdings_ledger.append_rows(timestamps, np.column_stack((
+            market_values, cash, np.zeros(number_of_bars), cash + market_values
+        )))
+
+        trades, current_position = self._create_trades(bar_store, timestamps, symbol, entries, directions, quantity,
+                                                       stop_bars, stop_prices, window_ends, has_exit_order,
+                                                       close_bid)
+
+        orders = len(entries) + int(np.count_nonzero(is_stopped)) + int(np.count_nonzero(has_exit_order))
+        self.signals += int(np.count_nonzero(signals))
+        self.orders += orders
+        self.fills += orders
+
+        return dict(
+            positions_ledger=positions_ledger,
+            holdings_ledger=holdings_ledger,
+            current_positions={symbol: current_position},
+            current_holdings={
+                symbol: float(np.sum(fill_costs)), 'cash': cash_after_fills[-1], 'commission': 0.0,
+                'total': cash_after_fills[-1]
+            },
+            trades=trades
+        )
+
+    def _find_trades(self, bars: dict, signals: np.ndarray, stop_loss, take_profit) -> tuple:
+        """
+        Returns the entries which open a trade, the bars where their stop loss or take profit is hit
+        (-1 where none) and the prices these exits are filled at. An entry is taken only after the
+        previous trade was closed, so the trades are found one after another, the bars of every trade
+        are checked at once.
+        """
+        number_of_bars = len(signals)
+        candidates = np.flatnonzero((signals == VectorizedSignals.LONG) | (signals == VectorizedSignals.SHORT))
+        exit_signals = np.flatnonzero(signals == VectorizedSignals.EXIT)
+        no_prices = np.full(number_of_bars, np.nan)
+        stop_loss = no_prices if stop_loss is None else np.asarray(stop_loss, dtype=np.float64)
+        take_profit = no_prices if take_profit is None else np.asarray(take_profit, dtype=np.float64)
+
+        entries = []
+        stop_bars = []
+        stop_prices = []
+        candidate = 0
+
+        while candidate < len(candidates):
+            entry = int(candidates[candidate])
+            next_exit = np.searchsorted(exit_signals, entry, side='right')
+            window_end = int(exit_signals[next_exit]) if next_exit < len(exit_signals) else number_of_bars - 1
+
+            stop_bar, stop_price = self._find_stop(bars, signals[entry] > 0, stop_loss[entry], take_profit[entry],
+                                                   entry + 1, window_end + 1)
+            entries.append(entry)
+            stop_bars.append(stop_bar)
+            stop_prices.append(stop_price)
+
+            if stop_bar >= 0:
+                close_bar = stop_bar
+            elif next_exit < len(exit_signals):
+                close_bar = window_end
+            else:
+                break
+
+            # Entries up to the bar of the close are ignored, the position is still open when they are handled
+            candidate = np.searchsorted(candidates, close_bar, side='right')
+
+        return (np.array(entries, dtype=np.int64), np.array(stop_bars, dtype=np.int64),
+                np.array(stop_prices, dtype=np.float64))
+
+    def _find_stop(self, bars: dict, is_long: bool, stop_loss: float, take_profit: float, start: int,
+                   end: int) -> tuple:
+        """
+        Returns the first bar from start to end (exclusive) where the stop loss or take profit is hit and
+        the price of the fill, (-1, NaN) when none is hit. NaN prices are never hit.
+        """
+        side = 'bid' if is_long else 'ask'
+        direction = 1.0 if is_long else -1.0
+
+        if self.stop_prices == self.STOP_PRICES_HIGH_LOW:
+            adverse = bars[('low_' if is_long else 'high_') + side][start:end]
+            favourable = bars[('high_' if is_long else 'low_') + side][start:end]
+        else:
+            adverse = favourable = bars['close_' + side][start:end]
+
+        stop_loss_hit = direction * adverse <= direction * stop_loss
+        take_profit_hit = direction * favourable >= direction * take_profit
+        hits = np.flatnonzero(stop_loss_hit | take_profit_hit)
+
+        if len(hits) == 0:
+            return -1, np.nan
+
+        stop_bar = start + int(hits[0])
+
+        if self.stop_prices == self.STOP_PRICES_CLOSE:
+            return stop_bar, bars['close_bid'][stop_bar]
+
+        # The order is filled at the open when the bar gaps beyond its price
+        bar_open = bars['open_' + side][stop_bar]
+
+        if stop_loss_hit[hits[0]]:
+            return stop_bar, direction * min(direction * stop_loss, direction * bar_open)
+
+        return stop_bar, direction * max(direction * take_profit, direction * bar_open)
+
+    def _create_trades(self, bar_store, timestamps: np.ndarray, symbol: str, entries: np.ndarray,
+                       directions: np.ndarray, quantity: float, stop_bars: np.ndarray, stop_prices: np.ndarray,
+                       window_ends: np.ndarray, has_exit_order: np.ndarray, close_bid: np.ndarray) -> tuple:
+        """
+        Creates the trades in the format of Portfolio.trades, trade ids are assigned in the order of orders.
+        """
+        trades = {}
+        current_position = None
+        trade_id = 1000
+
+        for trade in range(len(entries)):
+            entry = int(entries[trade])
+            direction = directions[trade]
+            open_cost = direction * close_bid[entry] * quantity
+
+            entry_trade_id = trade_id
+            trade_id += 1
+            trades[entry_trade_id] = self._create_trade(
+                [FillEvent(None, symbol, 'FOREX', quantity, 'BUY' if direction > 0 else 'SELL', None, None,
+                           entry_trade_id)],
+                bar_store.timestamp_to_datetime(int(timestamps[entry])), None, open_cost, .0
+            )
+
+            if stop_bars[trade] >= 0:
+                close_cost = -direction * stop_prices[trade] * quantity
+
+                trades[entry_trade_id]['fills'].append(FillEvent(None, symbol, 'FOREX', quantity, 'EXIT', None, None,
+                                                                 entry_trade_id))
+                trades[entry_trade_id]['commissions'].append(0)
+                trades[entry_trade_id]['closed'] = bar_store.timestamp_to_datetime(
+                    int(timestamps[stop_bars[trade]])
+                )
+                trades[entry_trade_id]['closeCost'] = close_cost
+                trades[entry_trade_id]['profit'] = close_cost + open_cost
+
+            if has_exit_order[trade]:
+                window_end = int(window_ends[trade])
+
+                # The position is already closed when the stop was hit on the bar of the exit signal
+                close_cost = .0 if stop_bars[trade] == window_end else -direction * close_bid[window_end] * quantity
+
+                trades[trade_id] = self._create_trade(
+                    [FillEvent(None, symbol, 'FOREX', quantity, 'EXIT', None, None, trade_id)], None,
+                    bar_store.timestamp_to_datetime(int(timestamps[window_end])), .0, close_cost
+                )
+                trade_id += 1
+            elif stop_bars[trade] < 0:
+                current_position = Position(symbol, entry_trade_id, direction * quantity)
+
+        return trades, current_position
+
+    @staticmethod
+    def _create_trade(fills: list, opened, closed, open_cost: float, close_cost: float) -> dict:
+        return {
+            'fills': fills,
+            'opened': opened,
+            'closed': closed,
+            'openCost': open_cost,
+            'closeCost': close_cost,
+            'commissions': [0] * len(fills),
+            'profit': close_cost + open_cost if closed is not None else None,
+            'commission': 0
+        }
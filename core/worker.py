@@ -4,6 +4,8 @@ import sys
 from core.portfolio import Portfolio
 from loggers.logger import Logger
 from concurrent.futures import ThreadPoolExecutor
+from core.event_dispatcher import EventDispatcher
+from events.event_kind import EventKind
 
 
 class Worker(object):
@@ -48,31 +50,74 @@ class Worker(object):
     def _run_symbol(self, symbol: str):
         raise NotImplementedError("Should implement _run_symbol()")
 
-    async def _run(self):
-        if self.get_logger() is not None:
-            self.get_logger().open()
-
+    async def _run_symbols(self, symbol_list: list):
+        """
+        Runs every symbol in its own thread. Workers which need a deterministic
+        order of events across symbols override this method.
+        """
         loop = asyncio.get_event_loop()
 
         futures = []
 
-        symbol_list = self.get_symbol_list()
-
         executor = ThreadPoolExecutor(max_workers=len(symbol_list))
 
         for symbol in symbol_list:
             futures.append(loop.run_in_executor(executor, self._run_symbol, symbol))
 
-        done, futures = await asyncio.wait(futures, loop=loop, return_when=asyncio.ALL_COMPLETED)
+        done, futures = await asyncio.wait(futures, return_when=asyncio.ALL_COMPLETED)
         for f in done:
             await f
 
+    async def _run(self):
+        if self.get_logger() is not None:
+            self.get_logger().open()
+
+        await self._run_symbols(self.get_symbol_list())
+
         print('')
         sys.stdout.flush()
 
         if self.get_logger() is not None:
             self.get_logger().close()
 
+    def _create_event_dispatcher(self) -> EventDispatcher:
+        """
+        Creates the table of handlers of the core events. Custom events can be
+        handled by registering their kind into the returned dispatcher.
+        """
+        event_dispatcher = EventDispatcher()
+
+        event_dispatcher.register(EventKind.CLOSE_PENDING_ORDERS, self.execution_handler.clear_limit_or_stop_orders)
+        event_dispatcher.register(EventKind.MARKET, self._handle_market_event)
+        event_dispatcher.register(EventKind.SIGNAL, self._handle_signal_event)
+        event_dispatcher.register(EventKind.ORDER, self._handle_order_event)
+        event_dispatcher.register(EventKind.FILL, self._handle_fill_event)
+
+        return event_dispatcher
+
+    def _handle_event(self, iteration, event):
+        if event is not None:
+            self.event_dispatcher.dispatch(event)
+
+        self.log_event(iteration, event)
+
+    def _handle_market_event(self, event):
+        self.strategy.calculate_signals(event)
+        self.execution_handler.update_stop_and_limit_orders(event)
+        self.get_portfolio().update_timeindex()
+
+    def _handle_signal_event(self, event):
+        self.signals += 1
+        self.get_portfolio().update_signal(event)
+
+    def _handle_order_event(self, event):
+        self.orders += 1
+        self.execution_handler.execute_order(event)
+
+    def _handle_fill_event(self, event):
+        self.fills += 1
+        self.get_portfolio().update_fill(event)
+
     def log_message(self, iteration, message):
         if self.get_logger() is not None and message != '':
             self.get_logger().write('#%d - %s' % (iteration, message))
@@ -0,0 +1,72 @@
+import numpy as np
+from typing import List
+
+
+class BarRingBuffer(object):
+    """
+    BarRingBuffer keeps the last capacity bars of one symbol in fixed-size
+    arrays (one per bar field, datetimes in an object array). Every bar is
+    written twice - at position p and p + capacity - so the last n bars are
+    always one contiguous slice and look-back windows are returned as views
+    without copying or reordering. The memory use does not grow with the
+    number of appended bars.
+    """
+
+    def __init__(self, capacity: int, fields: List[str]) -> None:
+        if capacity < 1:
+            raise Exception('Capacity of the ring buffer needs to be at least 1, {} given'.format(capacity))
+
+        self.capacity = capacity
+        self.fields = fields
+
+        self.datetimes = np.empty(2 * capacity, dtype=object)
+        self.columns = dict((field, np.zeros(2 * capacity, dtype=np.float64)) for field in fields)
+
+        # Total number of appended bars, the last one is stored at (number_of_bars - 1) % capacity
+        self.number_of_bars = 0
+
+    def append(self, bar: dict) -> None:
+        position = self.number_of_bars % self.capacity
+
+        self.datetimes[position] = self.datetimes[position + self.capacity] = bar['datetime']
+
+        for field, values in self.columns.items():
+            values[position] = values[position + self.capacity] = bar[field]
+
+        self.number_of_bars += 1
+
+    def get_size(self) -> int:
+        return min(self.number_of_bars, self.capacity)
+
+    def get_latest_values(self, val_type: str, n: int = 1) -> np.ndarray:
+        """
+        Returns the last n values of the field (at most capacity) as a read-only view into the buffer.
+        The view keeps its values for capacity - n more appended bars, the next append overwrites its
+        oldest value. Copy the values to keep them longer.
+        """
+        start, end = self._get_window(n)
+
+        values = self.columns[val_type][start:end]
+        values.flags.writeable = False
+
+        return values
+
+    def get_latest_bars(self, n: int = 1) -> list:
+        start, end = self._get_window(n)
+
+        return [self._get_bar(position) for position in range(start, end)]
+
+    def get_retained_memory_bytes(self) -> int:
+        return self.datetimes.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    def _get_window(self, n: int) -> tuple:
+        end = (self.number_of_bars - 1) % self.capacity + self.capacity + 1
+        start = end - min(n, self.get_size())
+
+        return start, end
+
+    def _get_bar(self, position: int) -> dict:
+        bar = dict((field, float(values[position])) for field, values in self.columns.items())
+        bar['datetime'] = self.datetimes[position]
+
+        return bar
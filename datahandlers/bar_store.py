@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
+class BarStore(object):
+    """
+    BarStore keeps the bars of one symbol in a columnar layout - one float64
+    array per bar field and one int64 array with timestamps in nanoseconds
+    since epoch (UTC). The cursor marks how many bars were already released
+    to the rest of the system, so the "latest" bars are always the slice
+    right before the cursor.
+
+    Bars before first are padding of a store aligned to a timeline which
+    starts earlier (see reindex), they are never released.
+    """
+
+    FIELDS = ['open_bid', 'open_ask', 'high_bid', 'high_ask', 'low_bid', 'low_ask', 'close_bid', 'close_ask',
+              'volume']
+
+    def __init__(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray], tz: Optional[str] = None,
+                 first: int = 0) -> None:
+        self.timestamps = timestamps
+        self.columns = columns
+        self.tz = tz
+        self.length = len(timestamps)
+        self.first = min(first, self.length)
+        self.cursor = self.first
+
+    @staticmethod
+    def from_dataframe(data_frame: pd.DataFrame, fields: List[str] = None) -> 'BarStore':
+        """
+        Creates the store from a DataFrame indexed by datetime with one column per bar field.
+        """
+        if fields is None:
+            fields = BarStore.FIELDS
+
+        index = data_frame.index
+        tz = None
+
+        if index.tz is not None:
+            tz = str(index.tz)
+            index = index.tz_convert(None)
+
+        timestamps = np.asarray(index, dtype='datetime64[ns]').view(np.int64)
+
+        columns = {}
+        for field in fields:
+            columns[field] = np.ascontiguousarray(data_frame[field].values, dtype=np.float64)
+            columns[field].setflags(write=False)
+
+        return BarStore(timestamps, columns, tz)
+
+    def reindex(self, timestamps: np.ndarray) -> 'BarStore':
+        """
+        Returns the store aligned to the given sorted timestamps. Missing bars are padded
+        forward with the last known bar (NaN before the first one). When the timestamps are
+        the same as the ones of this store, the columns are shared and not copied. The cursor of
+        the returned store starts at the first bar of this store.
+        """
+        if np.array_equal(timestamps, self.timestamps):
+            return BarStore(self.timestamps, self.columns, self.tz)
+
+        positions = np.searchsorted(self.timestamps, timestamps, side='right') - 1
+        missing = positions < 0
+        positions[missing] = 0
+
+        columns = {}
+        for field, values in self.columns.items():
+            columns[field] = values[positions]
+            columns[field][missing] = np.nan
+            columns[field].setflags(write=False)
+
+        return BarStore(timestamps, columns, self.tz, int(np.count_nonzero(missing)))
+
+    def head(self, length: int) -> 'BarStore':
+        """
+        Returns the store with the first length bars only, the columns are views (no copy is made).
+        """
+        return BarStore(self.timestamps[:length], dict((field, values[:length]) for field, values in
+                                                       self.columns.items()), self.tz, self.first)
+
+    def has_next(self) -> bool:
+        return self.cursor < self.length
+
+    def advance(self) -> bool:
+        """
+        Releases the next bar. Returns False when there is no bar left.
+        """
+        if self.cursor >= self.length:
+            return False
+
+        self.cursor += 1
+
+        return True
+
+    def get_next_timestamp(self) -> Optional[int]:
+        """
+        Returns the timestamp of the next bar to be released, None when there is no bar left.
+        """
+        if not self.has_next():
+            return None
+
+        return int(self.timestamps[self.cursor])
+
+    def get_number_of_bars(self) -> int:
+        """
+        Returns the number of bars which can be released (the padding is not counted).
+        """
+        return self.length - self.first
+
+    def get_position_in_percentage(self) -> float:
+        if self.get_number_of_bars() == 0:
+            return 100.0
+
+        return 100.0 * (self.cursor - self.first) / self.get_number_of_bars()
+
+    def has_some_bars(self) -> bool:
+        return self.cursor > self.first
+
+    def get_latest_timestamp(self) -> int:
+        return int(self.timestamps[self.cursor - 1])
+
+    def get_latest_datetime(self) -> pd.Timestamp:
+        return self.timestamp_to_datetime(self.get_latest_timestamp())
+
+    def get_latest_value(self, val_type: str) -> float:
+        return float(self.columns[val_type][self.cursor - 1])
+
+    def get_latest_values(self, val_type: str, n: int = 1) -> np.ndarray:
+        """
+        Returns the last n values of the field as a read-only view into the store (no copy is made).
+        """
+        start = self.cursor - n
+        if start < self.first:
+            start = self.first
+
+        return self.columns[val_type][start:self.cursor]
+
+    def get_bar(self, position: int) -> dict:
+        bar = dict((field, float(values[position])) for field, values in self.columns.items())
+        bar['datetime'] = self.timestamp_to_datetime(int(self.timestamps[position]))
+
+        return bar
+
+    def get_latest_bars(self, n: int = 1) -> list:
+        start = self.cursor - n
+        if start < self.first:
+            start = self.first
+
+        return [self.get_bar(position) for position in range(start, self.cursor)]
+
+    def timestamp_to_datetime(self, timestamp: int) -> pd.Timestamp:
+        return pd.Timestamp(timestamp, tz=self.tz)
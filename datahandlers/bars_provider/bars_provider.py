@@ -1,6 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from datetime import datetime
-from dateutil import parser
+from oanda.timestamp_parser import TimestampParser
 
 try:
     import Queue as queue
@@ -12,6 +12,8 @@ class BarsProvider(object):
 
     __metaclass__ = ABCMeta
 
+    TIMESTAMP_PARSER = TimestampParser()
+
     @abstractmethod
     def get_queue(self, symbol: str) -> queue.Queue:
         raise NotImplementedError("Should implement get_queue()")
@@ -38,7 +40,7 @@ class BarsProvider(object):
 
     @staticmethod
     def get_price_datetime(datetime_as_string: str) -> datetime:
-        price_datetime = parser.parse(datetime_as_string)
+        price_datetime = BarsProvider.TIMESTAMP_PARSER.parse_to_datetime(datetime_as_string)
         price_datetime = price_datetime.replace(microsecond=0)
 
         return price_datetime
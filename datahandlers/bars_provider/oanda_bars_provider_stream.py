@@ -1,10 +1,11 @@
 from oanda.stream import Stream as OandaPriceStream
 from timeframe.timeframe import TimeFrame
-import pandas as pd
 from typing import List
+from datetime import timezone
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from datahandlers.bars_provider.bars_provider import BarsProvider
+from datahandlers.bars_provider.ohlc_accumulator import OhlcAccumulator
 
 try:
     import Queue as queue
@@ -21,7 +22,7 @@ class OandaBarsProviderStream(BarsProvider):
 
         self.queues = dict((symbol, queue.Queue()) for (symbol) in symbols)
 
-        self.opened_bars = dict((symbol, pd.DataFrame()) for (symbol) in symbols)
+        self.opened_bars = dict((symbol, OhlcAccumulator()) for (symbol) in symbols)
         self.opened_bars_finishes_at = dict((symbol, None) for (symbol) in symbols)
         self.opened_bars_starts_at = dict((symbol, None) for (symbol) in symbols)
 
@@ -60,33 +61,25 @@ class OandaBarsProviderStream(BarsProvider):
         for price in stream.get_price():
             symbol = price['instrument']
 
-            price_datetime = self.get_price_datetime(price['datetime'])
-            bar_borders = self.time_frame.get_time_frame_border(price_datetime)
+            price_timestamp = self.TIMESTAMP_PARSER.parse_to_epoch(price['datetime'])
 
-            if self.opened_bars_finishes_at[symbol] is None:
-                self.opened_bars_finishes_at[symbol] = bar_borders[1]
-                self.opened_bars_starts_at[symbol] = bar_borders[0]
+            # The first tick after the end of the opened bar closes it and starts the next one
+            opened_bar_finishes_at = self.opened_bars_finishes_at[symbol]
 
-            if self.opened_bars_finishes_at[symbol] >= price_datetime or 'datetime' not in self.opened_bars[symbol]:
-                new_price_data = pd.DataFrame(price, index=[price['datetime']])
-                self.opened_bars[symbol] = self.opened_bars[symbol].append(new_price_data)
-            else:
-                price_bid_open = float(self.opened_bars[symbol]['bid'][0])
-                price_bid_close = float(self.opened_bars[symbol]['bid'][-1])
-                price_bid_high = float(self.opened_bars[symbol]['bid'].max())
-                price_bid_low = float(self.opened_bars[symbol]['bid'].min())
-
-                price_ask_open = float(self.opened_bars[symbol]['ask'][0])
-                price_ask_close = float(self.opened_bars[symbol]['ask'][-1])
-                price_ask_high = float(self.opened_bars[symbol]['ask'].max())
-                price_ask_low = float(self.opened_bars[symbol]['ask'].min())
-
-                data = self.create_bar_data(self.opened_bars_starts_at[symbol], price_ask_close, price_ask_high,
-                                            price_ask_low,
-                                            price_ask_open, price_bid_close, price_bid_high, price_bid_low,
-                                            price_bid_open)
+            if opened_bar_finishes_at is not None and price_timestamp > opened_bar_finishes_at:
+                tzinfo = timezone.utc if self.TIMESTAMP_PARSER.has_timezone(price['datetime']) else None
+                opened_bar_starts_at = TimeFrame.epoch_to_datetime(self.opened_bars_starts_at[symbol], tzinfo)
 
+                self.queues[symbol].put_nowait(self.opened_bars[symbol].create_bar_data(opened_bar_starts_at))
+
+                self.opened_bars[symbol].reset()
                 self.opened_bars_finishes_at[symbol] = None
                 self.opened_bars_starts_at[symbol] = None
 
-                self.queues[symbol].put_nowait(data)
+            if self.opened_bars_finishes_at[symbol] is None:
+                bar_borders = self.time_frame.get_epoch_border(price_timestamp)
+
+                self.opened_bars_starts_at[symbol] = bar_borders[0]
+                self.opened_bars_finishes_at[symbol] = bar_borders[1]
+
+            self.opened_bars[symbol].add_tick(float(price['bid']), float(price['ask']))
@@ -0,0 +1,51 @@
+from datahandlers.bars_provider.bars_provider import BarsProvider
+
+
+class OhlcAccumulator(object):
+    """
+    OhlcAccumulator builds one bar from ticks. Every tick updates open, high,
+    low and last price of bid and ask and the tick count in constant time, so
+    nothing is kept per tick.
+    """
+
+    def __init__(self) -> None:
+        self.number_of_ticks = 0
+
+        self.bid_open = self.bid_high = self.bid_low = self.bid_close = None
+        self.ask_open = self.ask_high = self.ask_low = self.ask_close = None
+
+    def reset(self) -> None:
+        self.number_of_ticks = 0
+
+    def has_ticks(self) -> bool:
+        return self.number_of_ticks > 0
+
+    def add_tick(self, bid: float, ask: float) -> None:
+        if self.number_of_ticks == 0:
+            self.bid_open = self.bid_high = self.bid_low = bid
+            self.ask_open = self.ask_high = self.ask_low = ask
+        else:
+            if bid > self.bid_high:
+                self.bid_high = bid
+            elif bid < self.bid_low:
+                self.bid_low = bid
+
+            if ask > self.ask_high:
+                self.ask_high = ask
+            elif ask < self.ask_low:
+                self.ask_low = ask
+
+        self.bid_close = bid
+        self.ask_close = ask
+        self.number_of_ticks += 1
+
+    def create_bar_data(self, opened_bar_starts_at) -> dict:
+        """
+        Returns the accumulated bar in the format of BarsProvider.create_bar_data, the volume is the number of ticks.
+        """
+        bar_data = BarsProvider.create_bar_data(opened_bar_starts_at, self.ask_close, self.ask_high, self.ask_low,
+                                                self.ask_open, self.bid_close, self.bid_high, self.bid_low,
+                                                self.bid_open)
+        bar_data['volume'] = self.number_of_ticks
+
+        return bar_data
@@ -0,0 +1,224 @@
+import os
+import json
+import hashlib
+import tempfile
+import shutil
+import numpy as np
+import pandas as pd
+from datahandlers.bar_store import BarStore
+from typing import Callable
+from typing import Optional
+
+
+class CsvCache(object):
+    """
+    CsvCache keeps parsed historical CSV files as a set of .npy files (one
+    per bar column plus timestamps) and a small JSON manifest. The cache entry
+    is keyed on the absolute path of the source file and validated by its
+    size, modification time and SHA-256 hash. It is opened with memory
+    mapping, so repeated backtests skip the CSV parsing and processes reading
+    the same file share the pages through the OS cache.
+
+    Every entry is a directory with immutable versions and a pointer file
+    naming the current one. A new version is written completely before the
+    pointer is replaced, so concurrent readers always open one complete
+    version. When the source file was only touched, its new modification
+    time is kept in the pointer next to the version, the version itself is
+    not changed.
+    """
+
+    FORMAT_VERSION = 2
+    MANIFEST_FILE = 'manifest.json'
+    POINTER_FILE = 'current'
+    TIMESTAMPS_FILE = 'datetime.npy'
+    HASH_BLOCK_SIZE = 1024 * 1024
+    OPEN_ATTEMPTS = 3
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+
+    def load(self, csv_file: str, read_csv: Callable[[], pd.DataFrame]) -> BarStore:
+        """
+        Returns the bars of the CSV file from the cache. When there is no valid cache entry,
+        read_csv is called to parse the file and the result is stored into the cache.
+        """
+        entry_dir = self.get_entry_dir(csv_file)
+        source_info = self.get_source_info(csv_file)
+
+        # The version may be replaced and removed by another process between reading the pointer and opening it
+        for attempt in range(self.OPEN_ATTEMPTS):
+            version_dir, touched_mtime_ns = self._read_pointer_and_mtime(entry_dir)
+
+            if version_dir is None:
+                break
+
+            try:
+                manifest = self._read_manifest(version_dir)
+
+                if manifest is None or not self._is_manifest_valid(manifest, csv_file, source_info, touched_mtime_ns):
+                    break
+
+                bar_store = self._open_version(version_dir, manifest)
+            except (OSError, ValueError):
+                continue
+
+            if bar_store is not None:
+                if source_info['mtime_ns'] not in [manifest['source']['mtime_ns'], touched_mtime_ns]:
+                    self._refresh_pointer(entry_dir, version_dir, source_info['mtime_ns'])
+
+                return bar_store
+
+            break
+
+        bar_store = BarStore.from_dataframe(read_csv())
+        source_info['sha256'] = self.get_file_hash(csv_file)
+        self._write_entry(entry_dir, bar_store, source_info)
+
+        return bar_store
+
+    def get_entry_dir(self, csv_file: str) -> str:
+        """
+        Files with the same name in different directories have their own entries.
+        """
+        path_hash = hashlib.sha256(os.path.abspath(csv_file).encode('utf-8')).hexdigest()[:16]
+
+        return os.path.join(self.cache_dir, '{}-{}'.format(os.path.splitext(os.path.basename(csv_file))[0],
+                                                           path_hash))
+
+    @staticmethod
+    def get_source_info(csv_file: str) -> dict:
+        stat = os.stat(csv_file)
+
+        return dict(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+    def get_file_hash(self, csv_file: str) -> str:
+        file_hash = hashlib.sha256()
+
+        with open(csv_file, 'rb') as opened_file:
+            for block in iter(lambda: opened_file.read(self.HASH_BLOCK_SIZE), b''):
+                file_hash.update(block)
+
+        return file_hash.hexdigest()
+
+    def _is_manifest_valid(self, manifest: dict, csv_file: str, source_info: dict,
+                           touched_mtime_ns: Optional[int]) -> bool:
+        """
+        touched_mtime_ns is the modification time of the source with the same content kept in the pointer.
+        """
+        if manifest.get('version') != self.FORMAT_VERSION or manifest['source']['size'] != source_info['size']:
+            return False
+
+        if source_info['mtime_ns'] in [manifest['source']['mtime_ns'], touched_mtime_ns]:
+            return True
+
+        # The file was touched, the content decides whether the cache entry can be still used
+        return manifest['source']['sha256'] == self.get_file_hash(csv_file)
+
+    def _read_pointer(self, entry_dir: str) -> Optional[str]:
+        return self._read_pointer_and_mtime(entry_dir)[0]
+
+    def _read_pointer_and_mtime(self, entry_dir: str) -> tuple:
+        """
+        Returns the current version directory and the modification time of the touched source, None when
+        there is no version or the source was not touched.
+        """
+        try:
+            with open(os.path.join(entry_dir, self.POINTER_FILE), 'r') as opened_file:
+                pointer = opened_file.read().split()
+        except OSError:
+            return None, None
+
+        if not pointer:
+            return None, None
+
+        return os.path.join(entry_dir, pointer[0]), int(pointer[1]) if len(pointer) > 1 else None
+
+    def _refresh_pointer(self, entry_dir: str, version_dir: str, touched_mtime_ns: int) -> None:
+        """
+        Keeps the modification time of the touched source, so its content is not hashed again. A pointer
+        replaced by another process in the meantime may be overwritten, its version is then built again.
+        """
+        try:
+            self._write_pointer(entry_dir, version_dir, touched_mtime_ns)
+        except OSError:
+            pass
+
+    def _write_pointer(self, entry_dir: str, version_dir: str, touched_mtime_ns: Optional[int] = None) -> None:
+        pointer = os.path.basename(version_dir)
+
+        if touched_mtime_ns is not None:
+            pointer += ' {}'.format(touched_mtime_ns)
+
+        self._write_atomically(os.path.join(entry_dir, self.POINTER_FILE), pointer)
+
+    def _read_manifest(self, version_dir: str) -> Optional[dict]:
+        manifest_file = os.path.join(version_dir, self.MANIFEST_FILE)
+
+        if not os.path.isfile(manifest_file):
+            return None
+
+        try:
+            with open(manifest_file, 'r') as opened_file:
+                return json.load(opened_file)
+        except ValueError:
+            return None
+
+    def _open_version(self, version_dir: str, manifest: dict) -> Optional[BarStore]:
+        """
+        Returns None when the files do not match the manifest.
+        """
+        timestamps = np.load(os.path.join(version_dir, self.TIMESTAMPS_FILE), mmap_mode='r')
+
+        columns = dict(
+            (field, np.load(os.path.join(version_dir, '{}.npy'.format(field)), mmap_mode='r'))
+            for field in manifest['fields']
+        )
+
+        if any(len(values) != manifest['number_of_bars'] for values in [timestamps] + list(columns.values())):
+            return None
+
+        return BarStore(timestamps, columns, manifest['tz'])
+
+    def _write_entry(self, entry_dir: str, bar_store: BarStore, source_info: dict) -> None:
+        """
+        Writes a new version of the entry and then replaces the pointer, the previous version is
+        removed afterwards.
+        """
+        os.makedirs(entry_dir, exist_ok=True)
+        version_dir = tempfile.mkdtemp(dir=entry_dir, prefix='v-')
+
+        try:
+            np.save(os.path.join(version_dir, self.TIMESTAMPS_FILE), bar_store.timestamps)
+
+            for field, values in bar_store.columns.items():
+                np.save(os.path.join(version_dir, '{}.npy'.format(field)), values)
+
+            self._write_manifest(version_dir, dict(
+                version=self.FORMAT_VERSION,
+                source=source_info,
+                fields=list(bar_store.columns.keys()),
+                tz=bar_store.tz,
+                number_of_bars=bar_store.length
+            ))
+
+            previous_version_dir = self._read_pointer(entry_dir)
+            self._write_pointer(entry_dir, version_dir)
+        except OSError:
+            # The entry is not replaced, the parsed bars are used without caching them
+            shutil.rmtree(version_dir, ignore_errors=True)
+            return
+
+        if previous_version_dir is not None and previous_version_dir != version_dir:
+            shutil.rmtree(previous_version_dir, ignore_errors=True)
+
+    def _write_manifest(self, version_dir: str, manifest: dict) -> None:
+        self._write_atomically(os.path.join(version_dir, self.MANIFEST_FILE), json.dumps(manifest))
+
+    @staticmethod
+    def _write_atomically(file_name: str, content: str) -> None:
+        temporary_file = '{}.tmp{}'.format(file_name, os.getpid())
+
+        with open(temporary_file, 'w') as opened_file:
+            opened_file.write(content)
+
+        os.replace(temporary_file, file_name)
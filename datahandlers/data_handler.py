@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from timeframe.timeframe import TimeFrame
 from typing import Optional
 
 
@@ -51,6 +52,12 @@ class DataHandler(object):
         """
         raise NotImplementedError("Should implement get_latest_bar_datetime()")
 
+    def get_latest_bar_timestamp(self, symbol) -> int:
+        """
+        Returns the timestamp (nanoseconds since epoch, UTC) of the last bar.
+        """
+        return TimeFrame.datetime_to_epoch(self.get_latest_bar_datetime(symbol))
+
     @abstractmethod
     def get_latest_bar_value(self, symbol, val_type):
         """
@@ -87,3 +94,10 @@ class DataHandler(object):
     @abstractmethod
     def get_number_of_bars(self, symbol):
         raise NotImplementedError("Should implement get_number_of_bars()")
+
+    @abstractmethod
+    def get_indicators(self):
+        """
+        Returns the IndicatorRegistry updated with every new bar.
+        """
+        raise NotImplementedError("Should implement get_indicators()")
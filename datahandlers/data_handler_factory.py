@@ -1,10 +1,14 @@
 from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from datahandlers.tick_replay_data_handler import TickReplayDataHandler
+from datahandlers.streaming_bar_store import StreamingBarStore
+from datahandlers.shared_bar_data import SharedBarData
 from datahandlers.oanda_data_handler import OandaDataHandler
 from oanda.stream_factory import StreamFactory
 from datahandlers.oanda_data_handler import DataHandler
 from core.configuration import Configuration
 from oanda.instrument_api_client import InstrumentApiClient
 from typing import Dict
+from typing import Optional
 from datahandlers.bars_provider.oanda_bars_provider_api import OandaBarsProviderApi
 from timeframe.timeframe import TimeFrame
 from loggers.logger import Logger
@@ -22,35 +26,79 @@ class DataHandlerFactory:
 
         if configuration.data_handler_name == HistoricCSVDataHandler:
             csv_dir = Configuration.OPTION_CSV_DIR
+            csv_cache_dir = None
+            chunk_size = None
+            max_lookback = StreamingBarStore.DEFAULT_MAX_LOOKBACK
+            shared_bar_data = None
+            history_fraction = 1.0
+
+            if configuration.has_option(Configuration.OPTION_CSV_CACHE_DIR):
+                csv_cache_dir = configuration.get_option(Configuration.OPTION_CSV_CACHE_DIR)
+
+            if configuration.has_option(Configuration.OPTION_CSV_CHUNK_SIZE):
+                chunk_size = int(configuration.get_option(Configuration.OPTION_CSV_CHUNK_SIZE))
+
+            if configuration.has_option(Configuration.OPTION_MAX_LOOKBACK):
+                max_lookback = int(configuration.get_option(Configuration.OPTION_MAX_LOOKBACK))
+
+            if configuration.has_option(Configuration.OPTION_SHARED_BAR_DATA):
+                shared_bar_data = configuration.get_option(Configuration.OPTION_SHARED_BAR_DATA)
+
+            if configuration.has_option(Configuration.OPTION_HISTORY_FRACTION):
+                history_fraction = float(configuration.get_option(Configuration.OPTION_HISTORY_FRACTION))
+
             return DataHandlerFactory.create_historic_csv_data_handler(events_per_symbol, symbol_list,
-                                                                       configuration.get_option(csv_dir))
+                                                                       configuration.get_option(csv_dir),
+                                                                       csv_cache_dir, chunk_size, max_lookback,
+                                                                       shared_bar_data, history_fraction)
+
+        if configuration.data_handler_name == TickReplayDataHandler:
+            return DataHandlerFactory.create_tick_replay_data_handler(
+                events_per_symbol, symbol_list, configuration.get_option(Configuration.OPTION_CSV_DIR),
+                configuration.get_option(Configuration.OPTION_TIMEFRAME)
+            )
 
         if configuration.data_handler_name == OandaDataHandler:
             bars_from_history = Configuration.OPTION_NUMBER_OF_BARS_PRELOAD_FROM_HISTORY
             access_token = Configuration.OPTION_ACCESS_TOKEN
             timeframe = Configuration.OPTION_TIMEFRAME
+            max_lookback = OandaDataHandler.DEFAULT_MAX_LOOKBACK
+
+            if configuration.has_option(Configuration.OPTION_MAX_LOOKBACK):
+                max_lookback = int(configuration.get_option(Configuration.OPTION_MAX_LOOKBACK))
 
             return DataHandlerFactory.create_oanda_data_handler(events_per_symbol, symbol_list,
                                                                 configuration.get_option(access_token),
                                                                 configuration.get_option(timeframe),
                                                                 int(configuration.get_option(bars_from_history)),
-                                                                logger)
+                                                                logger, max_lookback)
 
         raise Exception('Unknown DataHandler for {}'.format(configuration.data_handler_name))
 
     @staticmethod
     def create_historic_csv_data_handler(events_per_symbol: Dict[str, queue.Queue],
-                                         symbol_list: list, csv_dir: str) -> DataHandler:
-        return HistoricCSVDataHandler(events_per_symbol, csv_dir, symbol_list)
+                                         symbol_list: list, csv_dir: str,
+                                         csv_cache_dir: Optional[str] = None, chunk_size: Optional[int] = None,
+                                         max_lookback: int = StreamingBarStore.DEFAULT_MAX_LOOKBACK,
+                                         shared_bar_data: Optional[SharedBarData] = None,
+                                         history_fraction: float = 1.0) -> DataHandler:
+        return HistoricCSVDataHandler(events_per_symbol, csv_dir, symbol_list, csv_cache_dir, chunk_size,
+                                      max_lookback, shared_bar_data, history_fraction)
+
+    @staticmethod
+    def create_tick_replay_data_handler(events_per_symbol: Dict[str, queue.Queue], symbol_list: list, csv_dir: str,
+                                        time_frame: str) -> DataHandler:
+        return TickReplayDataHandler(events_per_symbol, csv_dir, symbol_list, TimeFrame(time_frame))
 
     @staticmethod
     def create_oanda_data_handler(events_per_symbol: Dict[str, queue.Queue], symbol_list: list, access_token: str,
                                   time_frame: str, number_of_bars_preload_from_history: int,
-                                  logger: Logger) -> DataHandler:
+                                  logger: Logger,
+                                  max_lookback: int = OandaDataHandler.DEFAULT_MAX_LOOKBACK) -> DataHandler:
         instrument_api_client = InstrumentApiClient(access_token)
         instrument_api_client.start_process_requests()
 
         bars_provider = OandaBarsProviderApi(symbol_list, instrument_api_client, TimeFrame(time_frame), logger)
 
         return OandaDataHandler(events_per_symbol, symbol_list, bars_provider, instrument_api_client, time_frame,
-                                number_of_bars_preload_from_history)
+                                number_of_bars_preload_from_history, max_lookback)
@@ -1,10 +1,16 @@
 import os
+import math
 
 import numpy as np
 import pandas as pd
 import pandas.io.parsers
 from events.market_event import MarketEvent
+from datahandlers.bar_store import BarStore
+from datahandlers.csv_cache import CsvCache
+from datahandlers.streaming_bar_store import StreamingBarStore
+from datahandlers.shared_bar_data import SharedBarData
 from datahandlers.data_handler import DataHandler
+from datahandlers.indicators import IndicatorRegistry
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -23,25 +29,59 @@ class HistoricCSVDataHandler(DataHandler):
     trading interface.
     """
 
+    CSV_READ_ARGUMENTS = dict(
+        header=2, index_col=0, parse_dates=True, delimiter=';', names=['datetime'] + BarStore.FIELDS
+    )
+
     def __init__(self, events_per_symbol: Dict[str, queue.Queue], csv_dir: str,
-                 symbol_list: List[str]) -> None:
+                 symbol_list: List[str], csv_cache_dir: Optional[str] = None, chunk_size: Optional[int] = None,
+                 max_lookback: int = StreamingBarStore.DEFAULT_MAX_LOOKBACK,
+                 shared_bar_data: Optional[SharedBarData] = None, history_fraction: float = 1.0) -> None:
         """
         Initialises the historic data handler by requesting
         the location of the CSV files and a list of symbols.
 
         It will be assumed that all files are of the form
         'symbol.csv', where symbol is a string in the list.
+
+        When csv_cache_dir is defined, parsed CSV files are kept
+        there as memory-mapped binary files (see CsvCache).
+
+        When chunk_size is defined, the files are streamed in chunks
+        of chunk_size bars and only the last max_lookback bars are kept
+        in memory (see StreamingBarStore). Bars of the symbols are not
+        aligned to a common timeline in this mode.
+
+        When shared_bar_data is defined, the CSV files are not read at
+        all and the bars are taken from the shared memory prepared by
+        another process (see create_shared_bar_data).
+
+        When history_fraction is lower than 1, only this fraction of the
+        bars from the beginning of the history is released (e.g. to
+        evaluate parameters on a prefix of the history first).
         """
         self.events_per_symbol = events_per_symbol
         self.csv_dir = csv_dir
         self.symbol_list = symbol_list
+        self.csv_cache = CsvCache(csv_cache_dir) if csv_cache_dir is not None else None
+        self.chunk_size = chunk_size
+        self.max_lookback = max_lookback
+        self.shared_bar_data = shared_bar_data
+        self.indicators = IndicatorRegistry(self)
 
         self.symbol_data = {}
         self.symbol_position_info = {}
-        self.latest_symbol_data = {}
         self.continue_backtest_per_symbols = dict(((symbol, True) for (symbol) in self.symbol_list))
 
-        self._open_convert_csv_files()
+        if self.shared_bar_data is not None:
+            self._attach_shared_bar_data()
+        elif self.chunk_size is not None:
+            self._open_csv_files_for_streaming()
+        else:
+            self._open_convert_csv_files()
+
+        if history_fraction < 1.0:
+            self._take_history_prefix(history_fraction)
 
     def get_symbol_list(self) -> list:
         return self.symbol_list
@@ -52,127 +92,167 @@ class HistoricCSVDataHandler(DataHandler):
     def _open_convert_csv_files(self):
         """
         Opens the CSV files from the data directory, converting
-        them into pandas DataFrames within a symbol dictionary.
+        them into columnar bar stores within a symbol dictionary.
 
         For this handler it will be assumed that the data is
         taken from DTN IQFeed. Thus its format will be respected.
         """
         comb_index = None
+        bar_stores = {}
+        for s in self.symbol_list:
+            bar_stores[s] = self._load_symbol_data(s)
+
+            # Combine the index to pad forward values
+            if comb_index is None:
+                comb_index = bar_stores[s].timestamps
+            else:
+                comb_index = np.union1d(comb_index, bar_stores[s].timestamps)
+
+        # Reindex the bar stores, symbols which start later are released from their first bar
         for s in self.symbol_list:
-            # Load the CSV file with no header information, indexed on date
-            self.symbol_data[s] = pd.io.parsers.read_csv(
-                os.path.join(self.csv_dir, '%s.csv' % s),
-                header=2, index_col=0, parse_dates=True, delimiter=';',
-                names=['datetime', 'open_bid', 'open_ask', 'high_bid', 'high_ask', 'low_bid', 'low_ask', 'close_bid',
-                       'close_ask', 'volume']
-            ).sort_index()
+            self.symbol_data[s] = bar_stores[s].reindex(comb_index)
 
             self.symbol_position_info[s] = dict(
-                number_of_items = self.symbol_data[s].shape[0],
+                number_of_items = self.symbol_data[s].get_number_of_bars(),
                 position = 0
             )
 
-            # Combine the index to pad forward values
-            if comb_index is None:
-                comb_index = self.symbol_data[s].index
-            else:
-                comb_index.union(self.symbol_data[s].index)
+    def _open_csv_files_for_streaming(self):
+        for s in self.symbol_list:
+            self.symbol_data[s] = StreamingBarStore(self._get_csv_file(s), self.CSV_READ_ARGUMENTS, self.chunk_size,
+                                                    self.max_lookback)
 
-            # Set the latest symbol_data to None
-            self.latest_symbol_data[s] = []
+            self.symbol_position_info[s] = dict(
+                number_of_items = None,
+                position = 0
+            )
 
-        # Reindex the dataframes
+    def _attach_shared_bar_data(self):
         for s in self.symbol_list:
-            self.symbol_data[s] = self.symbol_data[s].reindex(index=comb_index, method='pad').iterrows()
+            self.symbol_data[s] = self.shared_bar_data.get_bar_store(s)
 
-    def _get_new_bar(self, symbol):
+            self.symbol_position_info[s] = dict(
+                number_of_items = self.symbol_data[s].get_number_of_bars(),
+                position = 0
+            )
+
+    def _take_history_prefix(self, history_fraction: float):
+        if self.chunk_size is not None:
+            raise Exception('History fraction is not supported for streamed CSV files')
+
+        for s in self.symbol_list:
+            self.symbol_data[s] = self.symbol_data[s].head(int(math.ceil(self.symbol_data[s].length *
+                                                                         history_fraction)))
+            self.symbol_position_info[s]['number_of_items'] = self.symbol_data[s].get_number_of_bars()
+
+    def create_shared_bar_data(self) -> SharedBarData:
         """
-        Returns the latest bar from the data feed as a tuple of
-        (sybmbol, datetime, open, low, high, close, volume).
+        Copies the loaded bars into shared memory, so other processes can
+        create their data handlers from it without loading the CSV files.
         """
-        for b in self.symbol_data[symbol]:
-            self.symbol_position_info[symbol]['position'] = self.symbol_position_info[symbol]['position'] + 1
-            yield b
+        if self.chunk_size is not None:
+            raise Exception('Streamed CSV files can not be shared')
 
-    def has_some_bars(self, symbol: str) -> bool:
-        return symbol in self.latest_symbol_data and len(self.latest_symbol_data[symbol]) > 0
+        return SharedBarData.create(dict((s, self.symbol_data[s]) for s in self.symbol_list))
 
-    def get_latest_bar(self, symbol):
+    def get_bar_store(self, symbol: str) -> BarStore:
         """
-        Returns the last bar from the latest_symbol list.
+        Returns the store with all bars of symbol (released or not) for engines which work
+        on the whole history at once.
         """
+        if self.chunk_size is not None:
+            raise Exception('Streamed CSV files do not keep the whole history')
+
+        return self._get_symbol_data(symbol)
+
+    def _load_symbol_data(self, symbol: str) -> BarStore:
+        csv_file = self._get_csv_file(symbol)
+
+        if self.csv_cache is not None:
+            return self.csv_cache.load(csv_file, lambda: self._read_csv_file(csv_file))
+
+        return BarStore.from_dataframe(self._read_csv_file(csv_file))
+
+    def _get_csv_file(self, symbol: str) -> str:
+        return os.path.join(self.csv_dir, '%s.csv' % symbol)
+
+    def _read_csv_file(self, csv_file: str) -> pd.DataFrame:
+        # Load the CSV file with no header information, indexed on date
+        return pd.io.parsers.read_csv(csv_file, **self.CSV_READ_ARGUMENTS).sort_index()
+
+    def _get_symbol_data(self, symbol) -> BarStore:
         try:
-            bars_list = self.latest_symbol_data[symbol]
+            return self.symbol_data[symbol]
         except KeyError:
             print("That symbol is not available in the historical data set.")
             raise
-        else:
-            return bars_list[-1]
+
+    def has_some_bars(self, symbol: str) -> bool:
+        return symbol in self.symbol_data and self.symbol_data[symbol].has_some_bars()
+
+    def get_latest_bar(self, symbol):
+        """
+        Returns the last bar as a dictionary of bar values.
+        """
+        return self._get_symbol_data(symbol).get_latest_bars(1)[-1]
 
     def get_latest_bars(self, symbol, N=1):
         """
-        Returns the last N bars from the latest_symbol list,
+        Returns the last N bars as a list of dictionaries,
         or N-k if less available.
         """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print("That symbol is not available in the historical data set.")
-            raise
-        else:
-            return bars_list[-N:]
+        return self._get_symbol_data(symbol).get_latest_bars(N)
 
     def get_latest_bar_datetime(self, symbol):
         """
-        Returns a Python datetime object for the last bar.
+        Returns a pandas Timestamp object for the last bar.
         """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print("That symbol is not available in the historical data set.")
-            raise
-        else:
-            return bars_list[-1][0]
+        return self._get_symbol_data(symbol).get_latest_datetime()
+
+    def get_latest_bar_timestamp(self, symbol) -> int:
+        """
+        Returns the timestamp of the last bar from the bar store, no datetime is created.
+        """
+        return self._get_symbol_data(symbol).get_latest_timestamp()
 
     def get_latest_bar_value(self, symbol, val_type):
         """
-        Returns one of the Open, High, Low, Close, Volume or OI
-        values from the pandas Bar series object.
+        Returns one of the Open, High, Low, Close or Volume
+        values from the last bar.
         """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print("That symbol is not available in the historical data set.")
-            raise
-        else:
-            return getattr(bars_list[-1][1], val_type)
+        return self._get_symbol_data(symbol).get_latest_value(val_type)
 
     def get_latest_bars_values(self, symbol, val_type, N=1):
         """
-        Returns the last N bar values from the
-        latest_symbol list, or N-k if less available.
+        Returns the last N bar values, or N-k if less available.
+        The returned array is a read-only view into the bar store.
         """
-        try:
-            bars_list = self.get_latest_bars(symbol, N)
-        except KeyError:
-            print("That symbol is not available in the historical data set.")
-            raise
-        else:
-            return np.array([getattr(b[1], val_type) for b in bars_list])
+        return self._get_symbol_data(symbol).get_latest_values(val_type, N)
+
+    def get_next_bar_timestamp(self, symbol: str) -> Optional[int]:
+        """
+        Returns the timestamp (nanoseconds since epoch, UTC) of the bar
+        which will be released by the next update_bars call. Returns None
+        and stops the backtest for symbol when there is no bar left.
+        """
+        timestamp = self.symbol_data[symbol].get_next_timestamp()
+
+        if timestamp is None:
+            self.continue_backtest_per_symbols[symbol] = False
+
+        return timestamp
 
     def update_bars(self, symbol: str):
         """
-        Pushes the latest bar to the latest_symbol_data structure
+        Releases the next bar from the bar store
         for symbol
         """
-        try:
-            bar = next(self._get_new_bar(symbol))
-        except StopIteration:
-            self.continue_backtest_per_symbols[symbol] = False
+        if self.symbol_data[symbol].advance():
+            self.symbol_position_info[symbol]['position'] = self.symbol_position_info[symbol]['position'] + 1
+            self.indicators.update(symbol)
+            self.events_per_symbol[symbol].put(MarketEvent.create(symbol))
         else:
-            if bar is not None:
-                self.latest_symbol_data[symbol].append(bar)
-                self.events_per_symbol[symbol].put(MarketEvent(symbol))
+            self.continue_backtest_per_symbols[symbol] = False
 
     def get_position_in_percentage(self):
         positions_in_percentage = list()
@@ -186,10 +266,10 @@ class HistoricCSVDataHandler(DataHandler):
         return ''
 
     def get_position_in_percentage_for_symbol(self, symbol):
-        position = float(self.symbol_position_info[symbol]['position'])
-        number_of_items = float(self.symbol_position_info[symbol]['number_of_items'])
+        return np.round(self.symbol_data[symbol].get_position_in_percentage(), 2)
 
-        return np.round(100 * (position / number_of_items), 2)
+    def get_indicators(self) -> IndicatorRegistry:
+        return self.indicators
 
     def get_number_of_bars(self, symbol):
         """
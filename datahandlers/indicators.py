@@ -0,0 +1,230 @@
+import math
+from collections import deque
+from typing import Optional
+
+
+class Indicator(object):
+    """
+    Indicator is updated with one value of every new bar in constant
+    (amortized) time. get_value returns None until period values were seen.
+    """
+
+    def __init__(self, period: int) -> None:
+        if period < 1:
+            raise Exception('Period of an indicator has to be at least 1')
+
+        self.period = period
+        self.number_of_values = 0
+
+    def update(self, value: float) -> None:
+        raise NotImplementedError("Should implement update()")
+
+    def get_value(self) -> Optional[float]:
+        raise NotImplementedError("Should implement get_value()")
+
+    def is_ready(self) -> bool:
+        return self.number_of_values >= self.period
+
+
+class RollingSum(object):
+    """
+    Sum of the last period values. The sum is compensated (Neumaier), so it
+    does not drift from the sum of the window when values are added and
+    removed for a long time.
+    """
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.window = deque()
+        self.sum = 0.0
+        self.compensation = 0.0
+
+    def update(self, value: float) -> None:
+        self.window.append(value)
+        self._add(value)
+
+        if len(self.window) > self.period:
+            self._add(-self.window.popleft())
+
+    def _add(self, value: float) -> None:
+        total = self.sum + value
+
+        if abs(self.sum) >= abs(value):
+            self.compensation += (self.sum - total) + value
+        else:
+            self.compensation += (value - total) + self.sum
+
+        self.sum = total
+
+    def get_sum(self) -> float:
+        return self.sum + self.compensation
+
+
+class SimpleMovingAverage(Indicator):
+    def __init__(self, period: int) -> None:
+        super().__init__(period)
+        self.rolling_sum = RollingSum(period)
+
+    def update(self, value: float) -> None:
+        self.number_of_values += 1
+        self.rolling_sum.update(value)
+
+    def get_value(self) -> Optional[float]:
+        if not self.is_ready():
+            return None
+
+        return self.rolling_sum.get_sum() / self.period
+
+
+class ExponentialMovingAverage(Indicator):
+    """
+    EMA with smoothing 2 / (period + 1), it starts from the SMA of the first period values.
+    """
+
+    def __init__(self, period: int) -> None:
+        super().__init__(period)
+        self.smoothing = 2.0 / (period + 1)
+        self.first_values_sum = 0.0
+        self.value = None
+
+    def update(self, value: float) -> None:
+        self.number_of_values += 1
+
+        if self.number_of_values < self.period:
+            self.first_values_sum += value
+        elif self.number_of_values == self.period:
+            self.value = (self.first_values_sum + value) / self.period
+        else:
+            self.value += self.smoothing * (value - self.value)
+
+    def get_value(self) -> Optional[float]:
+        return self.value
+
+
+class RollingStandardDeviation(Indicator):
+    """
+    Population standard deviation of the last period values (as numpy.std).
+    """
+
+    def __init__(self, period: int) -> None:
+        super().__init__(period)
+        self.rolling_sum = RollingSum(period)
+        self.rolling_sum_of_squares = RollingSum(period)
+
+    def update(self, value: float) -> None:
+        self.number_of_values += 1
+        self.rolling_sum.update(value)
+        self.rolling_sum_of_squares.update(value * value)
+
+    def get_value(self) -> Optional[float]:
+        if not self.is_ready():
+            return None
+
+        mean = self.rolling_sum.get_sum() / self.period
+        variance = self.rolling_sum_of_squares.get_sum() / self.period - mean * mean
+
+        # Rounding can make the variance of (nearly) constant values slightly negative
+        return math.sqrt(max(variance, 0.0))
+
+
+class RollingMaximum(Indicator):
+    """
+    Maximum of the last period values, kept by a deque of candidates with decreasing values.
+    """
+
+    def __init__(self, period: int) -> None:
+        super().__init__(period)
+        self.candidates = deque()
+
+    def update(self, value: float) -> None:
+        while self.candidates and self._is_replaced_by(self.candidates[-1][1], value):
+            self.candidates.pop()
+
+        self.candidates.append((self.number_of_values, value))
+        self.number_of_values += 1
+
+        if self.candidates[0][0] <= self.number_of_values - 1 - self.period:
+            self.candidates.popleft()
+
+    @staticmethod
+    def _is_replaced_by(candidate: float, value: float) -> bool:
+        return candidate <= value
+
+    def get_value(self) -> Optional[float]:
+        if not self.is_ready():
+            return None
+
+        return self.candidates[0][1]
+
+
+class RollingMinimum(RollingMaximum):
+    """
+    Minimum of the last period values.
+    """
+
+    @staticmethod
+    def _is_replaced_by(candidate: float, value: float) -> bool:
+        return candidate >= value
+
+
+class IndicatorRegistry(object):
+    """
+    IndicatorRegistry keeps the indicators of a data handler. Every indicator
+    is created once per symbol, bar field and period, consumers asking for
+    the same one share it. The data handler calls update when a new bar of
+    the symbol was released, before its MarketEvent is put to the queue.
+
+    An indicator created when some bars are already available is started
+    from the last period values of the history (an EMA is started from their
+    SMA).
+
+    Values which are not finite (e.g. NaN of a missing price) are skipped, so
+    they do not stay in the sums of the indicators.
+    """
+
+    def __init__(self, data_handler) -> None:
+        """
+        :type data_handler: DataHandler
+        """
+        self.data_handler = data_handler
+        self.indicators_per_symbol = {}
+
+    def get(self, symbol: str, indicator_class: type, period: int, field: str = 'close_bid') -> Indicator:
+        indicators_per_field = self.indicators_per_symbol.setdefault(symbol, {})
+        indicators = indicators_per_field.setdefault(field, {})
+        key = (indicator_class, period)
+
+        if key not in indicators:
+            indicator = indicator_class(period)
+
+            if self.data_handler.has_some_bars(symbol):
+                for value in self._get_latest_finite_values(symbol, field, period):
+                    indicator.update(value)
+
+            indicators[key] = indicator
+
+        return indicators[key]
+
+    def update(self, symbol: str) -> None:
+        if symbol not in self.indicators_per_symbol:
+            return
+
+        for field, indicators in self.indicators_per_symbol[symbol].items():
+            value = float(self.data_handler.get_latest_bar_value(symbol, field))
+
+            if not math.isfinite(value):
+                continue
+
+            for indicator in indicators.values():
+                indicator.update(value)
+
+    def _get_latest_finite_values(self, symbol: str, field: str, period: int) -> list:
+        values = [float(value) for value in self.data_handler.get_latest_bars_values(symbol, field, N=period)]
+
+        if all(math.isfinite(value) for value in values):
+            return values
+
+        # Some values were skipped, the window is filled from the whole history
+        values = self.data_handler.get_latest_bars_values(symbol, field, N=self.data_handler.get_number_of_bars(symbol))
+
+        return [float(value) for value in values if math.isfinite(value)][-period:]
@@ -1,13 +1,15 @@
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 from events.market_event import MarketEvent
-from dateutil import parser
+from oanda.timestamp_parser import TimestampParser
 from oanda.instrument_api_client import InstrumentApiClient
 import asyncio
 from typing import Dict
 from typing import Optional
 from datahandlers.data_handler import DataHandler
 from datahandlers.bars_provider.bars_provider import BarsProvider
+from datahandlers.bar_ring_buffer import BarRingBuffer
+from datahandlers.indicators import IndicatorRegistry
 
 try:
     import Queue as queue
@@ -17,17 +19,27 @@ except ImportError:
 
 class OandaDataHandler(DataHandler):
 
+    DEFAULT_MAX_LOOKBACK = 1000
+
+    TIMESTAMP_PARSER = TimestampParser()
+
+    FIELDS = ['open_bid', 'open_ask', 'high_bid', 'high_ask', 'low_bid', 'low_ask', 'close_bid', 'close_ask',
+              'volume']
+
     def __init__(self, events_per_symbol: Dict[str, queue.Queue], symbol_list: list, bars_provider: BarsProvider,
                  instrument_api_client: InstrumentApiClient, time_frame: str,
-                 number_of_bars_preload_from_history: int) -> None:
-
+                 number_of_bars_preload_from_history: int, max_lookback: int = DEFAULT_MAX_LOOKBACK) -> None:
+        """
+        Only the last max_lookback bars of every symbol are kept in memory
+        (see BarRingBuffer), so a long running process does not grow.
+        """
         self.events_per_symbol = events_per_symbol
 
         self.symbol_list = symbol_list
+        self.max_lookback = max_lookback
 
         self.symbol_data = {}
         self.symbol_position_info = {}
-        self.latest_symbol_data = {}
         self.continue_backtest_per_symbols = dict(((symbol, True) for (symbol) in self.symbol_list))
         self.error_message = None
         self.time_frame = time_frame
@@ -37,6 +49,7 @@ class OandaDataHandler(DataHandler):
         self.instrument_api_client = instrument_api_client
 
         self.providing_bars_loop = None
+        self.indicators = IndicatorRegistry(self)
 
         if number_of_bars_preload_from_history > 0:
             for symbol in self.symbol_list:
@@ -87,7 +100,7 @@ class OandaDataHandler(DataHandler):
 
     @staticmethod
     def get_price_datetime(datetime_as_string):
-        price_datetime = parser.parse(datetime_as_string)
+        price_datetime = OandaDataHandler.TIMESTAMP_PARSER.parse_to_datetime(datetime_as_string)
         price_datetime = price_datetime.replace(tzinfo=None)
         price_datetime = price_datetime.replace(microsecond=0)
 
@@ -111,90 +124,71 @@ class OandaDataHandler(DataHandler):
 
     def append_new_price_data(self, symbol, data):
         if symbol not in self.symbol_data:
-            self.symbol_data[symbol] = [data]
+            self.symbol_data[symbol] = BarRingBuffer(self.max_lookback, self.FIELDS)
             self.symbol_position_info[symbol] = dict(
-                number_of_items=1,
-                position=1
+                number_of_items=0,
+                position=0
             )
-        else:
-            self.symbol_data[symbol].append(data)
 
-            self.symbol_position_info[symbol]['number_of_items'] = \
-                self.symbol_position_info[symbol]['number_of_items'] + 1
+        self.symbol_data[symbol].append(data)
 
-            self.symbol_position_info[symbol]['position'] = \
-                self.symbol_position_info[symbol]['position'] + 1
+        self.symbol_position_info[symbol]['number_of_items'] = \
+            self.symbol_position_info[symbol]['number_of_items'] + 1
 
-        if symbol not in self.latest_symbol_data:
-            self.latest_symbol_data[symbol] = []
+        self.symbol_position_info[symbol]['position'] = \
+            self.symbol_position_info[symbol]['position'] + 1
 
-        self.latest_symbol_data[symbol].append(data)
+        self.indicators.update(symbol)
+
+    def _get_symbol_data(self, symbol) -> BarRingBuffer:
+        try:
+            return self.symbol_data[symbol]
+        except KeyError:
+            print("That symbol is not available in the historical data set.")
+            raise
 
     def has_some_bars(self, symbol: str) -> bool:
-        return symbol in self.latest_symbol_data and len(self.latest_symbol_data[symbol]) > 0
+        return symbol in self.symbol_data and self.symbol_data[symbol].get_size() > 0
 
     def get_latest_bar(self, symbol: str):
         """
-        Returns the last bar from the latest_symbol list.
+        Returns the last bar as a dictionary of bar values.
         """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print("That symbol is not available in the historical data set.")
-            raise
-        else:
-            return bars_list[-1]
+        return self._get_symbol_data(symbol).get_latest_bars(1)[-1]
 
     def get_latest_bars(self, symbol, N=1):
         """
-        Returns the last N bars from the latest_symbol list,
-        or N-k if less available.
+        Returns the last N bars (at most max_lookback) as a list
+        of dictionaries, or N-k if less available.
         """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print("That symbol is not available in the historical data set.")
-            raise
-        else:
-            return bars_list[-N:]
+        return self._get_symbol_data(symbol).get_latest_bars(N)
 
     def get_latest_bar_datetime(self, symbol):
         """
         Returns a Python datetime object for the last bar.
         """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print("That symbol is not available in the historical data set.")
-            raise
-        else:
-            return bars_list[-1]['datetime']
+        return self.get_latest_bar(symbol)['datetime']
 
     def get_latest_bar_value(self, symbol, val_type):
         """
-        Returns one of the Open, High, Low, Close, Volume or OI
-        values from the pandas Bar series object.
+        Returns one of the Open, High, Low, Close or Volume
+        values from the last bar.
         """
-        try:
-            bars_list = self.latest_symbol_data[symbol]
-        except KeyError:
-            print("That symbol is not available in the historical data set.")
-            raise
-        else:
-            return bars_list[-1][val_type]
+        return float(self._get_symbol_data(symbol).get_latest_values(val_type, 1)[-1])
 
     def get_latest_bars_values(self, symbol, val_type, N=1):
         """
-        Returns the last N bar values from the
-        latest_symbol list, or N-k if less available.
+        Returns the last N bar values (at most max_lookback), or N-k
+        if less available. The returned array is a read-only view
+        into the ring buffer.
         """
-        try:
-            bars_list = self.get_latest_bars(symbol, N)
-        except KeyError:
-            print("That symbol is not available in the historical data set.")
-            raise
-        else:
-            return np.array([b[val_type] for b in bars_list])
+        return self._get_symbol_data(symbol).get_latest_values(val_type, N)
+
+    def get_retained_memory_bytes(self) -> int:
+        """
+        Returns the number of bytes held by the bar buffers of all symbols.
+        """
+        return sum(bar_buffer.get_retained_memory_bytes() for bar_buffer in self.symbol_data.values())
 
     def update_bars(self, symbol: str):
         """
@@ -209,7 +203,7 @@ class OandaDataHandler(DataHandler):
         else:
             if bar is not None:
                 self.append_new_price_data(symbol, bar)
-                self.events_per_symbol[symbol].put(MarketEvent(symbol))
+                self.events_per_symbol[symbol].put(MarketEvent.create(symbol))
 
     def get_error_message(self) -> Optional[str]:
         return self.error_message
@@ -217,12 +211,15 @@ class OandaDataHandler(DataHandler):
     def get_position_in_percentage(self):
         return 0
 
+    def get_indicators(self) -> IndicatorRegistry:
+        return self.indicators
+
     def get_number_of_bars(self, symbol):
         """
 
         :type symbol: str
         """
         if symbol in self.symbol_data:
-            return len(self.symbol_data[symbol])
+            return self.symbol_data[symbol].number_of_bars
         else:
             return 0
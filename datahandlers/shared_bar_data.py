@@ -0,0 +1,122 @@
+import numpy as np
+from multiprocessing import shared_memory
+from datahandlers.bar_store import BarStore
+from typing import Dict
+from typing import List
+
+
+class SharedBarData(object):
+    """
+    SharedBarData places the bars of all symbols into read-only shared memory
+    segments (one per symbol - timestamps followed by the bar columns), so
+    several backtest processes can run on the same data set while it is held
+    in memory only once. Every process gets its own BarStore instances with
+    their own cursor over the shared arrays.
+
+    The process which calls create owns the segments and has to call unlink
+    when all workers are finished. Pickling the instance (e.g. passing it to
+    a multiprocessing pool) only transfers the names of the segments, the
+    receiving process attaches to them.
+    """
+
+    def __init__(self, descriptor: dict, segments: Dict[str, shared_memory.SharedMemory]) -> None:
+        self.descriptor = descriptor
+        self.segments = segments
+        self.arrays = {}
+
+        for symbol, info in self.descriptor.items():
+            self.arrays[symbol] = self._create_arrays(self.segments[symbol], info)
+
+    @staticmethod
+    def create(bar_stores: Dict[str, BarStore]) -> 'SharedBarData':
+        """
+        Copies the bar stores into new shared memory segments.
+        """
+        descriptor = {}
+        segments = {}
+
+        for symbol, bar_store in bar_stores.items():
+            fields = list(bar_store.columns.keys())
+            size = max(bar_store.length * 8 * (len(fields) + 1), 1)
+
+            segment = shared_memory.SharedMemory(create=True, size=size)
+            segments[symbol] = segment
+
+            descriptor[symbol] = dict(name=segment.name, length=bar_store.length, fields=fields, tz=bar_store.tz,
+                                      first=bar_store.first)
+
+            timestamps, columns = SharedBarData._create_arrays(segment, descriptor[symbol], writeable=True)
+            timestamps[:] = bar_store.timestamps[:bar_store.length]
+
+            for field in fields:
+                columns[field][:] = bar_store.columns[field][:bar_store.length]
+
+        return SharedBarData(descriptor, segments)
+
+    @staticmethod
+    def attach(descriptor: dict) -> 'SharedBarData':
+        """
+        Attaches to the segments created by another process.
+        """
+        segments = dict((symbol, SharedBarData._open_segment(info['name'])) for symbol, info in descriptor.items())
+
+        return SharedBarData(descriptor, segments)
+
+    def __reduce__(self):
+        return SharedBarData.attach, (self.descriptor,)
+
+    def get_symbol_list(self) -> List[str]:
+        return list(self.descriptor.keys())
+
+    def get_bar_store(self, symbol: str) -> BarStore:
+        """
+        Returns a new store (with the cursor at the beginning) over the shared arrays of symbol.
+        """
+        timestamps, columns = self.arrays[symbol]
+
+        return BarStore(timestamps, columns, self.descriptor[symbol]['tz'], self.descriptor[symbol]['first'])
+
+    def get_shared_memory_bytes(self) -> int:
+        return sum(segment.size for segment in self.segments.values())
+
+    def close(self) -> None:
+        """
+        Detaches from the segments. Bar stores returned by this instance can not be used afterwards.
+        """
+        self.arrays = {}
+
+        for segment in self.segments.values():
+            segment.close()
+
+    def unlink(self) -> None:
+        """
+        Closes and removes the segments, should be called only by the process which created them.
+        """
+        self.close()
+
+        for segment in self.segments.values():
+            segment.unlink()
+
+    @staticmethod
+    def _open_segment(name: str) -> shared_memory.SharedMemory:
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Older Python versions always track the segment, child processes share the resource tracker
+            # of the creating process, so the segment is not removed when the worker exits
+            return shared_memory.SharedMemory(name=name)
+
+    @staticmethod
+    def _create_arrays(segment: shared_memory.SharedMemory, info: dict, writeable: bool = False) -> tuple:
+        length = info['length']
+
+        timestamps = np.ndarray((length,), dtype=np.int64, buffer=segment.buf)
+        timestamps.flags.writeable = writeable
+
+        columns = {}
+        for position, field in enumerate(info['fields']):
+            columns[field] = np.ndarray((length,), dtype=np.float64, buffer=segment.buf,
+                                        offset=8 * length * (position + 1))
+            columns[field].flags.writeable = writeable
+
+        return timestamps, columns
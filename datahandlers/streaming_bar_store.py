@@ -0,0 +1,102 @@
+import os
+import numpy as np
+import pandas as pd
+import pandas.io.parsers
+from datahandlers.bar_store import BarStore
+
+
+class StreamingBarStore(BarStore):
+    """
+    StreamingBarStore reads a CSV file in chunks of fixed size instead of
+    loading the whole file into memory. The columns are buffers with room for
+    max_lookback already released bars and one chunk - when the chunk is
+    consumed, the last max_lookback bars are moved to the beginning of the
+    buffers and the next chunk is read behind them. Look-back windows of up
+    to max_lookback bars are therefore always available as a contiguous view,
+    even when they cross chunk boundaries, and the memory use does not depend
+    on the size of the file.
+
+    The file needs to be sorted by time, bars are not reordered.
+    """
+
+    DEFAULT_MAX_LOOKBACK = 1000
+
+    def __init__(self, csv_file: str, read_csv_arguments: dict, chunk_size: int,
+                 max_lookback: int = DEFAULT_MAX_LOOKBACK) -> None:
+        self.csv_file = csv_file
+        self.chunk_size = chunk_size
+        self.max_lookback = max_lookback
+        self.file_size = os.path.getsize(csv_file)
+
+        capacity = max_lookback + chunk_size
+        fields = [field for field in read_csv_arguments['names'] if field != 'datetime']
+
+        super().__init__(np.zeros(capacity, dtype=np.int64),
+                         dict((field, np.zeros(capacity, dtype=np.float64)) for field in fields))
+
+        self.size = 0
+        self.finished = False
+
+        self.opened_file = open(csv_file, 'r')
+        self.chunks = pd.io.parsers.read_csv(self.opened_file, chunksize=chunk_size, **read_csv_arguments)
+
+    def has_next(self) -> bool:
+        return self.cursor < self.size or self._read_next_chunk()
+
+    def advance(self) -> bool:
+        if self.cursor >= self.size and not self._read_next_chunk():
+            return False
+
+        self.cursor += 1
+
+        return True
+
+    def get_position_in_percentage(self) -> float:
+        if self.finished or self.file_size == 0:
+            return 100.0
+
+        return 100.0 * self.opened_file.tell() / self.file_size
+
+    def get_latest_values(self, val_type: str, n: int = 1) -> np.ndarray:
+        """
+        Returns the last n values of the field (at most max_lookback) as a read-only view into the buffer.
+        The view is valid only until the next bar is released.
+        """
+        values = super().get_latest_values(val_type, n)
+        values.flags.writeable = False
+
+        return values
+
+    def reindex(self, timestamps: np.ndarray) -> 'BarStore':
+        raise Exception('StreamingBarStore can not be reindexed')
+
+    def _read_next_chunk(self) -> bool:
+        if self.finished:
+            return False
+
+        try:
+            chunk = BarStore.from_dataframe(next(self.chunks), list(self.columns.keys()))
+        except StopIteration:
+            self.finished = True
+            self.opened_file.close()
+
+            return False
+
+        if self.size > 0 and chunk.length > 0 and chunk.timestamps[0] < self.timestamps[self.size - 1]:
+            raise Exception('File {} needs to be sorted by time to be streamed'.format(self.csv_file))
+
+        kept = min(self.cursor, self.max_lookback)
+        start = self.cursor - kept
+
+        self.timestamps[:kept] = self.timestamps[start:self.cursor]
+        self.timestamps[kept:kept + chunk.length] = chunk.timestamps
+
+        for field, values in self.columns.items():
+            values[:kept] = values[start:self.cursor]
+            values[kept:kept + chunk.length] = chunk.columns[field]
+
+        self.tz = chunk.tz
+        self.cursor = kept
+        self.size = kept + chunk.length
+
+        return chunk.length > 0 or self._read_next_chunk()
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pandas.io.parsers
+from datahandlers.bar_store import BarStore
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from timeframe.timeframe import TimeFrame
+from typing import Dict
+from typing import List
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class TickReplayDataHandler(HistoricCSVDataHandler):
+    """
+    TickReplayDataHandler reads recorded bid/ask ticks and replays them as
+    bars of the given time frame. It is assumed that all files are of the form
+    'symbol.csv' with a header line and rows 'time;bid;ask'.
+
+    Ticks are aggregated with NumPy in one pass - every tick gets the start of
+    its bar (see TimeFrame.get_epoch_border), the bar boundaries are the
+    positions where this value changes and open/high/low/close are taken with
+    reduceat over those boundaries. The bars carry the same fields as the ones
+    created by BarsProvider.create_bar_data.
+    """
+
+    TICK_CSV_READ_ARGUMENTS = dict(
+        header=0, index_col=0, parse_dates=True, delimiter=';', names=['datetime', 'bid', 'ask']
+    )
+
+    def __init__(self, events_per_symbol: Dict[str, queue.Queue], csv_dir: str, symbol_list: List[str],
+                 time_frame: TimeFrame) -> None:
+        self.time_frame = time_frame
+
+        super().__init__(events_per_symbol, csv_dir, symbol_list)
+
+    def _load_symbol_data(self, symbol: str) -> BarStore:
+        ticks = pd.io.parsers.read_csv(self._get_csv_file(symbol), **self.TICK_CSV_READ_ARGUMENTS)
+        ticks = ticks.sort_index(kind='stable')
+
+        tz = None
+        index = ticks.index
+
+        if index.tz is not None:
+            tz = str(index.tz)
+            index = index.tz_convert(None)
+
+        timestamps = np.asarray(index, dtype='datetime64[ns]').view(np.int64)
+
+        return self.aggregate_ticks(timestamps, ticks['bid'].values, ticks['ask'].values, self.time_frame, tz)
+
+    @staticmethod
+    def aggregate_ticks(timestamps: np.ndarray, bid: np.ndarray, ask: np.ndarray, time_frame: TimeFrame,
+                        tz: str = None) -> BarStore:
+        """
+        Aggregates sorted ticks (timestamps in nanoseconds since epoch) into bars of time_frame.
+        """
+        bid = np.ascontiguousarray(bid, dtype=np.float64)
+        ask = np.ascontiguousarray(ask, dtype=np.float64)
+
+        bar_starts_at = time_frame.get_epoch_border(timestamps)[0]
+
+        # Positions of the first and the last tick of every bar
+        starts = np.flatnonzero(bar_starts_at[1:] != bar_starts_at[:-1]) + 1
+        ends = starts - 1
+
+        if len(timestamps) > 0:
+            starts = np.concatenate(([0], starts))
+            ends = np.concatenate((ends, [len(timestamps) - 1]))
+
+        aggregated = dict(volume=np.zeros(len(starts), dtype=np.float64))
+
+        for side, prices in (('bid', bid), ('ask', ask)):
+            aggregated['open_' + side] = prices[starts]
+            aggregated['close_' + side] = prices[ends]
+
+            if len(starts) > 0:
+                aggregated['high_' + side] = np.maximum.reduceat(prices, starts)
+                aggregated['low_' + side] = np.minimum.reduceat(prices, starts)
+            else:
+                aggregated['high_' + side] = aggregated['low_' + side] = np.zeros(0, dtype=np.float64)
+
+        columns = {}
+        for field in BarStore.FIELDS:
+            columns[field] = aggregated[field]
+            columns[field].setflags(write=False)
+
+        return BarStore(bar_starts_at[starts], columns, tz)
@@ -1,10 +1,13 @@
 from events.event import Event
+from events.event_kind import EventKind
 
 
 class ClosePendingOrdersEvent(Event):
+    __slots__ = ()
+
     def __init__(self, symbol: str) -> None:
 
-        super().__init__('CLOSE_PENDING_ORDERS', symbol)
+        super().__init__(EventKind.CLOSE_PENDING_ORDERS, symbol)
 
     def get_as_string(self) -> str:
         return 'ClosePendingOrders: %s' % self.symbol
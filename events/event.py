@@ -1,11 +1,14 @@
 from abc import ABCMeta, abstractmethod
+from events.event_kind import EventKind
 
 
 class Event(object):
     __metaclass__ = ABCMeta
 
-    def __init__(self, event_type: str, symbol: str):
-        self._type = event_type
+    __slots__ = ('_kind', '_symbol')
+
+    def __init__(self, kind: EventKind, symbol: str):
+        self._kind = kind
         self._symbol = symbol
 
     @abstractmethod
@@ -13,12 +16,12 @@ class Event(object):
         raise NotImplementedError("Should implement get_as_string()")
 
     @property
-    def type(self) -> str:
-        return self._type
+    def kind(self) -> EventKind:
+        return self._kind
 
-    @type.setter
-    def type(self, val: str) -> None:
-        self._type = val
+    @property
+    def type(self) -> str:
+        return self._kind.name
 
     @property
     def symbol(self) -> str:
@@ -0,0 +1,13 @@
+from enum import IntEnum
+
+
+class EventKind(IntEnum):
+    """
+    Kinds of the events used by the core components. Custom events can
+    define their own IntEnum with values not used here.
+    """
+    MARKET = 1
+    SIGNAL = 2
+    ORDER = 3
+    FILL = 4
+    CLOSE_PENDING_ORDERS = 5
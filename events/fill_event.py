@@ -1,13 +1,16 @@
 from events.event import Event
+from events.event_kind import EventKind
 from datetime import datetime
 from typing import Optional
 
 
 class FillEvent(Event):
+    __slots__ = ('time_index', 'exchange', 'quantity', 'direction', 'commission', 'fill_cost', 'trade_id')
+
     def __init__(self, time_index: datetime, symbol: str, exchange: str, quantity: float, direction: str,
                  fill_cost: Optional[float] = None, commission: Optional[float] = None, trade_id: Optional[int] = None):
 
-        super().__init__('FILL', symbol)
+        super().__init__(EventKind.FILL, symbol)
 
         self.time_index = time_index
         self.exchange = exchange
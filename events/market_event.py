@@ -1,9 +1,42 @@
 from events.event import Event
+from events.event_kind import EventKind
 
 
 class MarketEvent(Event):
+    """
+    MarketEvent is created for every bar, so released events can be returned
+    into a free list by recycle and reused by create instead of allocating
+    new ones. Only events which are not referenced anymore may be recycled.
+    """
+
+    __slots__ = ()
+
+    KIND = EventKind.MARKET
+
+    MAX_POOLED_EVENTS = 1024
+
+    _pool = []
+
     def __init__(self, symbol: str):
-        super().__init__('MARKET', symbol)
+        # Event.__init__ is not called, this is the most frequently created event
+        self._kind = self.KIND
+        self._symbol = symbol
+
+    @staticmethod
+    def create(symbol: str) -> 'MarketEvent':
+        try:
+            event = MarketEvent._pool.pop()
+        except IndexError:
+            return MarketEvent(symbol)
+
+        event._symbol = symbol
+
+        return event
+
+    @staticmethod
+    def recycle(event: 'MarketEvent') -> None:
+        if len(MarketEvent._pool) < MarketEvent.MAX_POOLED_EVENTS:
+            MarketEvent._pool.append(event)
 
     def get_as_string(self) -> str:
         return ''
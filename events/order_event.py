@@ -1,7 +1,10 @@
 from events.event import Event
+from events.event_kind import EventKind
 
 
 class OrderEvent(Event):
+    __slots__ = ('order_type', 'quantity', 'direction', 'stop_loss', 'take_profit', 'price', 'note',
+                 'trade_id_related_to', 'trade_to_exit_direction')
 
     def __init__(self, symbol, order_type, quantity, direction, stop_loss=None, take_profit=None, price=None,
                  note=None, trade_id_related_to=None, trade_to_exit_direction=None):
@@ -22,7 +25,7 @@ class OrderEvent(Event):
         trade_id_related_to
         trade_to_exit_direction
         """
-        super().__init__('ORDER', symbol)
+        super().__init__(EventKind.ORDER, symbol)
 
         self.order_type = order_type
         self.quantity = quantity
@@ -1,7 +1,11 @@
 from events.event import Event
+from events.event_kind import EventKind
 
 
 class SignalEvent(Event):
+    __slots__ = ('strategy_id', 'bar_datetime', 'datetime', 'signal_type', 'strength', 'stop_loss', 'take_profit',
+                 'trade_id_to_exit')
+
     def __init__(self, strategy_id, symbol, bar_datetime, datetime, signal_type, strength, stop_loss=None,
                  take_profit=None, trade_id_to_exit=None):
         """
@@ -20,7 +24,7 @@ class SignalEvent(Event):
         trade_id_to_exit - Trade to exit
         """
 
-        super().__init__('SIGNAL', symbol)
+        super().__init__(EventKind.SIGNAL, symbol)
 
         self.strategy_id = strategy_id
         self.bar_datetime = bar_datetime
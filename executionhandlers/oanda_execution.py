@@ -8,6 +8,7 @@ from oanda.trade_api_client import TradeApiClient
 from loggers.logger import Logger
 from typing import Dict
 from datahandlers.data_handler import DataHandler
+from events.event_kind import EventKind
 
 try:
     import Queue as queue
@@ -30,7 +31,7 @@ class OandaExecutionHandler(ExecutionHandler):
         """
         :type event: OrderEvent
         """
-        if event.type == 'ORDER':
+        if event.kind == EventKind.ORDER:
             order_api = OrderApiClient(self.account_id, self.access_token)
             trade_api = TradeApiClient(self.account_id, self.access_token)
 
@@ -7,6 +7,7 @@ from events.close_pending_orders_event import ClosePendingOrdersEvent
 from datahandlers.data_handler import DataHandler
 import copy
 from typing import Dict
+from events.event_kind import EventKind
 
 try:
     import Queue as queue
@@ -34,7 +35,7 @@ class SimulatedExecutionHandler(ExecutionHandler):
         Parameters:
         event - Contains an Event object with order information.
         """
-        if event.type == 'ORDER':
+        if event.kind == EventKind.ORDER:
             if event.order_type == 'MKT':
                 if event.trade_id_related_to is not None:
                     trade_id = event.trade_id_related_to
@@ -0,0 +1,135 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional
+
+try:
+    from sklearn.externals import joblib
+except ImportError:
+    import joblib
+
+
+class ModelRegistry(object):
+    """
+    ModelRegistry loads trained models (files written by joblib.dump) once
+    per process. Models are keyed by the SHA-256 of the file content, so
+    copies of the same file share one entry, and the least recently used
+    models are dropped when there are more than capacity of them. The hashes
+    of the files of a dropped model are dropped with it. A model is loaded by
+    the first thread asking for it, other threads wait for that load.
+
+    NumPy arrays of the model are memory mapped (mmap_mode of joblib.load)
+    when the file was dumped without compression, so processes which load
+    the same file share the pages of these arrays in the page cache. This
+    holds only for plain ndarray attributes. Objects rebuilt on unpickling
+    keep their own copy in every process, e.g. the Tree objects of sklearn
+    tree ensembles such as RandomForestClassifier. Memory mapped arrays are
+    read only.
+    """
+
+    DEFAULT_CAPACITY = 4
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    default = None
+    default_lock = threading.Lock()
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, mmap_mode: Optional[str] = 'r') -> None:
+        self.capacity = capacity
+        self.mmap_mode = mmap_mode
+
+        self.models = OrderedDict()
+        # Absolute path of a file -> (size, modification time, hash of the content)
+        self.hashes = {}
+        # Hash of the content -> Future of the model being loaded
+        self.loading = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_default() -> 'ModelRegistry':
+        """
+        Returns the registry shared by the whole process.
+        """
+        with ModelRegistry.default_lock:
+            if ModelRegistry.default is None:
+                ModelRegistry.default = ModelRegistry()
+
+        return ModelRegistry.default
+
+    def load(self, model_file: str):
+        content_hash = self.get_hash(model_file)
+
+        with self.lock:
+            if content_hash in self.models:
+                self.models.move_to_end(content_hash)
+
+                return self.models[content_hash]
+
+            is_loading = content_hash in self.loading
+
+            if not is_loading:
+                self.loading[content_hash] = Future()
+
+            future = self.loading[content_hash]
+
+        if is_loading:
+            return future.result()
+
+        try:
+            model = joblib.load(model_file, mmap_mode=self.mmap_mode)
+        except BaseException as e:
+            with self.lock:
+                del self.loading[content_hash]
+
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            del self.loading[content_hash]
+            self.models[content_hash] = model
+            self.models.move_to_end(content_hash)
+
+            while len(self.models) > self.capacity:
+                dropped_hash, dropped_model = self.models.popitem(last=False)
+                self._drop_hashes(dropped_hash)
+
+        future.set_result(model)
+
+        return model
+
+    def get_hash(self, model_file: str) -> str:
+        """
+        Returns the hash of the file content. It is computed again only when the size or the
+        modification time of the file changed, only the last hash of every file is kept.
+        """
+        file_stat = os.stat(model_file)
+        path = os.path.abspath(model_file)
+        version = (file_stat.st_size, file_stat.st_mtime_ns)
+
+        with self.lock:
+            if path in self.hashes and self.hashes[path][:2] == version:
+                return self.hashes[path][2]
+
+        content_hash = hashlib.sha256()
+
+        with open(model_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b''):
+                content_hash.update(chunk)
+
+        with self.lock:
+            self.hashes[path] = version + (content_hash.hexdigest(),)
+
+            return self.hashes[path][2]
+
+    def _drop_hashes(self, content_hash: str) -> None:
+        for path in [path for path, (size, mtime, file_hash) in self.hashes.items() if file_hash == content_hash]:
+            del self.hashes[path]
+
+    def get_number_of_models(self) -> int:
+        return len(self.models)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.models.clear()
+            self.hashes.clear()
@@ -31,6 +31,9 @@ def main():
 
     configuration.set_option(Configuration.OPTION_CSV_DIR, args_namespace.data_directory)
 
+    if args_namespace.csv_cache_dir is not None:
+        configuration.set_option(Configuration.OPTION_CSV_CACHE_DIR, args_namespace.csv_cache_dir)
+
     simulation = Backtest(
         args_namespace.output_directory,
         args_namespace.symbols,
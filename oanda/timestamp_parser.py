@@ -0,0 +1,88 @@
+from datetime import date
+from datetime import datetime
+from datetime import timezone
+from timeframe.timeframe import TimeFrame
+
+
+class TimestampParser(object):
+    """
+    TimestampParser parses the fixed RFC3339 format used by Oanda
+    (e.g. 2017-01-01T15:00:01.000100000Z) directly into nanoseconds since
+    epoch (UTC). Consecutive prices almost always share the date, so the
+    epoch of the last parsed date prefix is cached and only the time part is
+    parsed for them. Timestamps without a time zone are taken as UTC.
+    """
+
+    EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+    NUMBER_OF_NANOSECONDS_IN_DAY = 24 * 60 * 60 * TimeFrame.NUMBER_OF_NANOSECONDS_IN_SECOND
+    DIGITS = '0123456789'
+
+    def __init__(self) -> None:
+        # The prefix and its epoch are replaced together, so the cache can be shared by threads
+        self.cached_date = (None, None)
+
+    def parse_to_epoch(self, value: str) -> int:
+        if len(value) < 19 or value[4] != '-' or value[7] != '-' or value[10] not in 'T ' or value[13] != ':' or \
+                value[16] != ':':
+            raise Exception('Invalid RFC3339 timestamp: {}'.format(value))
+
+        date_prefix, date_epoch = self.cached_date
+
+        if date_prefix != value[:10]:
+            date_epoch = self._parse_date(value)
+            self.cached_date = (value[:10], date_epoch)
+
+        seconds = int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19])
+
+        return date_epoch + seconds * TimeFrame.NUMBER_OF_NANOSECONDS_IN_SECOND + self._parse_rest(value)
+
+    def parse_to_datetime(self, value: str) -> datetime:
+        """
+        Returns an aware UTC datetime when the timestamp has a time zone, a naive UTC datetime otherwise.
+        """
+        tzinfo = timezone.utc if self.has_timezone(value) else None
+
+        return TimeFrame.epoch_to_datetime(self.parse_to_epoch(value), tzinfo)
+
+    @staticmethod
+    def has_timezone(value: str) -> bool:
+        return value[-1] in 'Zz' or (len(value) > 19 and value[-6] in '+-')
+
+    def _parse_date(self, value: str) -> int:
+        try:
+            day = date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+        except ValueError:
+            raise Exception('Invalid RFC3339 timestamp: {}'.format(value))
+
+        return (day.toordinal() - self.EPOCH_ORDINAL) * self.NUMBER_OF_NANOSECONDS_IN_DAY
+
+    def _parse_rest(self, value: str) -> int:
+        """
+        Returns the fraction of the second minus the time zone offset, in nanoseconds.
+        """
+        position = 19
+        nanoseconds = 0
+
+        if position < len(value) and value[position] == '.':
+            fraction_end = position + 1
+            while fraction_end < len(value) and value[fraction_end] in self.DIGITS:
+                fraction_end += 1
+
+            fraction = value[position + 1:fraction_end]
+            if fraction == '':
+                raise Exception('Invalid RFC3339 timestamp: {}'.format(value))
+
+            nanoseconds = int(fraction[:9].ljust(9, '0'))
+            position = fraction_end
+
+        zone = value[position:]
+
+        if zone in ('', 'Z', 'z'):
+            return nanoseconds
+
+        if len(zone) != 6 or zone[0] not in '+-' or zone[3] != ':':
+            raise Exception('Invalid RFC3339 timestamp: {}'.format(value))
+
+        offset = (int(zone[1:3]) * 3600 + int(zone[4:6]) * 60) * TimeFrame.NUMBER_OF_NANOSECONDS_IN_SECOND
+
+        return nanoseconds - offset if zone[0] == '+' else nanoseconds + offset
@@ -7,11 +7,17 @@ from executionhandlers.execution_handler_factory import ExecutionHandlerFactory
 from strategies.eurusd_daily_forecast import EurUsdDailyForecastStrategy
 from positionsizehandlers.fixed_position_size import FixedPositionSize
 from loggers.text_logger import TextLogger
-import csv, os
-import itertools
-import numpy as np
+import os
+import functools
 from datahandlers.data_handler_factory import DataHandlerFactory
 from core.configuration import Configuration
+from core.parameter_sweep import ParameterSweep
+from core.sweep_context import SweepContext
+from core.search_optimizers import ParameterSpace
+from core.search_optimizers import SearchOptimizerFactory
+from core.pruning import MaxDrawdownRule
+from core.pruning import MinSharpeRatioRule
+from core.pruning import MinTotalReturnRule
 import argparser_tools.basic
 import argparser_tools.optimization
 
@@ -23,6 +29,9 @@ def get_argument_parser():
     parser = argparser_tools.basic.with_backtest_arguments(parser)
     parser = argparser_tools.optimization.with_sma_short_and_long(parser)
     parser = argparser_tools.optimization.with_sl_and_tp(parser)
+    parser = argparser_tools.optimization.with_sweep_arguments(parser)
+    parser = argparser_tools.optimization.with_search_arguments(parser)
+    parser = argparser_tools.optimization.with_pruning_arguments(parser)
 
     parser.add_argument('--trained_model_file', type=argparser_tools.basic.existing_file)
 
@@ -33,73 +42,79 @@ def main():
 
     args_namespace = get_argument_parser().parse_args()
 
-    heartbeat = 0
-
-    csv_file = open('{}/optimization.csv'.format(args_namespace.output_directory), 'wb')
-    csv_file_writer = csv.writer(csv_file, delimiter=',')
-    csv_file_writer.writerow(['SL', 'TP', 'SMA_short', 'SMA_long', 'Total Return',
-                              'Sharpe Ratio', 'Max Drawdown', 'Drawdown Duration', 'Number of trades'])
-
-    values_to_try = [
+    parameter_space = ParameterSpace([
         range(args_namespace.sl_min, args_namespace.sl_max + 1, args_namespace.sl_step),
         range(args_namespace.tp_min, args_namespace.tp_max + 1, args_namespace.tp_step),
         range(args_namespace.short_window_min, args_namespace.short_window_max + 1, args_namespace.short_window_step),
         range(args_namespace.long_window_min, args_namespace.long_window_max + 1, args_namespace.long_window_step),
-    ]
-
-    total_test_to_run = np.product([len(data) for data in values_to_try])
-    print('Total number of tests to run: %d' % total_test_to_run)
-
-    for parameters in itertools.product(*values_to_try):
-        run_and_log_optimization_instance(csv_file, csv_file_writer, heartbeat, args_namespace, parameters[0], parameters[1],
-                                          parameters[2], parameters[3])
+    ])
+
+    search_optimizer = SearchOptimizerFactory.create(args_namespace.search, parameter_space, args_namespace.runs,
+                                                     args_namespace.seed)
+
+    # Bars and the model are loaded once and shared by all backtests of the sweep
+    trained_model = None
+    if args_namespace.trained_model_file is not None:
+        trained_model = EurUsdDailyForecastStrategy.load_model(args_namespace.trained_model_file)
+
+    sweep_context = SweepContext.create(create_configuration(args_namespace), args_namespace.symbols, trained_model)
+
+    parameter_sweep = ParameterSweep(
+        functools.partial(run_optimization_instance, args_namespace),
+        ['SL', 'TP', 'SMA_short', 'SMA_long', 'Total Return', 'Sharpe Ratio', 'Max Drawdown', 'Drawdown Duration',
+         'Number of trades', ParameterSweep.PRUNED_COLUMN],
+        os.path.join(args_namespace.output_directory, 'optimization.csv'),
+        os.path.join(args_namespace.output_directory, 'optimization_checkpoint.txt'),
+        args_namespace.workers,
+        SweepContext.activate,
+        (sweep_context,)
+    )
 
-    csv_file.close()
+    try:
+        parameter_sweep.run_search(search_optimizer, args_namespace.objective, args_namespace.resume,
+                                   args_namespace.time_budget)
+    finally:
+        sweep_context.close()
 
 
-def run_and_log_optimization_instance(csv_file, csv_file_writer, heartbeat, args_namespace, sl, tp, short_window,
-                                      long_window):
-    events_log_file = '{}/events_{}_{}_{}_{}.log'.format(args_namespace.output_directory, sl, tp, short_window,
-                                                         long_window)
+def run_optimization_instance(args_namespace, parameters, history_fraction=1.0):
+    sl, tp, short_window, long_window = parameters
+    heartbeat = 0
 
-    equity_filename = 'equity_{}_{}_{}_{}.csv'.format(sl, tp, short_window, long_window)
+    # Instances run in parallel (the same parameters on several fractions of history too), so every one
+    # needs its own files
+    suffix = '{}_{}_{}_{}_{}'.format(sl, tp, short_window, long_window, history_fraction)
 
-    print('Running backtest for: SL=%d, TP=%d, SMA_short=%d, SMA_long=%d' % (sl, tp, short_window, long_window))
+    events_log_file = '{}/events_{}.log'.format(args_namespace.output_directory, suffix)
+    equity_filename = 'equity_{}.csv'.format(suffix)
+    trades_filename = 'trades_{}.csv'.format(suffix)
 
     stats = run_backtest_instance(args_namespace, events_log_file, heartbeat, sl, tp, short_window, long_window,
-                                  equity_filename, args_namespace.trained_model_file)
+                                  equity_filename, args_namespace.trained_model_file, trades_filename,
+                                  history_fraction)
 
     files_to_remove = [
         events_log_file,
-        '{}/{}'.format(args_namespace.output_directory, equity_filename)
+        '{}/{}'.format(args_namespace.output_directory, equity_filename),
+        '{}/{}'.format(args_namespace.output_directory, trades_filename)
     ]
 
     for file_name in files_to_remove:
         if os.path.isfile(file_name):
             os.remove(file_name)
 
-    csv_file_writer.writerow(
-        [
-            sl,
-            tp,
-            short_window,
-            long_window,
-            stats.get_total_return(),
-            stats.get_sharpe_ratio(),
-            stats.get_max_drawdown(),
-            stats.get_drawdown_duration(),
-            stats.get_number_of_trades()
-        ]
-    )
-    csv_file.flush()
-
-    print('')
+    return [
+        stats.get_total_return(),
+        stats.get_sharpe_ratio(),
+        stats.get_max_drawdown(),
+        stats.get_drawdown_duration(),
+        stats.get_number_of_trades(),
+        stats.get_pruned_reason() or ''
+    ]
 
 
 def run_backtest_instance(args_namespace, events_log_file, heartbeat, sl, tp, short_window, long_window, equity_filename,
-                          trained_model_file):
-
-    trades_filename = 'trades.csv'
+                          trained_model_file, trades_filename='trades.csv', history_fraction=1.0):
 
     strategy_params = dict(
         stop_loss_pips=sl,
@@ -109,9 +124,16 @@ def run_backtest_instance(args_namespace, events_log_file, heartbeat, sl, tp, sh
         sma_long_period=long_window
     )
 
-    configuration = Configuration(data_handler_name=HistoricCSVDataHandler,
-                                  execution_handler_name=SimulatedExecutionHandler)
-    configuration.set_option(Configuration.OPTION_CSV_DIR, args_namespace.data_directory)
+    sweep_context = SweepContext.get_active()
+
+    if sweep_context is not None:
+        configuration = sweep_context.create_configuration()
+        strategy_params['trained_model'] = sweep_context.get_model()
+    else:
+        configuration = create_configuration(args_namespace)
+
+    if history_fraction < 1.0:
+        configuration.set_option(Configuration.OPTION_HISTORY_FRACTION, history_fraction)
 
     backtest = Backtest(
         args_namespace.output_directory,
@@ -129,12 +151,42 @@ def run_backtest_instance(args_namespace, events_log_file, heartbeat, sl, tp, sh
         [Backtest.LOG_TYPE_EVENTS],
         strategy_params,
         equity_filename,
-        trades_filename
+        trades_filename,
+        pruning_rules=create_pruning_rules(args_namespace),
+        status_stream=None
     )
     backtest.run()
 
     return backtest.stats
 
 
+def create_pruning_rules(args_namespace) -> list:
+    pruning_rules = []
+
+    if args_namespace.prune_max_drawdown is not None:
+        pruning_rules.append(MaxDrawdownRule(args_namespace.prune_max_drawdown, args_namespace.prune_after_bars))
+
+    if args_namespace.prune_min_sharpe_ratio is not None:
+        pruning_rules.append(MinSharpeRatioRule(args_namespace.prune_min_sharpe_ratio,
+                                                args_namespace.prune_after_bars))
+
+    if args_namespace.prune_min_total_return is not None:
+        pruning_rules.append(MinTotalReturnRule(args_namespace.prune_min_total_return,
+                                                args_namespace.prune_after_bars))
+
+    return pruning_rules
+
+
+def create_configuration(args_namespace) -> Configuration:
+    configuration = Configuration(data_handler_name=HistoricCSVDataHandler,
+                                  execution_handler_name=SimulatedExecutionHandler)
+    configuration.set_option(Configuration.OPTION_CSV_DIR, args_namespace.data_directory)
+
+    if args_namespace.csv_cache_dir is not None:
+        configuration.set_option(Configuration.OPTION_CSV_CACHE_DIR, args_namespace.csv_cache_dir)
+
+    return configuration
+
+
 if __name__ == "__main__":
     main()
@@ -7,6 +7,7 @@ import argparser_tools.basic
 from typing import Dict
 from datahandlers.data_handler import DataHandler
 from core.portfolio import Portfolio
+from events.event_kind import EventKind
 
 try:
     import Queue as queue
@@ -45,7 +46,7 @@ class DebugTradingStrategy(Strategy):
         return bought
 
     def calculate_signals(self, event):
-        if event.type == 'MARKET':
+        if event.kind == EventKind.MARKET:
             symbol = event.symbol
 
             if not self.bars.has_some_bars(symbol):
@@ -5,7 +5,6 @@ import os.path
 import csv
 
 import pandas as pd
-from sklearn.externals import joblib
 from sklearn.discriminant_analysis import QuadraticDiscriminantAnalysis
 from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
 from sklearn.linear_model import LogisticRegression
@@ -16,10 +15,13 @@ from strategies.daily_forecast.optimization_and_validation.train_test_split impo
 from events.signal_event import SignalEvent
 from strategies.strategy import Strategy
 from machine_learning.lagged_series import create_lagged_series
+from machine_learning.model_registry import ModelRegistry
 from core.portfolio import Portfolio
 from datahandlers.data_handler import DataHandler
+from datahandlers.indicators import SimpleMovingAverage
 import argparser_tools.basic
 from events.event import Event
+from events.event_kind import EventKind
 from typing import Dict
 
 import numpy as np
@@ -33,8 +35,10 @@ except ImportError:
 class EurUsdDailyForecastStrategy(Strategy):
     def __init__(self, bars: DataHandler, portfolio: Portfolio, events_per_symbol: Dict[str, queue.Queue],
                  trained_model_file=None, train_data=None, model_output_file=None, model_start_date=None,
-                 stop_loss_pips=None, take_profit_pips=None, sma_short_period=None, sma_long_period=None):
+                 stop_loss_pips=None, take_profit_pips=None, sma_short_period=None, sma_long_period=None,
+                 trained_model=None):
         """
+        trained_model is an already loaded model (see load_model), it is used instead of trained_model_file.
 
         :type bars: DataHandler
         :type portfolio: Portfolio
@@ -47,6 +51,7 @@ class EurUsdDailyForecastStrategy(Strategy):
         :type take_profit_pips: int
         :type sma_short_period: int
         :type sma_long_period: int
+        :type trained_model: object
         """
         self.bars = bars
         self.symbol_list = self.bars.get_symbol_list()
@@ -66,10 +71,13 @@ class EurUsdDailyForecastStrategy(Strategy):
         self.train_data = train_data
         self.model_output_directory = model_output_file
 
-        if trained_model_file is None and train_data is None:
-            raise Exception('Either trained_model_file or train_data need to be defined')
+        if trained_model_file is None and train_data is None and trained_model is None:
+            raise Exception('Either trained_model_file, trained_model or train_data need to be defined')
 
-        if self.train_data is not None:
+        if trained_model is not None:
+            self.model = trained_model
+
+        elif self.train_data is not None:
 
             if model_start_date is None:
                 raise Exception('You need to define model_start_date to train model')
@@ -79,7 +87,11 @@ class EurUsdDailyForecastStrategy(Strategy):
             self.model = self.create_symbol_forecast_model(self.train_data, self.model_start_date)
 
         elif self.trained_model is not None:
-            self.model = joblib.load(self.trained_model)
+            self.model = self.load_model(self.trained_model)
+
+    @staticmethod
+    def load_model(trained_model_file):
+        return ModelRegistry.get_default().load(trained_model_file)
 
     def _calculate_initial_bought(self):
         bought = {}
@@ -176,7 +188,7 @@ class EurUsdDailyForecastStrategy(Strategy):
         symbol = self.symbol_list[0]
         datetime_now = self.datetime_now
 
-        if event.type == 'MARKET' and (symbol == 'EUR_USD' or symbol == 'eurusd'):
+        if event.kind == EventKind.MARKET and (symbol == 'EUR_USD' or symbol == 'eurusd'):
 
             if self.portfolio.current_positions[symbol] == 0:
                 self.bought[symbol] = 'OUT'
@@ -205,11 +217,10 @@ class EurUsdDailyForecastStrategy(Strategy):
                 sma_enabled = self.sma_short_period > 0 and self.sma_long_period > 0
 
                 if sma_enabled:
+                    indicators = self.bars.get_indicators()
 
-                    bars = self.bars.get_latest_bars_values(symbol, 'close_bid', N=max_sma_period)
-
-                    sma_short = self.calculate_sma(self.sma_short_period, bars)
-                    sma_long = self.calculate_sma(self.sma_long_period, bars)
+                    sma_short = indicators.get(symbol, SimpleMovingAverage, self.sma_short_period).get_value()
+                    sma_long = indicators.get(symbol, SimpleMovingAverage, self.sma_long_period).get_value()
                 else:
                     sma_short = 0
                     sma_long = 0
@@ -225,6 +236,10 @@ class EurUsdDailyForecastStrategy(Strategy):
 
         sma_enabled = self.sma_short_period > 0 and self.sma_long_period > 0
 
+        # The SMAs are not ready while missing values (e.g. missing prices) are in their periods
+        if sma_enabled and (sma_short is None or sma_long is None):
+            return False
+
         if current_position is None:
             if prediction > 0 and ((sma_enabled and sma_short > sma_long) or not sma_enabled):
                 direction = 'LONG'
@@ -270,10 +285,6 @@ class EurUsdDailyForecastStrategy(Strategy):
 
         return False
 
-    @staticmethod
-    def calculate_sma(period, bars):
-        return np.mean(bars[-period:])
-
     @staticmethod
     def get_strategy_params(args_namespace):
         return dict(
@@ -5,9 +5,12 @@ import numpy as np
 import argparser_tools.basic
 from events.signal_event import SignalEvent
 from strategies.strategy import Strategy
+from strategies.vectorized_signals import VectorizedSignals
 from typing import Dict
 from datahandlers.data_handler import DataHandler
+from datahandlers.indicators import SimpleMovingAverage
 from core.portfolio import Portfolio
+from events.event_kind import EventKind
 
 try:
     import Queue as queue
@@ -50,6 +53,12 @@ class MovingAverageCrossStrategy(Strategy):
         # Set to True if a symbol is in the market
         self.bought = self._calculate_initial_bought()
 
+        # The short SMA is taken from at most long_window bars
+        indicators = self.bars.get_indicators()
+        self.short_smas = dict((s, indicators.get(s, SimpleMovingAverage, min(short_window, long_window)))
+                               for s in self.symbol_list)
+        self.long_smas = dict((s, indicators.get(s, SimpleMovingAverage, long_window)) for s in self.symbol_list)
+
     def _calculate_initial_bought(self):
         """
         Adds keys to the bought dictionary for all symbols
@@ -69,22 +78,20 @@ class MovingAverageCrossStrategy(Strategy):
         Parameters
         event - A MarketEvent object.
         """
-        if event.type == 'MARKET':
+        if event.kind == EventKind.MARKET:
             s = event.symbol
 
             if self.portfolio.current_positions[s] == 0:
                 self.bought[s] = 'OUT'
 
             if self.bars.get_number_of_bars(s) >= max(self.long_window, self.short_window):
-                bars = self.bars.get_latest_bars_values(
-                    s, 'close_bid', N=self.long_window
-                )
                 bar_date = self.bars.get_latest_bar_datetime(s)
                 bar_price = self.bars.get_latest_bar_value(s, 'close_bid')
 
-                if bars is not None and bars != []:
-                    short_sma = np.mean(bars[-self.short_window:])
-                    long_sma = np.mean(bars[-self.long_window:])
+                short_sma = self.short_smas[s].get_value()
+                long_sma = self.long_smas[s].get_value()
+
+                if short_sma is not None and long_sma is not None:
 
                     symbol = s
                     dt = datetime.datetime.utcnow()
@@ -125,6 +132,68 @@ class MovingAverageCrossStrategy(Strategy):
                         self.events_per_symbol[symbol].put(signal)
                         self.bought[s] = 'OUT'
 
+    def calculate_signals_vectorized(self, symbol, bars):
+        """
+        Generates the same signals as calculate_signals for all bars of symbol at once.
+        """
+        close_bid = bars['close_bid']
+        window = max(self.long_window, self.short_window)
+        short_window = min(self.short_window, self.long_window)
+
+        # Direction of the cross (1 short SMA above long SMA, -1 below, 0 equal or unknown) of every bar
+        cross = np.zeros(len(close_bid), dtype=np.int8)
+
+        if len(close_bid) >= window:
+            windows = np.lib.stride_tricks.sliding_window_view
+            long_sma = windows(close_bid, self.long_window).mean(axis=1)[window - self.long_window:]
+            short_sma = windows(close_bid, short_window).mean(axis=1)[window - short_window:]
+
+            cross[window - 1:] = np.where(short_sma > long_sma, 1, np.where(short_sma < long_sma, -1, 0))
+
+        signals = np.zeros(len(close_bid), dtype=np.int8)
+        bars_with_cross = np.flatnonzero(cross)
+        signals[bars_with_cross] = self._create_signals_from_crosses(cross[bars_with_cross])
+
+        stop_loss = take_profit = None
+        direction = np.where(signals == VectorizedSignals.SHORT, -1.0, 1.0)
+
+        if self.stop_loss_pips is not None and self.stop_loss_pips != 0:
+            stop_loss = close_bid - direction * (self.stop_loss_pips * self.get_pip_value())
+
+        if self.take_profit_pips is not None and self.take_profit_pips != 0:
+            take_profit = close_bid + direction * (self.take_profit_pips * self.get_pip_value())
+
+        return VectorizedSignals(signals, stop_loss, take_profit)
+
+    @staticmethod
+    def _create_signals_from_crosses(crosses: np.ndarray) -> np.ndarray:
+        """
+        Replays the states of bought over the bars with a cross. The first cross enters, a change
+        of the direction exits and the cross after an exit enters again. Within a block of
+        consecutive changes exits and entries alternate, so the state is known without a loop.
+        """
+        signals = np.zeros(len(crosses), dtype=np.int8)
+
+        if len(crosses) == 0:
+            return signals
+
+        changes = np.zeros(len(crosses), dtype=bool)
+        changes[1:] = crosses[1:] != crosses[:-1]
+
+        positions = np.arange(len(crosses))
+        block_starts = changes & ~np.concatenate(([False], changes[:-1]))
+        offsets = positions - np.maximum.accumulate(np.where(block_starts, positions, 0))
+
+        exits = changes & (offsets % 2 == 0)
+        entries = changes & (offsets % 2 == 1)
+        entries[1:] |= exits[:-1] & ~changes[1:]
+        entries[0] = True
+
+        signals[entries] = crosses[entries]
+        signals[exits] = VectorizedSignals.EXIT
+
+        return signals
+
     @staticmethod
     def get_strategy_params(args_namespace):
         return dict(
@@ -11,6 +11,7 @@ import json
 from typing import Dict
 from datetime import datetime
 from pytz import timezone
+from events.event_kind import EventKind
 
 try:
     import Queue as queue
@@ -39,7 +40,7 @@ class PinBarNotificationsStrategy(Strategy):
         return bought
 
     def calculate_signals(self, event: Event):
-        if event.type == 'MARKET':
+        if event.kind == EventKind.MARKET:
             symbol = event.symbol
 
             if not self.bars.has_some_bars(symbol):
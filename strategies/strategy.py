@@ -28,6 +28,14 @@ class Strategy(object):
         """
         raise NotImplementedError("Should implement calculate_signals()")
 
+    def calculate_signals_vectorized(self, symbol, bars):
+        """
+        Calculates the signals for all bars of symbol at once (bars is a dictionary
+        of arrays of the bar fields) and returns VectorizedSignals. Strategies which
+        implement it can be run by VectorizedBacktest.
+        """
+        raise NotImplementedError("Should implement calculate_signals_vectorized()")
+
     def calculate_stop_loss_price(self, price, stop_loss_pips, direction):
         stop_loss = None
 
@@ -0,0 +1,22 @@
+import numpy as np
+from typing import Optional
+
+
+class VectorizedSignals(object):
+    """
+    VectorizedSignals are the signals of a strategy for the whole history of
+    one symbol (see Strategy.calculate_signals_vectorized) - one code per bar
+    and, for entries, the stop loss and take profit prices (NaN or None when
+    not used).
+    """
+
+    NONE = 0
+    LONG = 1
+    SHORT = -1
+    EXIT = 2
+
+    def __init__(self, signals: np.ndarray, stop_loss: Optional[np.ndarray] = None,
+                 take_profit: Optional[np.ndarray] = None) -> None:
+        self.signals = signals
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
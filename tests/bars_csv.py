@@ -0,0 +1,43 @@
+import os
+
+
+def write_bars_csv(directory: str, symbol: str, prices: list, minutes: list = None, spread: float = 0.0,
+                   low_prices: list = None) -> str:
+    """
+    Writes one minute bars of symbol from 2017-01-01 10:00 in the format read by HistoricCSVDataHandler and
+    returns the file name. The open, high, low and close of a bar are its price (the low is taken from
+    low_prices when given), the ask is the bid plus spread. A price None is written as a missing value.
+    minutes are the minutes of the bars after 10:00, one per price (all minutes from 0 when None).
+    """
+    file_name = os.path.join(directory, symbol + '.csv')
+    minutes = minutes if minutes is not None else range(len(prices))
+    low_prices = low_prices if low_prices is not None else prices
+
+    with open(file_name, 'w') as csv_file:
+        csv_file.write('EUR_USD;M1;2017-01-01T10:00:00;2017-01-01T11:00:00\n')
+        csv_file.write('time;openBid;openAsk;highBid;highAsk;lowBid;lowAsk;closeBid;closeAsk;volume\n')
+
+        for minute, price, low in zip(minutes, prices, low_prices):
+            bid = _format_price(price, 0.0)
+            ask = _format_price(price, spread)
+            low_bid = _format_price(low, 0.0)
+            low_ask = _format_price(low, spread)
+
+            csv_file.write('2017-01-01T%02d:%02d:00.000000Z;%s;%s;%s;%s;%s;%s;%s;%s;10\n' % (
+                10 + minute // 60, minute % 60, bid, ask, bid, ask, low_bid, low_ask, bid, ask))
+
+    return file_name
+
+
+def get_rising_prices(minutes: list) -> list:
+    """
+    Returns the price 1.0 + 0.1 * minute of every minute.
+    """
+    return [round(1.0 + 0.1 * minute, 1) for minute in minutes]
+
+
+def _format_price(price, spread: float) -> str:
+    if price is None:
+        return ''
+
+    return str(round(price + spread, 5)) if spread else str(price)
@@ -0,0 +1,97 @@
+import unittest
+import tempfile
+import shutil
+import io
+from core.backtest import Backtest
+from core.configuration import Configuration
+from core.deque_event_queue import DequeEventQueue
+from core.portfolio import Portfolio
+from datahandlers.data_handler_factory import DataHandlerFactory
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from executionhandlers.execution_handler_factory import ExecutionHandlerFactory
+from executionhandlers.simulated_execution import SimulatedExecutionHandler
+from tests.bars_csv import write_bars_csv
+from tests.bars_csv import get_rising_prices
+from positionsizehandlers.fixed_position_size import FixedPositionSize
+from strategies.strategy import Strategy
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class RecordingStrategy(Strategy):
+    def __init__(self, bars, portfolio, events_per_symbol, market_events):
+        self.bars = bars
+        self.market_events = market_events
+
+    def calculate_signals(self, event):
+        self.market_events.append(
+            (self.bars.get_latest_bar_datetime(event.symbol).strftime('%H:%M'), event.symbol)
+        )
+
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+
+        write_bars_csv(self.csv_dir, 'eurusd', get_rising_prices([0, 1, 2, 4]), [0, 1, 2, 4])
+        write_bars_csv(self.csv_dir, 'gbpusd', get_rising_prices([0, 1, 3, 4]), [0, 1, 3, 4])
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+        shutil.rmtree(self.output_dir)
+
+    def test_symbols_are_merged_on_one_timeline(self):
+        market_events = []
+        backtest = self._create_backtest(market_events)
+
+        backtest._run_timeline(['eurusd', 'gbpusd'])
+
+        # The first bar is skipped by the CSV format, missing bars are padded forward
+        self.assertEqual([
+            ('10:01', 'eurusd'), ('10:01', 'gbpusd'),
+            ('10:02', 'eurusd'), ('10:02', 'gbpusd'),
+            ('10:03', 'eurusd'), ('10:03', 'gbpusd'),
+            ('10:04', 'eurusd'), ('10:04', 'gbpusd'),
+        ], market_events)
+        self.assertFalse(backtest.data_handler.backtest_should_continue('eurusd'))
+        self.assertFalse(backtest.data_handler.backtest_should_continue('gbpusd'))
+
+    def test_event_queue_class_does_not_change_the_run(self):
+        market_events_per_queue_class = []
+
+        for event_queue_class in [queue.Queue, DequeEventQueue]:
+            market_events = []
+            self._create_backtest(market_events, event_queue_class)._run_timeline(['eurusd', 'gbpusd'])
+
+            market_events_per_queue_class.append(market_events)
+
+        self.assertEqual(market_events_per_queue_class[0], market_events_per_queue_class[1])
+
+    def test_status_is_written_only_to_a_given_stream(self):
+        stream = io.StringIO()
+        backtest = self._create_backtest([], status_stream=stream)
+        backtest.run()
+
+        self.assertTrue(stream.getvalue().startswith('Running backtest'))
+        self.assertIsNone(self._create_backtest([], status_stream=None).status_reporter)
+
+    def _create_backtest(self, market_events: list, event_queue_class: type = DequeEventQueue,
+                         **kwargs) -> Backtest:
+        configuration = Configuration(data_handler_name=HistoricCSVDataHandler,
+                                      execution_handler_name=SimulatedExecutionHandler)
+        configuration.set_option(Configuration.OPTION_CSV_DIR, self.csv_dir)
+
+        return Backtest(
+            self.output_dir, ['eurusd', 'gbpusd'], 10000, 0, None, configuration, DataHandlerFactory(),
+            ExecutionHandlerFactory(), Portfolio, RecordingStrategy, FixedPositionSize(0.5), None, [],
+            dict(market_events=market_events), 'equity.csv', 'trades.csv', event_queue_class, **kwargs
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from core.deque_event_queue import DequeEventQueue
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class TestDequeEventQueue(unittest.TestCase):
+
+    def test_events_are_returned_in_order(self):
+        event_queue = DequeEventQueue()
+
+        self.assertTrue(event_queue.empty())
+
+        event_queue.put('MARKET')
+        event_queue.put('SIGNAL')
+
+        self.assertEqual(2, event_queue.qsize())
+        self.assertEqual('MARKET', event_queue.get(False))
+        self.assertEqual('SIGNAL', event_queue.get())
+        self.assertTrue(event_queue.empty())
+
+    def test_get_from_empty_queue_raises_empty(self):
+        with self.assertRaises(queue.Empty):
+            DequeEventQueue().get(False)
+
+
+if __name__ == '__main__':
+    unittest.main()
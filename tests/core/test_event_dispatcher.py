@@ -0,0 +1,42 @@
+import unittest
+from enum import IntEnum
+from core.event_dispatcher import EventDispatcher
+from events.event import Event
+from events.event_kind import EventKind
+from events.market_event import MarketEvent
+
+
+class CustomEventKind(IntEnum):
+    HEARTBEAT = 100
+
+
+class HeartbeatEvent(Event):
+    def __init__(self, symbol: str):
+        super().__init__(CustomEventKind.HEARTBEAT, symbol)
+
+    def get_as_string(self) -> str:
+        return 'Heartbeat: %s' % self.symbol
+
+
+class TestEventDispatcher(unittest.TestCase):
+
+    def test_events_are_dispatched_by_kind(self):
+        handled_events = []
+
+        event_dispatcher = EventDispatcher()
+        event_dispatcher.register(EventKind.MARKET, lambda event: handled_events.append(('market', event.symbol)))
+        event_dispatcher.register(CustomEventKind.HEARTBEAT,
+                                  lambda event: handled_events.append(('heartbeat', event.symbol)))
+
+        event_dispatcher.dispatch(MarketEvent('eurusd'))
+        event_dispatcher.dispatch(HeartbeatEvent('gbpusd'))
+
+        self.assertEqual([('market', 'eurusd'), ('heartbeat', 'gbpusd')], handled_events)
+        self.assertEqual('HEARTBEAT', HeartbeatEvent('gbpusd').type)
+
+    def test_events_without_handler_are_ignored(self):
+        EventDispatcher().dispatch(MarketEvent('eurusd'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import datetime
+import numpy as np
+import pandas as pd
+from core.ledger import Ledger
+
+
+class TestLedger(unittest.TestCase):
+
+    def test_append_grows_the_capacity(self):
+        ledger = Ledger(['eurusd', 'total'], capacity=2)
+
+        for i in range(5):
+            ledger.append(pd.Timestamp('2017-01-01 10:00') + pd.Timedelta(minutes=i), [i, 10.0 * i])
+
+        self.assertEqual(5, ledger.get_length())
+        self.assertEqual(8, len(ledger.datetimes))
+        np.testing.assert_array_equal([0, 10, 20, 30, 40], ledger.get_column('total'))
+        self.assertEqual(dict(eurusd=4.0, total=40.0, datetime=pd.Timestamp('2017-01-01 10:04')), ledger.get_row(4))
+
+    def test_to_dataframe(self):
+        ledger = Ledger(['total'])
+        ledger.append(None, [1.0])
+        ledger.append(pd.Timestamp('2017-01-01 10:00', tz='Europe/Prague'), [2.0])
+
+        frame = ledger.to_dataframe()
+
+        self.assertEqual([1.0, 2.0], frame['total'].tolist())
+        self.assertTrue(pd.isnull(frame.index[0]))
+        self.assertEqual(pd.Timestamp('2017-01-01 10:00', tz='Europe/Prague'), frame.index[1])
+        self.assertIsNone(ledger.get_row(0)['datetime'])
+
+    def test_append_timestamp(self):
+        ledger = Ledger(['total'])
+        ledger.append(datetime.datetime(2017, 1, 1, 10, 0, 0, 500), [1.0])
+        ledger.append_timestamp(pd.Timestamp('2017-01-01 10:01', tz='UTC').value, [2.0], 'Europe/Prague')
+
+        self.assertEqual([pd.Timestamp('2017-01-01 10:00:00.000500').value, pd.Timestamp('2017-01-01 10:01').value],
+                         ledger.get_datetimes().tolist())
+        self.assertEqual(pd.Timestamp('2017-01-01 11:01', tz='Europe/Prague'), ledger.get_row(1)['datetime'])
+
+    def test_append_rows(self):
+        ledger = Ledger(['eurusd'], capacity=1)
+        ledger.append(None, [0.0])
+        ledger.append_rows(np.array([1, 2, 3]), np.array([[1.0], [2.0], [3.0]]))
+
+        np.testing.assert_array_equal([Ledger.NAT, 1, 2, 3], ledger.get_datetimes())
+        np.testing.assert_array_equal([0, 1, 2, 3], ledger.get_column('eurusd'))
+
+
+if __name__ == '__main__':
+    unittest.main()
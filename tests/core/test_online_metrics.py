@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+import pandas as pd
+from core.online_metrics import OnlineMetrics
+from core.perfomance import create_sharpe_ratio, create_drawdowns
+
+
+class TestOnlineMetrics(unittest.TestCase):
+
+    def test_metrics_match_the_equity_curve(self):
+        random = np.random.RandomState(3)
+        totals = 10000 * np.cumprod(1 + random.normal(0, 0.01, 300))
+
+        metrics = OnlineMetrics(10000, periods=252)
+        for total in totals:
+            metrics.update_equity(total)
+
+        curve = pd.DataFrame(dict(total=np.concatenate(([10000], totals))))
+        curve['returns'] = curve['total'].pct_change()
+        curve['equity_curve'] = (1.0 + curve['returns']).cumprod()
+        drawdown, max_drawdown, duration = create_drawdowns(curve['equity_curve'])
+
+        self.assertAlmostEqual(create_sharpe_ratio(curve['returns'], periods=252), metrics.get_sharpe_ratio())
+        self.assertAlmostEqual((curve['equity_curve'].iloc[-1] - 1.0) * 100.0, metrics.get_total_return())
+        self.assertAlmostEqual(max_drawdown * 100.0, metrics.get_max_drawdown())
+        self.assertEqual(duration, metrics.get_drawdown_duration())
+
+        returns = curve['returns'].values[1:]
+        downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+        self.assertAlmostEqual(np.sqrt(252) * np.mean(returns) / downside, metrics.get_sortino_ratio())
+
+    def test_closed_trades(self):
+        metrics = OnlineMetrics(10000)
+
+        self.assertEqual(0, metrics.get_win_rate())
+        self.assertEqual(0, metrics.get_profit_factor())
+
+        for profit in [30.0, -10.0, 20.0, -15.0]:
+            metrics.update_closed_trade(profit)
+
+        self.assertEqual(4, metrics.get_number_of_closed_trades())
+        self.assertEqual(50.0, metrics.get_win_rate())
+        self.assertEqual(2.0, metrics.get_profit_factor())
+
+    def test_zero_total_has_no_returns(self):
+        metrics = OnlineMetrics(0)
+        metrics.update_equity(0)
+        metrics.update_equity(0)
+
+        self.assertEqual(0, metrics.get_sharpe_ratio())
+        self.assertEqual(0, metrics.get_total_return())
+
+    def test_format_metrics_of_a_copy(self):
+        metrics = OnlineMetrics(10000)
+        metrics.update_equity(10000)
+        metrics.update_equity(10100)
+        metrics.update_closed_trade(100.0)
+
+        copy = metrics.get_as_dict()
+        expected = metrics.get_as_string()
+
+        metrics.update_equity(9000)
+        metrics.update_closed_trade(-1100.0)
+
+        self.assertEqual(expected, OnlineMetrics.format_metrics(copy))
+        self.assertIn('Total Return: 1.00%', expected)
+        self.assertIn('Closed trades: 1', expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
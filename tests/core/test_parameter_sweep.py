@@ -0,0 +1,87 @@
+import unittest
+import tempfile
+import shutil
+import os
+import csv
+import io
+from contextlib import redirect_stdout
+from core.parameter_sweep import ParameterSweep
+from core.search_optimizers import ParameterSpace
+from core.search_optimizers import SuccessiveHalving
+
+
+def run_instance(parameters):
+    return [parameters[0] * parameters[1]]
+
+
+def run_instance_on_history(parameters, history_fraction=1.0):
+    return [parameters[0] * parameters[1] * history_fraction]
+
+
+class TestParameterSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.csv_file_name = os.path.join(self.output_dir, 'optimization.csv')
+        self.checkpoint_file_name = os.path.join(self.output_dir, 'checkpoint.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_run_writes_all_rows(self):
+        self._create_sweep().run([(1, 2), (3, 4), (5, 6)])
+
+        self.assertEqual([['A', 'B', 'Product'], ['1', '2', '2'], ['3', '4', '12'], ['5', '6', '30']],
+                         self._read_rows())
+
+    def test_resume_skips_finished_runs(self):
+        with open(self.csv_file_name, 'w', newline='') as csv_file:
+            csv_file.write('A,B,Product\n1,2,-1\n3,4,-1\n')
+
+        # The second run was interrupted before it was recorded, the last line is not complete
+        with open(self.checkpoint_file_name, 'w') as checkpoint_file:
+            checkpoint_file.write('[1, 2]\n[5, ')
+
+        self._create_sweep().run([(1, 2), (3, 4), (5, 6)], resume=True)
+
+        self.assertEqual([['A', 'B', 'Product'], ['1', '2', '-1'], ['3', '4', '12'], ['5', '6', '30']],
+                         self._read_rows())
+
+        with open(self.checkpoint_file_name) as checkpoint_file:
+            self.assertEqual(3, len(checkpoint_file.readlines()))
+
+    def test_run_search_writes_only_runs_on_whole_history(self):
+        sweep = ParameterSweep(run_instance_on_history, ['A', 'B', 'Product'], self.csv_file_name,
+                               self.checkpoint_file_name, 2)
+        sweep.run_search(SuccessiveHalving(ParameterSpace([range(1, 4), range(1, 4)]), 9, 3, 1), 'Product')
+
+        # The candidate with the highest product on the shortest prefix is promoted to the last rung
+        self.assertEqual([['A', 'B', 'Product'], ['3', '3', '9.0']], self._read_rows())
+
+    def test_progress_counts_runs_on_part_of_history(self):
+        sweep = ParameterSweep(run_instance_on_history, ['A', 'B', 'Product'], self.csv_file_name,
+                               self.checkpoint_file_name, 2)
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            sweep.run_search(SuccessiveHalving(ParameterSpace([range(1, 4), range(1, 4)]), 9, 3, 1), 'Product')
+
+        progress = [line for line in output.getvalue().splitlines() if line.startswith('Finished')]
+
+        # 9 runs on a ninth, 3 on a third and 1 on the whole history, each rung is a third of the budget
+        self.assertEqual(13, len(progress))
+        self.assertTrue(progress[8].startswith('Finished 9 tests (33.3%)'))
+        self.assertTrue(progress[-1].startswith('Finished 13 tests (100.0%)'))
+
+    def _create_sweep(self) -> ParameterSweep:
+        return ParameterSweep(run_instance, ['A', 'B', 'Product'], self.csv_file_name, self.checkpoint_file_name, 2)
+
+    def _read_rows(self) -> list:
+        with open(self.csv_file_name, newline='') as csv_file:
+            rows = list(csv.reader(csv_file))
+
+        return rows[:1] + sorted(rows[1:], key=lambda row: int(row[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+import pandas as pd
+from core.perfomance import create_drawdowns, DrawdownAccumulator
+
+
+class TestPerfomance(unittest.TestCase):
+
+    def test_create_drawdowns_matches_the_loop(self):
+        random = np.random.RandomState(7)
+        pnl = pd.Series(np.cumprod(1 + random.normal(0, 0.01, 500)),
+                        index=pd.date_range('2017-01-01', periods=500, freq='min'))
+        pnl.iloc[0] = np.nan
+
+        drawdown, max_drawdown, max_duration = create_drawdowns(pnl)
+        expected_drawdown, expected_duration = TestPerfomance._create_drawdowns_in_loop(pnl.fillna(0).values)
+
+        np.testing.assert_allclose(expected_drawdown, drawdown.values)
+        self.assertAlmostEqual(np.nanmax(expected_drawdown), max_drawdown)
+        self.assertEqual(np.nanmax(expected_duration), max_duration)
+        self.assertTrue(drawdown.index.equals(pnl.index))
+
+    def test_create_drawdowns_of_short_curves(self):
+        drawdown, max_drawdown, max_duration = create_drawdowns(pd.Series([np.nan]))
+
+        self.assertTrue(np.isnan(drawdown.iloc[0]))
+        self.assertTrue(np.isnan(max_drawdown))
+
+        drawdown, max_drawdown, max_duration = create_drawdowns(pd.Series([np.nan, 1.0, 0.5, 0.75, 1.25]))
+
+        np.testing.assert_allclose([np.nan, 0, 0.5, 0.25, 0], drawdown.values)
+        self.assertEqual(0.5, max_drawdown)
+        self.assertEqual(2, max_duration)
+
+    def test_accumulator_matches_create_drawdowns(self):
+        values = [np.nan, 1.0, 1.1, 1.05, 0.9, 1.2, 1.15, 1.15]
+        drawdown, max_drawdown, max_duration = create_drawdowns(pd.Series(values))
+
+        accumulator = DrawdownAccumulator()
+        for t, value in enumerate(values[1:], 1):
+            accumulator.update(value)
+
+            self.assertAlmostEqual(drawdown.iloc[t], accumulator.get_drawdown())
+
+        self.assertAlmostEqual(max_drawdown, accumulator.get_max_drawdown())
+        self.assertEqual(max_duration, accumulator.get_max_duration())
+        self.assertEqual(2, accumulator.get_duration())
+
+    @staticmethod
+    def _create_drawdowns_in_loop(pnl: np.ndarray) -> tuple:
+        hwm = [0]
+        drawdown = np.full(len(pnl), np.nan)
+        duration = np.full(len(pnl), np.nan)
+        duration[0] = 0
+
+        for t in range(1, len(pnl)):
+            hwm.append(max(hwm[t - 1], pnl[t]))
+            drawdown[t] = hwm[t] - pnl[t]
+            duration[t] = 0 if drawdown[t] == 0 else duration[t - 1] + 1
+
+        return drawdown, duration
+
+
+if __name__ == '__main__':
+    unittest.main()
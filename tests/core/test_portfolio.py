@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from core.portfolio import Portfolio
+from events.fill_event import FillEvent
+from positionsizehandlers.fixed_position_size import FixedPositionSize
+
+
+class FakeBars(object):
+    def __init__(self):
+        self.symbol_list = ['eurusd']
+        self.minute = 0
+
+    def has_some_bars(self, symbol):
+        return True
+
+    def get_latest_bar_datetime(self, symbol):
+        return pd.Timestamp('2017-01-01 10:00') + pd.Timedelta(minutes=self.minute)
+
+    def get_latest_bar_timestamp(self, symbol):
+        return self.get_latest_bar_datetime(symbol).value
+
+    def get_latest_bar_value(self, symbol, val_type):
+        return 1.0 + 0.1 * self.minute
+
+
+class TestPortfolio(unittest.TestCase):
+
+    def test_snapshot_every_n_bars_records_the_last_bar(self):
+        portfolio, bars = self._create_portfolio(3)
+
+        for minute in range(7):
+            bars.minute = minute
+            portfolio.update_timeindex()
+
+        portfolio.create_equity_curve_dataframe()
+
+        self.assertEqual(['10:02', '10:05', '10:06'],
+                         [d.strftime('%H:%M') for d in portfolio.equity_curve.index[1:]])
+
+    def test_snapshot_on_fills(self):
+        portfolio, bars = self._create_portfolio(Portfolio.SNAPSHOT_ON_FILLS)
+
+        for minute in range(6):
+            bars.minute = minute
+            portfolio.update_timeindex()
+
+            if minute == 1:
+                portfolio.update_fill(FillEvent(None, 'eurusd', 'FOREX', 1000, 'BUY', None, None, 1000))
+
+        portfolio.create_equity_curve_dataframe()
+
+        self.assertEqual(['10:02', '10:05'], [d.strftime('%H:%M') for d in portfolio.equity_curve.index[1:]])
+        self.assertAlmostEqual(10000 + 1000 * 0.4, portfolio.equity_curve['total'].iloc[-1])
+
+    def test_sharpe_ratio_is_annualized_by_snapshots(self):
+        every_bar, bars = self._create_portfolio(Portfolio.SNAPSHOT_EVERY_BAR)
+        every_third_bar, bars = self._create_portfolio(3)
+        on_fills, bars = self._create_portfolio(Portfolio.SNAPSHOT_ON_FILLS)
+
+        self.assertEqual(Portfolio.SHARPE_RATIO_PERIODS, every_bar.get_sharpe_ratio_periods())
+        self.assertEqual(Portfolio.SHARPE_RATIO_PERIODS / 3, every_third_bar.get_sharpe_ratio_periods())
+        self.assertIsNone(on_fills.get_sharpe_ratio_periods())
+
+        on_fills.update_fill(FillEvent(None, 'eurusd', 'FOREX', 1000, 'BUY', None, None, 1000))
+
+        for minute in range(3):
+            bars.minute = minute
+            on_fills.update_timeindex()
+
+        self.assertTrue(pd.isna(on_fills.get_online_metrics().get_sharpe_ratio()))
+
+    def test_equity_file_has_the_drawdown_of_the_filled_curve(self):
+        output_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_directory)
+
+        portfolio, bars = self._create_portfolio(Portfolio.SNAPSHOT_EVERY_BAR, output_directory)
+
+        for minute in range(5):
+            bars.minute = minute
+            portfolio.update_timeindex()
+
+            if minute == 0:
+                portfolio.update_fill(FillEvent(None, 'eurusd', 'FOREX', 1000, 'SELL', None, None, 1000))
+
+        portfolio.create_equity_curve_dataframe()
+        portfolio.output_summary_stats()
+
+        equity = pd.read_csv(os.path.join(output_directory, 'equity.csv'))
+        equity_curve = (10000 - 1000 * 0.1 * np.arange(5)) / 10000
+
+        np.testing.assert_allclose([0.0] + list(equity_curve), equity['equity_curve'].values)
+        np.testing.assert_allclose([np.nan] + list(1.0 - equity_curve), equity['drawdown'].values)
+
+    @staticmethod
+    def _create_portfolio(snapshot_frequency: int, output_directory: str = None) -> tuple:
+        bars = FakeBars()
+        portfolio = Portfolio(bars, {}, None, 10000, output_directory, 'equity.csv', 'trades.csv',
+                              FixedPositionSize(0.01), snapshot_frequency)
+
+        return portfolio, bars
+
+
+if __name__ == '__main__':
+    unittest.main()
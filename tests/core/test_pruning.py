@@ -0,0 +1,121 @@
+import unittest
+import asyncio
+import tempfile
+import shutil
+import os
+from core.backtest import Backtest
+from core.sharded_backtest import ShardedBacktest
+from core.vectorized_backtest import VectorizedBacktest
+from core.configuration import Configuration
+from core.online_metrics import OnlineMetrics
+from core.portfolio import Portfolio
+from core.pruning import MaxDrawdownRule
+from core.pruning import MinSharpeRatioRule
+from core.pruning import get_pruned_reason
+from datahandlers.data_handler_factory import DataHandlerFactory
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from executionhandlers.execution_handler_factory import ExecutionHandlerFactory
+from executionhandlers.simulated_execution import SimulatedExecutionHandler
+from positionsizehandlers.fixed_position_size import FixedPositionSize
+from events.signal_event import SignalEvent
+from strategies.strategy import Strategy
+from tests.bars_csv import write_bars_csv
+
+
+class EnterLongStrategy(Strategy):
+    def __init__(self, bars, portfolio, events_per_symbol):
+        self.bars = bars
+        self.events_per_symbol = events_per_symbol
+        self.entered = False
+
+    def calculate_signals(self, event):
+        if not self.entered:
+            bar_datetime = self.bars.get_latest_bar_datetime(event.symbol)
+            self.events_per_symbol[event.symbol].put(SignalEvent(1, event.symbol, bar_datetime, bar_datetime, 'LONG',
+                                                                 1.0))
+            self.entered = True
+
+
+class TestPruning(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+
+        # Falling prices, the long position loses on every bar
+        for symbol in ['eurusd', 'gbpusd']:
+            write_bars_csv(self.csv_dir, symbol, [round(2.0 - 0.05 * minute, 2) for minute in range(20)])
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+        shutil.rmtree(self.output_dir)
+
+    def test_rules_are_checked_after_bars(self):
+        online_metrics = OnlineMetrics(100.0)
+        online_metrics.update_equity(100.0)
+        online_metrics.update_equity(90.0)
+
+        self.assertIsNone(get_pruned_reason([MaxDrawdownRule(5.0, after_bars=10)], online_metrics, 9))
+        self.assertEqual('Max Drawdown 10.00% > 5.00% after 10 bars',
+                         get_pruned_reason([MaxDrawdownRule(5.0, after_bars=10)], online_metrics, 10))
+        self.assertIsNone(get_pruned_reason([MaxDrawdownRule(20.0), MinSharpeRatioRule(-100.0)], online_metrics, 1))
+
+    def test_backtest_stops_when_rule_is_hit(self):
+        backtest = self._create_backtest([MaxDrawdownRule(5.0, after_bars=3)])
+        backtest.run()
+
+        self.assertTrue(backtest.stats.is_pruned())
+        self.assertTrue(backtest.get_pruned_reason().startswith('Max Drawdown'))
+        self.assertLess(backtest.get_portfolio().holdings_ledger.get_length(), 20)
+        self.assertFalse(os.path.isfile(os.path.join(self.output_dir, 'equity.csv')))
+
+    def test_rules_count_bars_of_the_symbol(self):
+        backtest = self._create_backtest([MaxDrawdownRule(0.0, after_bars=5)], ['eurusd', 'gbpusd'])
+        backtest.run()
+
+        # Bars of both symbols are interleaved, the rule is checked after 5 bars of a symbol
+        self.assertEqual('after 5 bars', backtest.get_pruned_reason()[-len('after 5 bars'):])
+        self.assertEqual(5, backtest.data_handler.get_number_of_bars('eurusd'))
+        self.assertEqual(4, backtest.data_handler.get_number_of_bars('gbpusd'))
+
+    def test_rules_are_not_used_with_snapshots_on_fills(self):
+        with self.assertRaises(Exception):
+            self._create_backtest([MaxDrawdownRule(5.0)], snapshot_frequency=Portfolio.SNAPSHOT_ON_FILLS)
+
+    def test_sharded_backtest_is_pruned_by_its_symbols(self):
+        backtest = self._create_backtest([MaxDrawdownRule(5.0, after_bars=3)], ['eurusd', 'gbpusd'],
+                                         backtest_class=ShardedBacktest)
+        backtest.run()
+
+        self.assertTrue(backtest.stats.is_pruned())
+        self.assertTrue(backtest.get_pruned_reason().startswith('Max Drawdown'))
+        self.assertLess(backtest.get_portfolio().holdings_ledger.get_length(), 20)
+        self.assertFalse(os.path.isfile(os.path.join(self.output_dir, 'equity.csv')))
+
+    def test_rules_are_not_used_by_vectorized_backtest(self):
+        with self.assertRaises(Exception):
+            self._create_backtest([MaxDrawdownRule(5.0)], backtest_class=VectorizedBacktest)
+
+    def test_backtest_without_rules_runs_to_the_end(self):
+        backtest = self._create_backtest(None)
+        backtest.run()
+
+        self.assertFalse(backtest.stats.is_pruned())
+        self.assertTrue(os.path.isfile(os.path.join(self.output_dir, 'equity.csv')))
+
+    def _create_backtest(self, pruning_rules, symbol_list: list = None,
+                         snapshot_frequency: int = Portfolio.SNAPSHOT_EVERY_BAR,
+                         backtest_class: type = Backtest) -> Backtest:
+        configuration = Configuration(data_handler_name=HistoricCSVDataHandler,
+                                      execution_handler_name=SimulatedExecutionHandler)
+        configuration.set_option(Configuration.OPTION_CSV_DIR, self.csv_dir)
+
+        return backtest_class(
+            self.output_dir, symbol_list or ['eurusd'], 10000, 0, None, configuration, DataHandlerFactory(),
+            ExecutionHandlerFactory(), Portfolio, EnterLongStrategy, FixedPositionSize(5000), None, [], {},
+            'equity.csv', 'trades.csv', snapshot_frequency=snapshot_frequency, pruning_rules=pruning_rules
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from core.search_optimizers import ParameterSpace
+from core.search_optimizers import GridSearch
+from core.search_optimizers import RandomSearch
+from core.search_optimizers import SuccessiveHalving
+from core.search_optimizers import TreeParzenEstimator
+
+
+def score_of(parameters):
+    # Single maximum at (30, 70)
+    return -((parameters[0] - 30) ** 2 + (parameters[1] - 70) ** 2)
+
+
+class TestSearchOptimizers(unittest.TestCase):
+
+    def setUp(self):
+        self.space = ParameterSpace([range(0, 101, 5), range(0, 101, 5)])
+
+    def test_parameters_at_follow_product_order(self):
+        self.assertEqual([self.space.get_parameters_at(position) for position in range(self.space.get_size())],
+                         list(self.space.get_all()))
+
+    def test_grid_search_asks_all_parameters(self):
+        parameters = self._run(GridSearch(self.space.get_all()))
+
+        self.assertEqual(list(self.space.get_all()), parameters)
+
+    def test_random_search_asks_distinct_parameters(self):
+        parameters = self._run(RandomSearch(self.space, random_seed=1))
+
+        self.assertEqual(self.space.get_size(), len(set(parameters)))
+        self.assertEqual(10, len(self._run(RandomSearch(self.space, 10, random_seed=1))))
+
+    def test_successive_halving_promotes_the_best_candidates(self):
+        search_optimizer = SuccessiveHalving(self.space, 27, random_seed=1)
+        trials = []
+
+        while not search_optimizer.is_finished():
+            trial = search_optimizer.ask()
+            trials.append(trial)
+            search_optimizer.tell(trial, score_of(trial.parameters))
+
+        self.assertEqual([27, 9, 3, 1], [len([trial for trial in trials if trial.budget == budget])
+                                         for budget in [1.0 / 27, 1.0 / 9, 1.0 / 3, 1.0]])
+        self.assertAlmostEqual(sum(trial.budget for trial in trials), search_optimizer.get_total_budget())
+
+        first_rung = [trial.parameters for trial in trials if trial.budget == 1.0 / 27]
+        self.assertEqual(max(first_rung, key=score_of), trials[-1].parameters)
+
+    def test_tree_parzen_estimator_finds_better_parameters_than_random_search(self):
+        tpe_scores = []
+        random_scores = []
+
+        for seed in range(5):
+            tpe_scores.append(max(score_of(parameters) for parameters in
+                                  self._run(TreeParzenEstimator(self.space, 40, random_seed=seed))))
+            random_scores.append(max(score_of(parameters) for parameters in
+                                     self._run(RandomSearch(self.space, 40, random_seed=seed))))
+
+        self.assertGreater(sum(tpe_scores), sum(random_scores))
+
+    @staticmethod
+    def _run(search_optimizer) -> list:
+        parameters = []
+
+        while not search_optimizer.is_finished():
+            trial = search_optimizer.ask()
+            parameters.append(trial.parameters)
+            search_optimizer.tell(trial, score_of(trial.parameters))
+
+        return parameters
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import asyncio
+import tempfile
+import shutil
+from core.backtest import Backtest
+from core.sharded_backtest import ShardedBacktest
+from core.configuration import Configuration
+from core.portfolio import Portfolio
+from datahandlers.data_handler_factory import DataHandlerFactory
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from executionhandlers.execution_handler_factory import ExecutionHandlerFactory
+from executionhandlers.simulated_execution import SimulatedExecutionHandler
+from tests.bars_csv import write_bars_csv
+from tests.bars_csv import get_rising_prices
+from positionsizehandlers.fixed_position_size import FixedPositionSize
+from events.signal_event import SignalEvent
+from strategies.strategy import Strategy
+
+
+class EnterAndExitStrategy(Strategy):
+    def __init__(self, bars, portfolio, events_per_symbol, enter_at, exit_at):
+        self.bars = bars
+        self.events_per_symbol = events_per_symbol
+        self.enter_at = enter_at
+        self.exit_at = exit_at
+
+    def calculate_signals(self, event):
+        bar_datetime = self.bars.get_latest_bar_datetime(event.symbol)
+        minute = bar_datetime.strftime('%H:%M')
+        signal_type = None
+
+        if minute == self.enter_at[event.symbol]:
+            signal_type = 'LONG'
+        elif minute == self.exit_at[event.symbol]:
+            signal_type = 'EXIT'
+
+        if signal_type is not None:
+            self.events_per_symbol[event.symbol].put(
+                SignalEvent(1, event.symbol, bar_datetime, bar_datetime, signal_type, 1.0)
+            )
+
+
+class TestShardedBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+
+        write_bars_csv(self.csv_dir, 'eurusd', get_rising_prices([0, 1, 2, 4]), [0, 1, 2, 4])
+        write_bars_csv(self.csv_dir, 'gbpusd', get_rising_prices([0, 1, 3, 4]), [0, 1, 3, 4])
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+        shutil.rmtree(self.output_dir)
+
+    def test_sharded_backtest_has_the_result_of_backtest(self):
+        backtest = self._create_backtest(Backtest)
+        asyncio.new_event_loop().run_until_complete(backtest._run())
+
+        sharded_backtest = self._create_backtest(ShardedBacktest, number_of_processes=2)
+        asyncio.new_event_loop().run_until_complete(sharded_backtest._run())
+
+        portfolio = backtest.get_portfolio()
+        sharded_portfolio = sharded_backtest.get_portfolio()
+
+        self.assertAlmostEqual(portfolio.current_holdings['total'], sharded_portfolio.current_holdings['total'])
+        self.assertAlmostEqual(portfolio.holdings_ledger.get_column('total')[-1],
+                               sharded_portfolio.holdings_ledger.get_column('total')[-1])
+        portfolio.create_equity_curve_dataframe()
+        sharded_portfolio.create_equity_curve_dataframe()
+        self.assertAlmostEqual(portfolio.equity_curve['equity_curve'].iloc[-1],
+                               sharded_portfolio.equity_curve['equity_curve'].iloc[-1])
+        self.assertEqual(backtest.get_fills(), sharded_backtest.get_fills())
+        self.assertEqual(len(portfolio.trades), len(sharded_portfolio.trades))
+        self.assertEqual(['eurusd-1000', 'eurusd-1001', 'gbpusd-1000', 'gbpusd-1001'],
+                         list(sharded_portfolio.trades.keys()))
+
+        # One merged row per bar datetime after the initial row
+        self.assertEqual(['10:01', '10:02', '10:03', '10:04'],
+                         [sharded_portfolio.holdings_ledger.get_row(i)['datetime'].strftime('%H:%M')
+                          for i in range(1, sharded_portfolio.holdings_ledger.get_length())])
+        self.assertEqual(2 * 4 + 1, portfolio.holdings_ledger.get_length())
+
+    def _create_backtest(self, backtest_class: type, **kwargs) -> Backtest:
+        configuration = Configuration(data_handler_name=HistoricCSVDataHandler,
+                                      execution_handler_name=SimulatedExecutionHandler)
+        configuration.set_option(Configuration.OPTION_CSV_DIR, self.csv_dir)
+
+        strategy_params_dict = dict(
+            enter_at=dict(eurusd='10:01', gbpusd='10:02'),
+            exit_at=dict(eurusd='10:03', gbpusd='10:04')
+        )
+
+        return backtest_class(
+            self.output_dir, ['eurusd', 'gbpusd'], 10000, 0, None, configuration, DataHandlerFactory(),
+            ExecutionHandlerFactory(), Portfolio, EnterAndExitStrategy, FixedPositionSize(0.5), None, [],
+            strategy_params_dict, 'equity.csv', 'trades.csv', **kwargs
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
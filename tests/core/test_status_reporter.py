@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import shutil
+import os
+import io
+import json
+import time
+from core.status_reporter import StatusReporter
+
+
+class FakeLogger(object):
+    def __init__(self):
+        self.logs = []
+
+    def write(self, log):
+        self.logs.append(log)
+
+
+class TestStatusReporter(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.counter = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_report_writes_text_and_json(self):
+        stream = io.StringIO()
+        reporter = self._create_reporter(stream, 60)
+
+        self.counter = 5
+        reporter.report()
+
+        self.assertEqual('Counter: 5', self._read('status.txt'))
+        self.assertEqual(dict(counter=5), json.loads(self._read('status.json')))
+        self.assertEqual('Counter: 5\r', stream.getvalue())
+        self.assertEqual(['status.json', 'status.txt'], sorted(os.listdir(self.output_dir)))
+
+    def test_stop_writes_the_final_status(self):
+        reporter = self._create_reporter(None, 60)
+        reporter.start()
+
+        self.counter = 7
+        reporter.stop()
+
+        self.assertEqual('Counter: 7', self._read('status.txt'))
+        self.assertIsNone(reporter.thread)
+
+    def test_failed_reports_are_logged_and_reporting_continues(self):
+        logger = FakeLogger()
+        reporter = StatusReporter(self._create_status_or_fail, str, None, None, None, 0.01, logger)
+        reporter.start()
+
+        while self.counter < 3:
+            time.sleep(0.01)
+
+        reporter.stop()
+
+        self.assertTrue(logger.logs[0].startswith('Status report failed'))
+        self.assertIn('RuntimeError: Half updated', logger.logs[0])
+
+    def _create_status_or_fail(self) -> dict:
+        self.counter += 1
+
+        if self.counter == 1:
+            raise RuntimeError('Half updated')
+
+        return dict(counter=self.counter)
+
+    def _create_reporter(self, stream, interval: float) -> StatusReporter:
+        return StatusReporter(
+            lambda: dict(counter=self.counter), lambda status: 'Counter: {}'.format(status['counter']),
+            os.path.join(self.output_dir, 'status.txt'), os.path.join(self.output_dir, 'status.json'), stream,
+            interval
+        )
+
+    def _read(self, file_name: str) -> str:
+        with open(os.path.join(self.output_dir, file_name)) as status_file:
+            return status_file.read()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import tempfile
+import shutil
+import os
+import csv
+from core.configuration import Configuration
+from core.deque_event_queue import DequeEventQueue
+from core.parameter_sweep import ParameterSweep
+from core.sweep_context import SweepContext
+from datahandlers.data_handler_factory import DataHandlerFactory
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from executionhandlers.simulated_execution import SimulatedExecutionHandler
+from tests.bars_csv import write_bars_csv
+
+
+def run_instance(parameters):
+    sweep_context = SweepContext.get_active()
+    configuration = sweep_context.create_configuration()
+    events_per_symbol = dict(eurusd=DequeEventQueue())
+
+    data_handler = DataHandlerFactory().create_from_settings(configuration, events_per_symbol, ['eurusd'], None)
+    bar_store = data_handler.get_bar_store('eurusd')
+
+    return [sweep_context.get_model() * parameters[0], bar_store.length]
+
+
+class TestSweepContext(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+
+        write_bars_csv(self.csv_dir, 'eurusd', [1.1] * 3)
+
+        configuration = Configuration(data_handler_name=HistoricCSVDataHandler,
+                                      execution_handler_name=SimulatedExecutionHandler)
+        configuration.set_option(Configuration.OPTION_CSV_DIR, self.csv_dir)
+
+        self.sweep_context = SweepContext.create(configuration, ['eurusd'], 10)
+
+    def tearDown(self):
+        self.sweep_context.close()
+
+        shutil.rmtree(self.csv_dir)
+        shutil.rmtree(self.output_dir)
+
+    def test_create_configuration_does_not_change_the_configuration(self):
+        configuration = self.sweep_context.create_configuration()
+
+        self.assertTrue(configuration.has_option(Configuration.OPTION_SHARED_BAR_DATA))
+        self.assertFalse(self.sweep_context.configuration.has_option(Configuration.OPTION_SHARED_BAR_DATA))
+
+    def test_workers_use_the_shared_bars_and_model(self):
+        csv_file_name = os.path.join(self.output_dir, 'optimization.csv')
+
+        ParameterSweep(run_instance, ['A', 'Model', 'Bars'], csv_file_name,
+                       os.path.join(self.output_dir, 'checkpoint.txt'), 2, SweepContext.activate,
+                       (self.sweep_context,)).run([(1,), (2,)])
+
+        with open(csv_file_name, newline='') as csv_file:
+            rows = sorted(list(csv.reader(csv_file))[1:])
+
+        length = str(self.sweep_context.shared_bar_data.get_bar_store('eurusd').length)
+
+        self.assertEqual([['1', '10', length], ['2', '20', length]], rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+import unittest
+import tempfile
+import shutil
+import numpy as np
+from core.backtest import Backtest
+from core.vectorized_backtest import VectorizedBacktest
+from core.configuration import Configuration
+from core.portfolio import Portfolio
+from datahandlers.data_handler_factory import DataHandlerFactory
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from executionhandlers.execution_handler_factory import ExecutionHandlerFactory
+from executionhandlers.simulated_execution import SimulatedExecutionHandler
+from positionsizehandlers.fixed_position_size import FixedPositionSize
+from strategies.mac import MovingAverageCrossStrategy
+from strategies.strategy import Strategy
+from strategies.vectorized_signals import VectorizedSignals
+from events.event_kind import EventKind
+from events.signal_event import SignalEvent
+from tests.bars_csv import write_bars_csv
+
+
+class EveryNBarsStrategy(Strategy):
+    """
+    Enters every entry_every bars (long and short in turns) and exits every exit_every bars, also
+    while a trade is open, so the portfolio has to ignore the entries.
+    """
+
+    def __init__(self, bars, portfolio, events_per_symbol, entry_every=5, exit_every=None, stop_loss_pips=None,
+                 take_profit_pips=None):
+        self.bars = bars
+        self.events_per_symbol = events_per_symbol
+        self.entry_every = entry_every
+        self.exit_every = exit_every
+        self.stop_loss_pips = stop_loss_pips
+        self.take_profit_pips = take_profit_pips
+
+    def calculate_signals(self, event):
+        if event.kind == EventKind.MARKET:
+            s = event.symbol
+            signal = VectorizedSignals.NONE
+            number_of_bars = self.bars.get_number_of_bars(s)
+
+            if self.exit_every is not None and number_of_bars % self.exit_every == 0:
+                signal = VectorizedSignals.EXIT
+            elif number_of_bars % self.entry_every == 0:
+                signal = VectorizedSignals.LONG if number_of_bars // self.entry_every % 2 else VectorizedSignals.SHORT
+
+            bar_price = self.bars.get_latest_bar_value(s, 'close_bid')
+            bar_date = self.bars.get_latest_bar_datetime(s)
+
+            if signal == VectorizedSignals.EXIT:
+                self.events_per_symbol[s].put(SignalEvent(1, s, bar_date, None, 'EXIT', 1.0))
+            elif signal != VectorizedSignals.NONE:
+                sig_dir = 'LONG' if signal == VectorizedSignals.LONG else 'SHORT'
+                self.events_per_symbol[s].put(SignalEvent(
+                    1, s, bar_date, None, sig_dir, 1.0,
+                    self.calculate_stop_loss_price(bar_price, self.stop_loss_pips, sig_dir),
+                    self.calculate_take_profit_price(bar_price, self.take_profit_pips, sig_dir)
+                ))
+
+    def calculate_signals_vectorized(self, symbol, bars):
+        close_bid = bars['close_bid']
+        number_of_bars = np.arange(1, len(close_bid) + 1)
+
+        signals = np.zeros(len(close_bid), dtype=np.int8)
+        entries = number_of_bars % self.entry_every == 0
+        signals[entries] = np.where(number_of_bars[entries] // self.entry_every % 2, VectorizedSignals.LONG,
+                                    VectorizedSignals.SHORT)
+
+        if self.exit_every is not None:
+            signals[number_of_bars % self.exit_every == 0] = VectorizedSignals.EXIT
+
+        direction = np.where(signals == VectorizedSignals.SHORT, -1.0, 1.0)
+        stop_loss = take_profit = None
+
+        if self.stop_loss_pips is not None:
+            stop_loss = close_bid - direction * (self.stop_loss_pips * self.get_pip_value())
+
+        if self.take_profit_pips is not None:
+            take_profit = close_bid + direction * (self.take_profit_pips * self.get_pip_value())
+
+        return VectorizedSignals(signals, stop_loss, take_profit)
+
+
+class TestVectorizedBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+
+        random = np.random.RandomState(11)
+        for symbol in ['eurusd', 'gbpusd']:
+            write_bars_csv(self.csv_dir, symbol, np.round(1.1 + np.cumsum(random.normal(0, 0.0003, 800)), 5).tolist(),
+                           spread=0.0001)
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+        shutil.rmtree(self.output_dir)
+
+    def test_mac_matches_the_event_engine(self):
+        for params in [
+            dict(short_window=3, long_window=10),
+            dict(short_window=5, long_window=20, stop_loss_pips=20, take_profit_pips=30),
+            dict(short_window=2, long_window=4, stop_loss_pips=5),
+            dict(short_window=10, long_window=30, take_profit_pips=10),
+        ]:
+            with self.subTest(**params):
+                backtest = self._create_backtest(Backtest, ['eurusd'], params)
+                backtest.run()
+
+                vectorized_backtest = self._create_backtest(VectorizedBacktest, ['eurusd'], params,
+                                                            stop_prices=VectorizedBacktest.STOP_PRICES_CLOSE)
+                vectorized_backtest.run()
+
+                self._assert_stats_equal(backtest, vectorized_backtest)
+                self.assertIsNone(vectorized_backtest.status_reporter)
+                self.assertEqual(backtest.get_signals(), vectorized_backtest.get_signals())
+                self.assertEqual(backtest.get_orders(), vectorized_backtest.get_orders())
+                self.assertEqual(backtest.get_fills(), vectorized_backtest.get_fills())
+                self.assertGreater(backtest.get_fills(), 10)
+
+                holdings = backtest.get_portfolio().holdings_ledger
+                vectorized_holdings = vectorized_backtest.get_portfolio().holdings_ledger
+
+                np.testing.assert_array_equal(holdings.get_datetimes(), vectorized_holdings.get_datetimes())
+                np.testing.assert_allclose(holdings.get_values(), vectorized_holdings.get_values(), rtol=1e-12)
+
+    def test_entries_while_a_trade_is_open_are_ignored(self):
+        for params in [
+            dict(entry_every=3, stop_loss_pips=20, take_profit_pips=20),
+            dict(entry_every=2, exit_every=7, stop_loss_pips=30),
+            dict(entry_every=4, exit_every=9),
+            dict(entry_every=5, take_profit_pips=10),
+        ]:
+            with self.subTest(**params):
+                backtest = self._create_backtest(Backtest, ['eurusd'], params, EveryNBarsStrategy)
+                backtest.run()
+
+                vectorized_backtest = self._create_backtest(VectorizedBacktest, ['eurusd'], params,
+                                                            EveryNBarsStrategy,
+                                                            stop_prices=VectorizedBacktest.STOP_PRICES_CLOSE)
+                vectorized_backtest.run()
+
+                self.assertEqual(len(backtest.get_portfolio().trades),
+                                 len(vectorized_backtest.get_portfolio().trades))
+                self.assertEqual(backtest.get_orders(), vectorized_backtest.get_orders())
+                self.assertEqual(backtest.get_fills(), vectorized_backtest.get_fills())
+                self._assert_stats_equal(backtest, vectorized_backtest)
+
+                # Most entries are ignored
+                opened = [trade for trade in vectorized_backtest.get_portfolio().trades.values() if trade['opened']]
+                self.assertLess(len(opened), 799 // params['entry_every'])
+
+    def test_stops_on_high_and_low(self):
+        prices = [1.1] * 10
+        low_prices = [1.1, 1.1, 1.1, 1.1, 1.0998, 1.1, 1.0970, 1.1, 1.1, 1.1]
+        write_bars_csv(self.csv_dir, 'eurusd', prices, spread=0.0001, low_prices=low_prices)
+
+        params = dict(entry_every=2, stop_loss_pips=30)
+
+        on_close = self._create_backtest(VectorizedBacktest, ['eurusd'], params, EveryNBarsStrategy,
+                                         stop_prices=VectorizedBacktest.STOP_PRICES_CLOSE)
+        on_close.run()
+
+        on_high_low = self._create_backtest(VectorizedBacktest, ['eurusd'], params, EveryNBarsStrategy)
+        on_high_low.run()
+
+        # The first entry is at 10:02 (the first row is skipped), its stop loss at 1.0997 is touched by the
+        # low at 10:06, the entry at the same bar is ignored and the next one is at 10:08
+        trades = sorted(on_high_low.get_portfolio().trades.values(), key=lambda trade: trade['opened'])
+
+        self.assertEqual(1, len(on_close.get_portfolio().trades))
+        self.assertEqual(2, len(trades))
+        self.assertEqual('10:06', trades[0]['closed'].strftime('%H:%M'))
+        self.assertAlmostEqual(-trades[0]['openCost'] / 1.1 * 1.0997, trades[0]['closeCost'])
+        self.assertIsNone(trades[1]['closed'])
+
+        with self.assertRaises(Exception):
+            self._create_backtest(VectorizedBacktest, ['eurusd'], params, EveryNBarsStrategy, stop_prices='open')
+
+    def test_symbols_are_independent(self):
+        params = dict(short_window=5, long_window=20, stop_loss_pips=20, take_profit_pips=30)
+
+        vectorized_backtest = self._create_backtest(VectorizedBacktest, ['eurusd', 'gbpusd'], params,
+                                                    stop_prices=VectorizedBacktest.STOP_PRICES_CLOSE)
+        vectorized_backtest.run()
+
+        fills = 0
+        total = 0
+        for symbol in ['eurusd', 'gbpusd']:
+            backtest = self._create_backtest(Backtest, [symbol], params)
+            backtest.run()
+
+            fills += backtest.get_fills()
+            total += backtest.get_portfolio().current_holdings['total'] - 10000
+
+        self.assertEqual(fills, vectorized_backtest.get_fills())
+        self.assertAlmostEqual(10000 + total, vectorized_backtest.get_portfolio().current_holdings['total'])
+
+    def _assert_stats_equal(self, backtest: Backtest, vectorized_backtest: Backtest):
+        self.assertAlmostEqual(backtest.stats.get_total_return(), vectorized_backtest.stats.get_total_return())
+        self.assertAlmostEqual(backtest.stats.get_sharpe_ratio(), vectorized_backtest.stats.get_sharpe_ratio())
+        self.assertAlmostEqual(backtest.stats.get_max_drawdown(), vectorized_backtest.stats.get_max_drawdown())
+        self.assertEqual(backtest.stats.get_drawdown_duration(), vectorized_backtest.stats.get_drawdown_duration())
+        self.assertEqual(backtest.stats.get_number_of_trades(), vectorized_backtest.stats.get_number_of_trades())
+
+    def _create_backtest(self, backtest_class: type, symbol_list: list, params: dict,
+                         strategy_class: type = MovingAverageCrossStrategy, **kwargs) -> Backtest:
+        configuration = Configuration(data_handler_name=HistoricCSVDataHandler,
+                                      execution_handler_name=SimulatedExecutionHandler)
+        configuration.set_option(Configuration.OPTION_CSV_DIR, self.csv_dir)
+
+        return backtest_class(
+            self.output_dir, symbol_list, 10000, 0, None, configuration, DataHandlerFactory(),
+            ExecutionHandlerFactory(), Portfolio, strategy_class, FixedPositionSize(0.1), None, [],
+            params, 'equity.csv', 'trades.csv', **kwargs
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
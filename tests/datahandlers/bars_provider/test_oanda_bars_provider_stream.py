@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime
+from datahandlers.bars_provider.oanda_bars_provider_stream import OandaBarsProviderStream
+from timeframe.timeframe import TimeFrame
+
+
+class FakeStream(object):
+    def __init__(self, prices: list):
+        self.prices = prices
+
+    def get_price(self):
+        for price in self.prices:
+            yield price
+
+
+class TestOandaBarsProviderStream(unittest.TestCase):
+
+    def test_ticks_are_accumulated_into_bars(self):
+        stream = FakeStream([
+            TestOandaBarsProviderStream._create_price('EUR_USD', '2017-01-01T10:00:01.000001', 1.10, 1.11),
+            TestOandaBarsProviderStream._create_price('EUR_USD', '2017-01-01T10:00:02.000001', 1.13, 1.14),
+            TestOandaBarsProviderStream._create_price('GBP_USD', '2017-01-01T10:00:02.000001', 1.30, 1.31),
+            TestOandaBarsProviderStream._create_price('EUR_USD', '2017-01-01T10:00:04.999999', 1.08, 1.09),
+            TestOandaBarsProviderStream._create_price('EUR_USD', '2017-01-01T10:00:05.000001', 1.12, 1.13),
+            TestOandaBarsProviderStream._create_price('EUR_USD', '2017-01-01T10:00:12.000001', 1.11, 1.12),
+        ])
+
+        bars_provider = OandaBarsProviderStream([stream], ['EUR_USD', 'GBP_USD'], TimeFrame(TimeFrame.TIME_FRAME_S5))
+        bars_provider.handle_prices_stream(stream)
+
+        eur_usd_queue = bars_provider.get_queue('EUR_USD')
+
+        self.assertEqual(2, eur_usd_queue.qsize())
+        self.assertEqual(
+            dict(OandaBarsProviderStream.create_bar_data(datetime(2017, 1, 1, 10, 0, 0), 1.09, 1.14, 1.09, 1.11,
+                                                         1.08, 1.13, 1.08, 1.10), volume=3),
+            eur_usd_queue.get()
+        )
+        self.assertEqual(
+            dict(OandaBarsProviderStream.create_bar_data(datetime(2017, 1, 1, 10, 0, 5), 1.13, 1.13, 1.13, 1.13,
+                                                         1.12, 1.12, 1.12, 1.12), volume=1),
+            eur_usd_queue.get()
+        )
+        self.assertTrue(bars_provider.get_queue('GBP_USD').empty())
+
+    @staticmethod
+    def _create_price(instrument: str, time: str, bid: float, ask: float) -> dict:
+        return {'instrument': instrument, 'datetime': time, 'bid': str(bid), 'ask': str(ask)}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from datahandlers.bar_ring_buffer import BarRingBuffer
+
+
+class TestBarRingBuffer(unittest.TestCase):
+
+    def test_keeps_last_bars_after_wrapping(self):
+        bar_buffer = BarRingBuffer(4, ['close_bid'])
+
+        for minute in range(10):
+            bar_buffer.append({'datetime': minute, 'close_bid': float(minute)})
+
+        self.assertEqual(10, bar_buffer.number_of_bars)
+        self.assertEqual(4, bar_buffer.get_size())
+
+        np.testing.assert_array_equal([7.0, 8.0, 9.0], bar_buffer.get_latest_values('close_bid', 3))
+        np.testing.assert_array_equal([6.0, 7.0, 8.0, 9.0], bar_buffer.get_latest_values('close_bid', 100))
+        self.assertEqual([{'datetime': 8, 'close_bid': 8.0}, {'datetime': 9, 'close_bid': 9.0}],
+                         bar_buffer.get_latest_bars(2))
+
+    def test_latest_values_are_read_only_views(self):
+        bar_buffer = BarRingBuffer(3, ['close_bid'])
+
+        for minute in range(5):
+            bar_buffer.append({'datetime': minute, 'close_bid': float(minute)})
+
+        values = bar_buffer.get_latest_values('close_bid', 3)
+
+        self.assertFalse(values.flags.owndata)
+        self.assertFalse(values.flags.writeable)
+
+    def test_latest_values_are_overwritten_after_capacity_minus_n_appends(self):
+        bar_buffer = BarRingBuffer(4, ['close_bid'])
+
+        for minute in range(5):
+            bar_buffer.append({'datetime': minute, 'close_bid': float(minute)})
+
+        values = bar_buffer.get_latest_values('close_bid', 3)
+
+        bar_buffer.append({'datetime': 5, 'close_bid': 5.0})
+        np.testing.assert_array_equal([2.0, 3.0, 4.0], values)
+
+        bar_buffer.append({'datetime': 6, 'close_bid': 6.0})
+        self.assertEqual(6.0, values[0])
+
+    def test_retained_memory_does_not_grow(self):
+        bar_buffer = BarRingBuffer(5, ['close_bid', 'close_ask'])
+        retained_memory = bar_buffer.get_retained_memory_bytes()
+
+        for minute in range(100):
+            bar_buffer.append({'datetime': minute, 'close_bid': 1.0, 'close_ask': 1.0})
+
+        self.assertEqual(retained_memory, bar_buffer.get_retained_memory_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import tempfile
+import shutil
+import os
+import numpy as np
+import pandas as pd
+from datahandlers.csv_cache import CsvCache
+
+
+class TestCsvCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.csv_file = os.path.join(self.directory, 'eurusd.csv')
+        self.cache = CsvCache(os.path.join(self.directory, '.cache'))
+        self.number_of_parsings = 0
+
+        with open(self.csv_file, 'w') as csv_file:
+            csv_file.write('1.1\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_load_uses_memory_mapped_entry(self):
+        first = self.cache.load(self.csv_file, self._read_csv)
+        second = self.cache.load(self.csv_file, self._read_csv)
+
+        self.assertEqual(1, self.number_of_parsings)
+        self.assertIsInstance(second.columns['close_bid'], np.memmap)
+        np.testing.assert_array_equal(first.timestamps, second.timestamps)
+        np.testing.assert_array_equal(first.columns['close_bid'], second.columns['close_bid'])
+        self.assertEqual('UTC', second.tz)
+
+    def test_touched_file_with_same_content_keeps_entry(self):
+        self.cache.load(self.csv_file, self._read_csv)
+
+        stat = os.stat(self.csv_file)
+        os.utime(self.csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.cache.load(self.csv_file, self._read_csv)
+
+        self.assertEqual(1, self.number_of_parsings)
+
+    def test_touched_file_does_not_change_the_version(self):
+        self.cache.load(self.csv_file, self._read_csv)
+        version_dir = self.cache._read_pointer(self.cache.get_entry_dir(self.csv_file))
+
+        with open(os.path.join(version_dir, CsvCache.MANIFEST_FILE), 'r') as manifest_file:
+            manifest = manifest_file.read()
+
+        stat = os.stat(self.csv_file)
+        os.utime(self.csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.cache.load(self.csv_file, self._read_csv)
+
+        with open(os.path.join(version_dir, CsvCache.MANIFEST_FILE), 'r') as manifest_file:
+            self.assertEqual(manifest, manifest_file.read())
+
+        self.assertEqual((version_dir, stat.st_mtime_ns + 10 ** 9),
+                         self.cache._read_pointer_and_mtime(self.cache.get_entry_dir(self.csv_file)))
+
+        # The touched file is not hashed again
+        self.cache.get_file_hash = None
+        self.assertIsInstance(self.cache.load(self.csv_file, self._read_csv).columns['close_bid'], np.memmap)
+        self.assertEqual(1, self.number_of_parsings)
+
+    def test_changed_file_rebuilds_entry(self):
+        self.cache.load(self.csv_file, self._read_csv)
+
+        with open(self.csv_file, 'w') as csv_file:
+            csv_file.write('1.2\n')
+
+        stat = os.stat(self.csv_file)
+        os.utime(self.csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        bar_store = self.cache.load(self.csv_file, self._read_csv)
+
+        self.assertEqual(2, self.number_of_parsings)
+        self.assertIsInstance(bar_store.columns['close_bid'], np.ndarray)
+
+    def test_files_with_same_name_have_own_entries(self):
+        other_directory = os.path.join(self.directory, 'other')
+        os.makedirs(other_directory)
+        other_csv_file = os.path.join(other_directory, 'eurusd.csv')
+        shutil.copy(self.csv_file, other_csv_file)
+
+        self.cache.load(self.csv_file, self._read_csv)
+        self.cache.load(other_csv_file, self._read_csv)
+        self.cache.load(self.csv_file, self._read_csv)
+        self.cache.load(other_csv_file, self._read_csv)
+
+        self.assertEqual(2, self.number_of_parsings)
+        self.assertNotEqual(self.cache.get_entry_dir(self.csv_file), self.cache.get_entry_dir(other_csv_file))
+
+    def test_rebuilt_entry_replaces_previous_version(self):
+        self.cache.load(self.csv_file, self._read_csv)
+        entry_dir = self.cache.get_entry_dir(self.csv_file)
+        first_version = self.cache._read_pointer(entry_dir)
+
+        # Column which does not match the manifest
+        np.save(os.path.join(first_version, 'close_bid.npy'), np.zeros(2))
+
+        bar_store = self.cache.load(self.csv_file, self._read_csv)
+
+        self.assertEqual(2, self.number_of_parsings)
+        self.assertEqual(3, bar_store.length)
+        self.assertNotEqual(first_version, self.cache._read_pointer(entry_dir))
+        self.assertFalse(os.path.isdir(first_version))
+        self.assertIsInstance(self.cache.load(self.csv_file, self._read_csv).columns['close_bid'], np.memmap)
+
+    def _read_csv(self) -> pd.DataFrame:
+        self.number_of_parsings += 1
+
+        with open(self.csv_file, 'r') as csv_file:
+            price = float(csv_file.read())
+
+        index = pd.date_range('2017-01-01 10:00', periods=3, freq='min', tz='UTC')
+
+        return pd.DataFrame(dict(
+            (field, [price] * 3) for field in ['open_bid', 'open_ask', 'high_bid', 'high_ask', 'low_bid', 'low_ask',
+                                              'close_bid', 'close_ask', 'volume']
+        ), index=index)
+
+
+if __name__ == '__main__':
+    unittest.main()
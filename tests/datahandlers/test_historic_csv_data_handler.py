@@ -0,0 +1,118 @@
+import unittest
+import tempfile
+import shutil
+import numpy as np
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from tests.bars_csv import write_bars_csv
+from tests.bars_csv import get_rising_prices
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class TestHistoricCSVDataHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+        write_bars_csv(self.csv_dir, 'eurusd', get_rising_prices(range(10)))
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+
+    def test_update_bars(self):
+        events_per_symbol = {'eurusd': queue.Queue()}
+        data_handler = HistoricCSVDataHandler(events_per_symbol, self.csv_dir, ['eurusd'])
+
+        self.assertFalse(data_handler.has_some_bars('eurusd'))
+
+        for iteration in range(4):
+            data_handler.update_bars('eurusd')
+
+        self.assertEqual(4, data_handler.get_number_of_bars('eurusd'))
+        self.assertEqual(4, events_per_symbol['eurusd'].qsize())
+        self.assertEqual(1.4, data_handler.get_latest_bar_value('eurusd', 'close_bid'))
+        self.assertEqual(1.4, data_handler.get_latest_bar('eurusd')['close_bid'])
+        self.assertEqual('2017-01-01 10:04:00',
+                         data_handler.get_latest_bar_datetime('eurusd').strftime('%Y-%m-%d %H:%M:%S'))
+
+        np.testing.assert_array_equal([1.2, 1.3, 1.4], data_handler.get_latest_bars_values('eurusd', 'close_bid', 3))
+        np.testing.assert_array_equal([1.1, 1.2, 1.3, 1.4],
+                                      data_handler.get_latest_bars_values('eurusd', 'close_bid', 10))
+
+    def test_get_latest_bars_values_returns_view(self):
+        data_handler = HistoricCSVDataHandler({'eurusd': queue.Queue()}, self.csv_dir, ['eurusd'])
+
+        for iteration in range(5):
+            data_handler.update_bars('eurusd')
+
+        values = data_handler.get_latest_bars_values('eurusd', 'close_bid', 3)
+
+        self.assertFalse(values.flags.owndata)
+        self.assertFalse(values.flags.writeable)
+
+    def test_backtest_stops_after_last_bar(self):
+        data_handler = HistoricCSVDataHandler({'eurusd': queue.Queue()}, self.csv_dir, ['eurusd'])
+
+        while data_handler.backtest_should_continue('eurusd'):
+            data_handler.update_bars('eurusd')
+
+        # The first row after the header is skipped by the CSV format
+        self.assertEqual(9, data_handler.get_number_of_bars('eurusd'))
+        self.assertEqual(100.0, data_handler.get_position_in_percentage())
+
+    def test_streaming_keeps_lookback_across_chunks(self):
+        data_handler = HistoricCSVDataHandler({'eurusd': queue.Queue()}, self.csv_dir, ['eurusd'], chunk_size=3,
+                                              max_lookback=4)
+
+        for iteration in range(7):
+            data_handler.update_bars('eurusd')
+
+        self.assertEqual(7, data_handler.get_number_of_bars('eurusd'))
+        self.assertEqual(1.7, data_handler.get_latest_bar_value('eurusd', 'close_bid'))
+        np.testing.assert_array_equal([1.4, 1.5, 1.6, 1.7],
+                                      data_handler.get_latest_bars_values('eurusd', 'close_bid', 4))
+
+        while data_handler.backtest_should_continue('eurusd'):
+            data_handler.update_bars('eurusd')
+
+        self.assertEqual(9, data_handler.get_number_of_bars('eurusd'))
+        self.assertEqual(100.0, data_handler.get_position_in_percentage())
+
+    def test_history_fraction_releases_prefix_of_bars(self):
+        data_handler = HistoricCSVDataHandler({'eurusd': queue.Queue()}, self.csv_dir, ['eurusd'],
+                                              history_fraction=0.5)
+
+        while data_handler.backtest_should_continue('eurusd'):
+            data_handler.update_bars('eurusd')
+
+        self.assertEqual(int(np.ceil(HistoricCSVDataHandler({'eurusd': queue.Queue()}, self.csv_dir, ['eurusd'])
+                                     .get_bar_store('eurusd').length * 0.5)),
+                         data_handler.get_number_of_bars('eurusd'))
+
+    def test_symbol_starting_later_releases_only_its_bars(self):
+        write_bars_csv(self.csv_dir, 'gbpusd', get_rising_prices(range(4, 10)), range(4, 10))
+        events_per_symbol = {'eurusd': queue.Queue(), 'gbpusd': queue.Queue()}
+        data_handler = HistoricCSVDataHandler(events_per_symbol, self.csv_dir, ['eurusd', 'gbpusd'])
+
+        self.assertFalse(data_handler.has_some_bars('gbpusd'))
+        self.assertEqual('2017-01-01 10:05:00', str(data_handler.get_bar_store('gbpusd').timestamp_to_datetime(
+            data_handler.get_next_bar_timestamp('gbpusd')))[:19])
+
+        close_bids = []
+        while data_handler.backtest_should_continue('gbpusd'):
+            data_handler.update_bars('gbpusd')
+
+            if data_handler.backtest_should_continue('gbpusd'):
+                close_bids.append(data_handler.get_latest_bar_value('gbpusd', 'close_bid'))
+
+        self.assertEqual([1.5, 1.6, 1.7, 1.8, 1.9], close_bids)
+        self.assertEqual(5, events_per_symbol['gbpusd'].qsize())
+        self.assertEqual(5, data_handler.symbol_position_info['gbpusd']['number_of_items'])
+        np.testing.assert_array_equal([1.8, 1.9], data_handler.get_latest_bars_values('gbpusd', 'close_bid', 4)[-2:])
+        self.assertEqual(5, len(data_handler.get_latest_bars_values('gbpusd', 'close_bid', 9)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import tempfile
+import shutil
+import numpy as np
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from tests.bars_csv import write_bars_csv
+from tests.bars_csv import get_rising_prices
+from datahandlers.indicators import SimpleMovingAverage
+from datahandlers.indicators import ExponentialMovingAverage
+from datahandlers.indicators import RollingStandardDeviation
+from datahandlers.indicators import RollingMaximum
+from datahandlers.indicators import RollingMinimum
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class TestIndicators(unittest.TestCase):
+
+    def setUp(self):
+        self.values = 1.1 + np.cumsum(np.random.RandomState(1).normal(0, 0.001, 500))
+
+    def test_window_indicators_match_numpy(self):
+        period = 20
+        indicators = [
+            (SimpleMovingAverage(period), np.mean),
+            (RollingStandardDeviation(period), np.std),
+            (RollingMaximum(period), np.max),
+            (RollingMinimum(period), np.min)
+        ]
+
+        for i, value in enumerate(self.values):
+            for indicator, expected in indicators:
+                indicator.update(value)
+
+                if i + 1 < period:
+                    self.assertIsNone(indicator.get_value())
+                else:
+                    self.assertAlmostEqual(expected(self.values[i + 1 - period:i + 1]), indicator.get_value(),
+                                           places=9)
+
+    def test_exponential_moving_average(self):
+        indicator = ExponentialMovingAverage(3)
+
+        for value in [1.0, 2.0, 3.0, 5.0]:
+            indicator.update(value)
+
+        self.assertAlmostEqual(2.0 + 0.5 * (5.0 - 2.0), indicator.get_value())
+
+
+class TestIndicatorRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+
+        write_bars_csv(self.csv_dir, 'eurusd', get_rising_prices(range(10)))
+
+        self.data_handler = HistoricCSVDataHandler({'eurusd': queue.Queue()}, self.csv_dir, ['eurusd'])
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+
+    def test_indicators_are_shared_and_updated_with_bars(self):
+        indicators = self.data_handler.get_indicators()
+        sma = indicators.get('eurusd', SimpleMovingAverage, 3)
+
+        self.assertIs(sma, indicators.get('eurusd', SimpleMovingAverage, 3))
+        self.assertIsNot(sma, indicators.get('eurusd', SimpleMovingAverage, 3, 'close_ask'))
+
+        for iteration in range(4):
+            self.data_handler.update_bars('eurusd')
+
+        self.assertAlmostEqual(np.mean(self.data_handler.get_latest_bars_values('eurusd', 'close_bid', 3)),
+                               sma.get_value())
+
+    def test_indicator_created_later_starts_from_history(self):
+        for iteration in range(5):
+            self.data_handler.update_bars('eurusd')
+
+        sma = self.data_handler.get_indicators().get('eurusd', SimpleMovingAverage, 3)
+
+        self.assertAlmostEqual(np.mean(self.data_handler.get_latest_bars_values('eurusd', 'close_bid', 3)),
+                               sma.get_value())
+
+    def test_missing_values_are_skipped(self):
+        prices = get_rising_prices(range(10))
+        prices[4] = None
+        write_bars_csv(self.csv_dir, 'gbpusd', prices)
+
+        data_handler = HistoricCSVDataHandler({'gbpusd': queue.Queue()}, self.csv_dir, ['gbpusd'])
+        indicators = data_handler.get_indicators()
+        sma = indicators.get('gbpusd', SimpleMovingAverage, 3)
+        std = indicators.get('gbpusd', RollingStandardDeviation, 3)
+
+        for iteration in range(5):
+            data_handler.update_bars('gbpusd')
+
+        self.assertTrue(np.isnan(data_handler.get_latest_bars_values('gbpusd', 'close_bid', 3)[1]))
+        self.assertAlmostEqual(np.mean([1.2, 1.3, 1.5]), sma.get_value())
+        self.assertAlmostEqual(np.std([1.2, 1.3, 1.5]), std.get_value())
+
+        data_handler.update_bars('gbpusd')
+
+        self.assertAlmostEqual(np.mean([1.3, 1.5, 1.6]), sma.get_value())
+        self.assertAlmostEqual(np.mean([1.3, 1.5, 1.6]),
+                               indicators.get('gbpusd', SimpleMovingAverage, 3, 'close_ask').get_value())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import tempfile
+import shutil
+import pickle
+import multiprocessing
+import numpy as np
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from tests.bars_csv import write_bars_csv
+from tests.bars_csv import get_rising_prices
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+def run_shared_backtest(shared_bar_data) -> list:
+    data_handler = HistoricCSVDataHandler({'eurusd': queue.Queue()}, '', ['eurusd'], shared_bar_data=shared_bar_data)
+
+    while data_handler.backtest_should_continue('eurusd'):
+        data_handler.update_bars('eurusd')
+
+    return list(data_handler.get_latest_bars_values('eurusd', 'close_bid', 3))
+
+
+class TestSharedBarData(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+
+        write_bars_csv(self.csv_dir, 'eurusd', get_rising_prices(range(10)))
+
+        data_handler = HistoricCSVDataHandler({'eurusd': queue.Queue()}, self.csv_dir, ['eurusd'])
+        self.shared_bar_data = data_handler.create_shared_bar_data()
+
+    def tearDown(self):
+        self.shared_bar_data.unlink()
+        shutil.rmtree(self.csv_dir)
+
+    def test_attached_handler_has_own_cursor_over_shared_bars(self):
+        attached_bar_data = pickle.loads(pickle.dumps(self.shared_bar_data))
+
+        data_handler = HistoricCSVDataHandler({'eurusd': queue.Queue()}, '', ['eurusd'],
+                                              shared_bar_data=attached_bar_data)
+        other_data_handler = HistoricCSVDataHandler({'eurusd': queue.Queue()}, '', ['eurusd'],
+                                                    shared_bar_data=attached_bar_data)
+
+        for iteration in range(3):
+            data_handler.update_bars('eurusd')
+
+        other_data_handler.update_bars('eurusd')
+
+        self.assertEqual(1.3, data_handler.get_latest_bar_value('eurusd', 'close_bid'))
+        self.assertEqual(1.1, other_data_handler.get_latest_bar_value('eurusd', 'close_bid'))
+        self.assertEqual('2017-01-01 10:03:00',
+                         data_handler.get_latest_bar_datetime('eurusd').strftime('%Y-%m-%d %H:%M:%S'))
+
+        values = data_handler.get_latest_bars_values('eurusd', 'close_bid', 2)
+        self.assertFalse(values.flags.owndata)
+        self.assertFalse(values.flags.writeable)
+
+        del data_handler, other_data_handler, values
+        attached_bar_data.close()
+
+    def test_worker_processes_read_shared_bars(self):
+        with multiprocessing.Pool(2) as pool:
+            results = pool.map(run_shared_backtest, [self.shared_bar_data] * 2)
+
+        for result in results:
+            np.testing.assert_array_equal([1.7, 1.8, 1.9], result)
+
+
+if __name__ == '__main__':
+    unittest.main()
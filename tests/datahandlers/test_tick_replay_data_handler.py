@@ -0,0 +1,64 @@
+import unittest
+import tempfile
+import shutil
+import os
+import numpy as np
+from datahandlers.tick_replay_data_handler import TickReplayDataHandler
+from datahandlers.bars_provider.bars_provider import BarsProvider
+from timeframe.timeframe import TimeFrame
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class TestTickReplayDataHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+
+        with open(os.path.join(self.csv_dir, 'eurusd.csv'), 'w') as csv_file:
+            csv_file.write('time;bid;ask\n')
+            csv_file.write('2017-01-01T10:00:01.000000Z;1.10;1.11\n')
+            csv_file.write('2017-01-01T10:00:02.500000Z;1.13;1.14\n')
+            csv_file.write('2017-01-01T10:00:04.900000Z;1.12;1.13\n')
+            csv_file.write('2017-01-01T10:00:05.000000Z;1.09;1.10\n')
+            csv_file.write('2017-01-01T10:00:16.000000Z;1.15;1.16\n')
+            csv_file.write('2017-01-01T10:00:17.000000Z;1.14;1.15\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+
+    def test_ticks_are_aggregated_into_bars(self):
+        events_per_symbol = {'eurusd': queue.Queue()}
+        data_handler = TickReplayDataHandler(events_per_symbol, self.csv_dir, ['eurusd'],
+                                             TimeFrame(TimeFrame.TIME_FRAME_S5))
+
+        while data_handler.backtest_should_continue('eurusd'):
+            data_handler.update_bars('eurusd')
+
+        self.assertEqual(3, data_handler.get_number_of_bars('eurusd'))
+        self.assertEqual(3, events_per_symbol['eurusd'].qsize())
+
+        first_bar = data_handler.get_latest_bars('eurusd', 3)[0]
+        expected_bar = BarsProvider.create_bar_data(None, 1.13, 1.14, 1.11, 1.11, 1.12, 1.13, 1.10, 1.10)
+
+        self.assertEqual('2017-01-01 10:00:00', first_bar.pop('datetime').strftime('%Y-%m-%d %H:%M:%S'))
+        expected_bar.pop('datetime')
+        self.assertEqual(expected_bar, first_bar)
+
+        np.testing.assert_array_equal([1.10, 1.09, 1.15], data_handler.get_latest_bars_values('eurusd', 'open_bid', 3))
+        np.testing.assert_array_equal([1.14, 1.10, 1.16], data_handler.get_latest_bars_values('eurusd', 'high_ask', 3))
+        self.assertEqual('2017-01-01 10:00:15',
+                         data_handler.get_latest_bar_datetime('eurusd').strftime('%Y-%m-%d %H:%M:%S'))
+
+    def test_aggregate_ticks_without_ticks(self):
+        bar_store = TickReplayDataHandler.aggregate_ticks(np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0),
+                                                          TimeFrame(TimeFrame.TIME_FRAME_M1))
+
+        self.assertEqual(0, bar_store.length)
+
+
+if __name__ == '__main__':
+    unittest.main()
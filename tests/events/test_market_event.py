@@ -0,0 +1,33 @@
+import unittest
+from events.market_event import MarketEvent
+from events.fill_event import FillEvent
+from events.order_event import OrderEvent
+from events.signal_event import SignalEvent
+
+
+class TestMarketEvent(unittest.TestCase):
+
+    def test_events_have_no_instance_dictionary(self):
+        events = [
+            MarketEvent('eurusd'),
+            SignalEvent(1, 'eurusd', None, None, 'LONG', 1.0),
+            OrderEvent('eurusd', 'MKT', 100, 'BUY'),
+            FillEvent(None, 'eurusd', 'ARCA', 100, 'BUY'),
+        ]
+
+        for event in events:
+            self.assertFalse(hasattr(event, '__dict__'))
+
+    def test_recycled_event_is_reused(self):
+        event = MarketEvent.create('eurusd')
+        MarketEvent.recycle(event)
+
+        reused_event = MarketEvent.create('gbpusd')
+
+        self.assertIs(event, reused_event)
+        self.assertEqual('gbpusd', reused_event.symbol)
+        self.assertIsNot(reused_event, MarketEvent.create('gbpusd'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import tempfile
+import shutil
+import os
+import threading
+import numpy as np
+from unittest import mock
+from machine_learning.model_registry import ModelRegistry
+from machine_learning.model_registry import joblib
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+
+    def test_copies_of_a_model_are_loaded_once(self):
+        model_file = self._dump_model('model.pkl', 1.0)
+        shutil.copy(model_file, os.path.join(self.model_dir, 'copy.pkl'))
+
+        registry = ModelRegistry()
+        model = registry.load(model_file)
+
+        self.assertIs(model, registry.load(model_file))
+        self.assertIs(model, registry.load(os.path.join(self.model_dir, 'copy.pkl')))
+        self.assertEqual(1, registry.get_number_of_models())
+
+    def test_arrays_are_memory_mapped(self):
+        model = ModelRegistry().load(self._dump_model('model.pkl', 2.0))
+
+        self.assertIsInstance(model['weights'], np.memmap)
+        self.assertEqual(2.0, model['weights'][0])
+
+    def test_least_recently_used_model_is_dropped(self):
+        registry = ModelRegistry(capacity=2)
+        first = registry.load(self._dump_model('first.pkl', 1.0))
+        registry.load(self._dump_model('second.pkl', 2.0))
+        registry.load(os.path.join(self.model_dir, 'first.pkl'))
+        registry.load(self._dump_model('third.pkl', 3.0))
+
+        self.assertEqual(2, registry.get_number_of_models())
+        self.assertIs(first, registry.load(os.path.join(self.model_dir, 'first.pkl')))
+        self.assertNotIn(os.path.join(self.model_dir, 'second.pkl'), registry.hashes)
+        self.assertNotIn(registry.get_hash(os.path.join(self.model_dir, 'second.pkl')), registry.models)
+
+    def test_only_the_last_hash_of_a_file_is_kept(self):
+        registry = ModelRegistry()
+        model_file = self._dump_model('model.pkl', 1.0)
+        first_hash = registry.get_hash(model_file)
+
+        self._dump_model('model.pkl', 2.0)
+        stat = os.stat(model_file)
+        os.utime(model_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertNotEqual(first_hash, registry.get_hash(model_file))
+        self.assertEqual(1, len(registry.hashes))
+
+    def test_threads_share_the_default_registry(self):
+        default = ModelRegistry.default
+        ModelRegistry.default = None
+        registries = []
+        threads = [threading.Thread(target=lambda: registries.append(ModelRegistry.get_default()))
+                   for _ in range(8)]
+
+        try:
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+        finally:
+            ModelRegistry.default = default
+
+        self.assertEqual(8, len(registries))
+        self.assertEqual(1, len(set(map(id, registries))))
+
+    def test_concurrent_loads_of_a_model_load_it_once(self):
+        model_file = self._dump_model('model.pkl', 1.0)
+        registry = ModelRegistry()
+        started = threading.Event()
+        load = joblib.load
+        loads = []
+
+        def slow_load(*args, **kwargs):
+            loads.append(args)
+            started.set()
+            threading.Event().wait(0.2)
+
+            return load(*args, **kwargs)
+
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(registry.load(model_file))) for _ in range(4)]
+
+        with mock.patch('machine_learning.model_registry.joblib.load', side_effect=slow_load):
+            threads[0].start()
+            started.wait()
+
+            for thread in threads[1:]:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(1, len(loads))
+        self.assertEqual(4, len(models))
+        self.assertTrue(all(model is models[0] for model in models))
+        self.assertEqual({}, registry.loading)
+
+    def _dump_model(self, file_name: str, value: float) -> str:
+        model_file = os.path.join(self.model_dir, file_name)
+        joblib.dump(dict(weights=np.full(1000, value)), model_file)
+
+        return model_file
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest_data_provider import data_provider
+from datetime import datetime
+from datetime import timezone
+from dateutil import parser
+from oanda.timestamp_parser import TimestampParser
+from timeframe.timeframe import TimeFrame
+
+
+class TestTimestampParser(unittest.TestCase):
+    # The timestamp and nanoseconds below the microsecond precision of dateutil
+    timestamp_data = lambda: (
+        ('2017-01-01T15:00:01.000100000Z', 0),
+        ('2017-01-01T15:00:01.0001Z', 0),
+        ('2017-01-01T23:59:59Z', 0),
+        ('2017-01-02T00:00:00.999999999Z', 999),
+        ('2016-02-29T10:20:30.5+02:00', 0),
+        ('2016-02-29T10:20:30-05:30', 0),
+        ('1969-12-31T23:59:59.000001Z', 0),
+    )
+
+    @data_provider(timestamp_data)
+    def test_parse_to_epoch_matches_dateutil(self, value, nanoseconds):
+        timestamp_parser = TimestampParser()
+
+        expected_epoch = TimeFrame.datetime_to_epoch(parser.parse(value)) + nanoseconds
+
+        self.assertEqual(expected_epoch, timestamp_parser.parse_to_epoch(value))
+
+        # The second call goes through the cached date
+        self.assertEqual(expected_epoch, timestamp_parser.parse_to_epoch(value))
+
+    def test_parse_to_datetime(self):
+        timestamp_parser = TimestampParser()
+
+        self.assertEqual(datetime(2017, 1, 1, 15, 0, 1, 100, tzinfo=timezone.utc),
+                         timestamp_parser.parse_to_datetime('2017-01-01T15:00:01.000100000Z'))
+        self.assertEqual(datetime(2017, 1, 1, 15, 0, 1), timestamp_parser.parse_to_datetime('2017-01-01T15:00:01'))
+
+    def test_invalid_timestamp(self):
+        timestamp_parser = TimestampParser()
+
+        for value in ['2017-01-01', '2017-13-01T15:00:01Z', '2017-01-01T15:00:01.Z', '2017-01-01T15:00:01+0200']:
+            with self.assertRaises(Exception):
+                timestamp_parser.parse_to_epoch(value)
+
+
+if __name__ == '__main__':
+    unittest.main()
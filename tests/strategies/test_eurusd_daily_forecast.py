@@ -0,0 +1,68 @@
+import unittest
+import tempfile
+import shutil
+import numpy as np
+from core.backtest import Backtest
+from core.configuration import Configuration
+from core.portfolio import Portfolio
+from datahandlers.data_handler_factory import DataHandlerFactory
+from datahandlers.historic_csv_data_handler import HistoricCSVDataHandler
+from executionhandlers.execution_handler_factory import ExecutionHandlerFactory
+from executionhandlers.simulated_execution import SimulatedExecutionHandler
+from positionsizehandlers.fixed_position_size import FixedPositionSize
+from tests.bars_csv import write_bars_csv
+from tests.bars_csv import get_rising_prices
+
+try:
+    from strategies.eurusd_daily_forecast import EurUsdDailyForecastStrategy
+except ImportError:
+    # The model selection helpers of the strategy import modules removed from recent scikit-learn versions
+    EurUsdDailyForecastStrategy = None
+
+
+class UpModel(object):
+    def predict(self, x):
+        return np.array([1])
+
+
+@unittest.skipIf(EurUsdDailyForecastStrategy is None, 'The strategy can not be imported with this scikit-learn')
+class TestEurUsdDailyForecastStrategy(unittest.TestCase):
+
+    def setUp(self):
+        self.csv_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.csv_dir)
+        shutil.rmtree(self.output_dir)
+
+    def test_no_entries_while_smas_have_missing_values_in_their_periods(self):
+        # The bars from 10:03 to 10:09 have no prices, they are NaN in the history
+        prices = get_rising_prices(range(14))
+        prices[3:10] = [None] * 7
+        write_bars_csv(self.csv_dir, 'eurusd', prices)
+
+        backtest = self._create_backtest(dict(sma_short_period=2, sma_long_period=3))
+        backtest.run()
+
+        # The SMAs are created at 10:06 from a history with only two finite values (the first row is
+        # skipped), the long one is ready at 10:10
+        trades = list(backtest.get_portfolio().trades.values())
+
+        self.assertEqual(1, len(trades))
+        self.assertEqual('10:10', trades[0]['opened'].strftime('%H:%M'))
+
+    def _create_backtest(self, params: dict) -> Backtest:
+        configuration = Configuration(data_handler_name=HistoricCSVDataHandler,
+                                      execution_handler_name=SimulatedExecutionHandler)
+        configuration.set_option(Configuration.OPTION_CSV_DIR, self.csv_dir)
+
+        return Backtest(
+            self.output_dir, ['eurusd'], 10000, 0, None, configuration, DataHandlerFactory(),
+            ExecutionHandlerFactory(), Portfolio, EurUsdDailyForecastStrategy, FixedPositionSize(0.5), None, [],
+            dict(trained_model=UpModel(), **params), 'equity.csv', 'trades.csv'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
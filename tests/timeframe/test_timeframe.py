@@ -1,6 +1,8 @@
 import unittest
 from unittest_data_provider import data_provider
+import numpy as np
 from datetime import datetime
+from datetime import timezone
 
 from timeframe.timeframe import TimeFrame
 
@@ -47,6 +49,30 @@ class TestTimeFrame(unittest.TestCase):
             datetime(year=2017, month=1, day=1, hour=10, minute=00, second=34),
             TimeFrame.TIME_FRAME_M15,
         ),
+        (
+            (
+                datetime(year=2017, month=1, day=4, hour=0, minute=0, second=0),
+                datetime(year=2017, month=1, day=4, hour=23, minute=59, second=59),
+            ),
+            datetime(year=2017, month=1, day=4, hour=18, minute=10, second=34),
+            TimeFrame.TIME_FRAME_D1,
+        ),
+        (
+            (
+                datetime(year=2017, month=1, day=2, hour=0, minute=0, second=0),
+                datetime(year=2017, month=1, day=8, hour=23, minute=59, second=59),
+            ),
+            datetime(year=2017, month=1, day=8, hour=18, minute=10, second=34),
+            TimeFrame.TIME_FRAME_W1,
+        ),
+        (
+            (
+                datetime(year=2017, month=1, day=1, hour=8, minute=0, second=0, tzinfo=timezone.utc),
+                datetime(year=2017, month=1, day=1, hour=11, minute=59, second=59, tzinfo=timezone.utc),
+            ),
+            datetime(year=2017, month=1, day=1, hour=10, minute=10, second=34, tzinfo=timezone.utc),
+            TimeFrame.TIME_FRAME_H4,
+        ),
     )
 
     @data_provider(timeframe_border_data)
@@ -57,6 +83,18 @@ class TestTimeFrame(unittest.TestCase):
 
         self.assertEqual(expected_border, bar_border)
 
+    def test_get_epoch_border_for_array(self):
+        timeframe_object = TimeFrame(TimeFrame.TIME_FRAME_M1)
+        second = TimeFrame.NUMBER_OF_NANOSECONDS_IN_SECOND
+
+        timestamps = np.array([0, 59 * second, 60 * second, 61 * second + 1], dtype=np.int64)
+        border_lower, border_higher = timeframe_object.get_epoch_border(timestamps)
+
+        np.testing.assert_array_equal([0, 0, 60 * second, 60 * second], border_lower)
+        np.testing.assert_array_equal([60 * second - 1, 60 * second - 1, 120 * second - 1, 120 * second - 1],
+                                      border_higher)
+        self.assertEqual((60 * second, 120 * second - 1), timeframe_object.get_epoch_border(61 * second))
+
 
 if __name__ == '__main':
     unittest.main()
@@ -1,5 +1,7 @@
+import calendar
 from datetime import datetime
-import time
+from datetime import timedelta
+from datetime import timezone
 
 
 class TimeFrame(object):
@@ -9,6 +11,8 @@ class TimeFrame(object):
     TIME_FRAME_M15 = 'M15'
     TIME_FRAME_H1 = 'H1'
     TIME_FRAME_H4 = 'H4'
+    TIME_FRAME_D1 = 'D'
+    TIME_FRAME_W1 = 'W'
 
     NUMBER_OF_SECONDS_IN_TIME_FRAMES = {
         TIME_FRAME_S5: 5,
@@ -17,28 +21,75 @@ class TimeFrame(object):
         TIME_FRAME_M15: 60 * 15,
         TIME_FRAME_H1: 60 * 60,
         TIME_FRAME_H4: 60 * 60 * 4,
+        TIME_FRAME_D1: 60 * 60 * 24,
+        TIME_FRAME_W1: 60 * 60 * 24 * 7,
     }
 
+    # The epoch (1970-01-01) is Thursday, weeks start on Monday
+    OFFSET_SECONDS_IN_TIME_FRAMES = {
+        TIME_FRAME_W1: 60 * 60 * 24 * 4,
+    }
+
+    NUMBER_OF_NANOSECONDS_IN_SECOND = 1000000000
+
+    EPOCH = datetime(1970, 1, 1)
+
     def __init__(self, time_frame):
         self.time_frame = time_frame
 
     def as_string(self) -> str:
         return self.time_frame
 
-    def get_time_frame_border(self, time_to_analyze):
-        # type: (datetime) -> tuple[datetime, datetime]
-        datetime_in_seconds = int(time.mktime(time_to_analyze.timetuple()))
+    def get_number_of_seconds(self) -> int:
+        return self.NUMBER_OF_SECONDS_IN_TIME_FRAMES[self.time_frame]
+
+    def get_epoch_border(self, epoch_nanoseconds):
+        """
+        Returns the first and the last nanosecond (both inclusive) of the bars containing
+        epoch_nanoseconds (nanoseconds since epoch, UTC). Accepts one int as well as a NumPy
+        int64 array, in which case the borders are arrays computed in one pass.
+        """
+        bar_length = self.get_number_of_seconds() * self.NUMBER_OF_NANOSECONDS_IN_SECOND
+        offset = self.OFFSET_SECONDS_IN_TIME_FRAMES.get(self.time_frame, 0) * self.NUMBER_OF_NANOSECONDS_IN_SECOND
+
+        border_lower = epoch_nanoseconds - (epoch_nanoseconds - offset) % bar_length
 
-        number_of_seconds_in_time_frame = self.NUMBER_OF_SECONDS_IN_TIME_FRAMES[self.time_frame]
+        return border_lower, border_lower + (bar_length - 1)
 
-        border_lower_seconds = datetime_in_seconds - datetime_in_seconds % number_of_seconds_in_time_frame
-        border_higher_seconds = border_lower_seconds + number_of_seconds_in_time_frame - 1
+    def get_time_frame_border(self, time_to_analyze):
+        # type: (datetime) -> tuple[datetime, datetime]
+        """
+        Returns the first and the last second of the bar containing time_to_analyze. Naive
+        datetimes are taken as UTC, aware datetimes keep their time zone.
+        """
+        border_lower, border_higher = self.get_epoch_border(self.datetime_to_epoch(time_to_analyze))
+        border_higher = border_higher + 1 - self.NUMBER_OF_NANOSECONDS_IN_SECOND
 
         return (
-            datetime.fromtimestamp(border_lower_seconds),
-            datetime.fromtimestamp(border_higher_seconds),
+            self.epoch_to_datetime(border_lower, time_to_analyze.tzinfo),
+            self.epoch_to_datetime(border_higher, time_to_analyze.tzinfo),
         )
 
+    @staticmethod
+    def datetime_to_epoch(value: datetime) -> int:
+        """
+        Returns nanoseconds since epoch, naive datetimes are taken as UTC.
+        """
+        return (calendar.timegm(value.utctimetuple()) * TimeFrame.NUMBER_OF_NANOSECONDS_IN_SECOND +
+                value.microsecond * 1000)
+
+    @staticmethod
+    def epoch_to_datetime(epoch_nanoseconds: int, tzinfo=None) -> datetime:
+        """
+        Returns a naive UTC datetime, or an aware one in tzinfo when given.
+        """
+        value = TimeFrame.EPOCH + timedelta(microseconds=int(epoch_nanoseconds) // 1000)
+
+        if tzinfo is not None:
+            value = value.replace(tzinfo=timezone.utc).astimezone(tzinfo)
+
+        return value
+
     @staticmethod
     def get_allowed_time_frames():
         return [
@@ -48,4 +99,6 @@ class TimeFrame(object):
             TimeFrame.TIME_FRAME_M15,
             TimeFrame.TIME_FRAME_H1,
             TimeFrame.TIME_FRAME_H4,
+            TimeFrame.TIME_FRAME_D1,
+            TimeFrame.TIME_FRAME_W1,
         ]